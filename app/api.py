@@ -2,20 +2,79 @@
 
 from __future__ import annotations
 
+import asyncio
+import base64
+import binascii
+import csv
+import io
+import json
+import math
+import threading
 import time
-import sqlite3
-from typing import Any, Dict, List, Optional
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Hashable,
+    Iterator,
+    List,
+    Literal,
+    Optional,
+    Tuple,
+)
 
-from fastapi import Depends, FastAPI, HTTPException, Query
+from fastapi import Depends, FastAPI, Header, HTTPException, Query, Request, Response
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
 
-from app.sqlite_store import initialize_db
+from app.broadcast import ReadingBroadcaster, Subscription
+from app.db_executor import DBExecutor, DBUnavailable
+from app.metrics import CONTENT_TYPE, Registry
+from app.response_cache import ResponseCache, etag_matches
+from app.snapshot import DEFAULT_SNAPSHOT_PATH, SnapshotReader
+from app.sqlite_pool import ReadConnectionPool
+from app.sqlite_store import initialize_db, rollup_table
 
 
 APP_START_TIME = time.time()
 DB_PATH = "/var/lib/pi-log/readings.db"
+DB_POOL_SIZE = 4
+# Blocking SQLite work from the async endpoints runs on its own bounded pool
+DB_EXECUTOR_WORKERS = DB_POOL_SIZE
+DB_EXECUTOR_QUEUE = 32
+DB_QUERY_TIMEOUT_SECONDS = 10.0
+HEALTH_DB_TIMEOUT_SECONDS = 2.0
+SNAPSHOT_PATH = DEFAULT_SNAPSHOT_PATH
+# A snapshot older than this means ingestion is stalled: fall back to SQLite
+SNAPSHOT_MAX_AGE_SECONDS = 5.0
 
-app = FastAPI(title="Pi-Log API", version="0.1.0")
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+RESPONSE_CACHE_SIZE = 256
+# Events a streaming client may fall behind before it is disconnected
+STREAM_BUFFER_SIZE = 100
+STREAM_POLL_INTERVAL = 0.5
+STREAM_HEARTBEAT_SECONDS = 15.0
+
+# Position of the last row of a page: (timestamp, id)
+Cursor = Tuple[str, int]
+
+EXPORT_CHUNK_SIZE = 1000
+EXPORT_COLUMNS = (
+    "id",
+    "timestamp",
+    "counts_per_second",
+    "counts_per_minute",
+    "microsieverts_per_hour",
+    "mode",
+    "device_id",
+    "raw",
+)
+
+# (PRAGMA data_version, MAX(id)) as seen by Store.data_version()
+DataVersion = Tuple[int, int]
 
 
 class HealthDBStatus(BaseModel):
@@ -38,22 +97,90 @@ class Reading(BaseModel):
     raw: Optional[str] = None
 
 
+class AggregateStats(BaseModel):
+    min: float
+    max: float
+    avg: float
+
+
+class AggregateBucket(BaseModel):
+    bucket: str
+    count: int
+    cps: AggregateStats
+    cpm: AggregateStats
+    usv: AggregateStats
+
+
+class DistributionStats(BaseModel):
+    avg: float
+    min: float
+    max: float
+    p50: float
+    p90: float
+    p99: float
+
+
+class StatsBucket(BaseModel):
+    bucket: str
+    count: int
+    cpm: DistributionStats
+    usv: DistributionStats
+
+
+class DBExecutorStats(BaseModel):
+    max_workers: int
+    running: int
+    queue_depth: int
+    max_queue_depth: int
+    completed: int
+    failed: int
+    rejected: int
+    timeouts: int
+
+
 class MetricsResponse(BaseModel):
     ingested_count: int
     uptime_seconds: float
     version: str = "0.1.0"
+    pushed_count: Optional[int] = None
+    unpushed_count: Optional[int] = None
+    last_ingested_at: Optional[str] = None
+    db_executor: Optional[DBExecutorStats] = None
 
 
 class Store:
-    """Canonical SQLite store wrapper for API use."""
+    """
+    Canonical SQLite store wrapper for API use.
 
-    def __init__(self, db_path: str) -> None:
+    Reads go through a shared ReadConnectionPool; the schema is expected to
+    exist already (see init_store()).
+    """
+
+    def __init__(self, db_path: str, pool_size: int = DB_POOL_SIZE) -> None:
         self.db_path = db_path
-        initialize_db(db_path)
+        self.pool = ReadConnectionPool(db_path, size=pool_size)
+        # One long-lived connection: PRAGMA data_version is per connection
+        self._probe = ReadConnectionPool(db_path, size=1)
+
+    def close(self) -> None:
+        self.pool.close()
+        self._probe.close()
+
+    def data_version(self) -> DataVersion:
+        """
+        Cheap change token for response caching.
+
+        PRAGMA data_version changes whenever another connection commits;
+        MAX(id) is a single seek to the end of the rowid b-tree. Neither
+        reads table pages in bulk.
+        """
+        with self._probe.connection() as conn:
+            (version,) = conn.execute("PRAGMA data_version").fetchone()
+            (max_id,) = conn.execute("SELECT MAX(id) FROM geiger_readings").fetchone()
+        return int(version), int(max_id or 0)
 
     def get_latest_reading(self) -> Optional[Dict[str, Any]]:
-        conn = sqlite3.connect(self.db_path)
-        try:
+        with self.pool.connection() as conn:
             row = conn.execute(
                 """
                 SELECT id, raw, counts_per_second, counts_per_minute,
@@ -75,12 +202,9 @@ class Store:
                 "mode": row[5],
                 "timestamp": row[7],
             }
-        finally:
-            conn.close()
 
     def get_recent_readings(self, limit: int) -> List[Dict[str, Any]]:
-        conn = sqlite3.connect(self.db_path)
-        try:
+        with self.pool.connection() as conn:
             rows = conn.execute(
                 """
                 SELECT id, raw, counts_per_second, counts_per_minute,
@@ -103,21 +227,540 @@ class Store:
                 }
                 for r in rows
             ]
-        finally:
-            conn.close()
+
+    def get_readings_after(self, after_id: int, limit: int) -> List[Dict[str, Any]]:
+        """
+        Return up to limit readings with id > after_id, oldest first.
+        """
+        with self.pool.connection() as conn:
+            rows = conn.execute(
+                """
+                SELECT id, raw, counts_per_second, counts_per_minute,
+                       microsieverts_per_hour, mode, device_id,
+                       timestamp, pushed
+                FROM geiger_readings
+                WHERE id > ?
+                ORDER BY id ASC LIMIT ?
+                """,
+                (after_id, limit),
+            ).fetchall()
+
+        return [
+            {
+                "id": r[0],
+                "raw": r[1],
+                "cps": r[2],
+                "cpm": r[3],
+                "mode": r[5],
+                "timestamp": r[7],
+            }
+            for r in rows
+        ]
+
+    def iter_readings(
+        self,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        chunk_size: int = 1000,
+    ) -> Iterator[List[Tuple[Any, ...]]]:
+        """
+        Yield every reading with since <= timestamp < until, oldest first,
+        as lists of at most chunk_size rows in EXPORT_COLUMNS order.
+
+        Each chunk is its own short query, keyed on (timestamp, id) over
+        idx_geiger_readings_timestamp, and the pooled connection goes back
+        to the pool between chunks. A slow or stalled client therefore
+        never pins a read connection or holds a read transaction open
+        (which would also block WAL checkpoints). Rows inserted after the
+        export started are left out.
+        """
+        clauses: List[str] = []
+        params: List[Any] = []
+
+        if since is not None:
+            clauses.append("timestamp >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("timestamp < ?")
+            params.append(until)
+
+        with self.pool.connection() as conn:
+            (max_id,) = conn.execute("SELECT MAX(id) FROM geiger_readings").fetchone()
+        if max_id is None:
+            return
+        clauses.append("id <= ?")
+        params.append(max_id)
+
+        ts_col = EXPORT_COLUMNS.index("timestamp")
+        id_col = EXPORT_COLUMNS.index("id")
+        after: Optional[Cursor] = None
+        while True:
+            page_clauses = list(clauses)
+            page_params = list(params)
+            if after is not None:
+                page_clauses.append("(timestamp, id) > (?, ?)")
+                page_params.extend(after)
+
+            with self.pool.connection() as conn:
+                rows = conn.execute(
+                    f"""
+                    SELECT {", ".join(EXPORT_COLUMNS)}
+                    FROM geiger_readings
+                    WHERE {" AND ".join(page_clauses)}
+                    ORDER BY timestamp ASC, id ASC
+                    LIMIT ?
+                    """,
+                    (*page_params, chunk_size),
+                ).fetchall()
+
+            if rows:
+                yield rows
+            if len(rows) < chunk_size:
+                return
+            after = (rows[-1][ts_col], rows[-1][id_col])
+
+    def get_readings_range(
+        self,
+        limit: int,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        cursor: Optional[Cursor] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[Cursor]]:
+        """
+        Return one page of readings with since <= timestamp < until, newest
+        first, plus the cursor of the next page (None on the last page).
+
+        Pages are keyed on (timestamp, id) over idx_geiger_readings_timestamp,
+        so every page costs the same regardless of how deep it is.
+        """
+        clauses: List[str] = []
+        params: List[Any] = []
+
+        if since is not None:
+            clauses.append("timestamp >= ?")
+            params.append(since)
+        if cursor is not None:
+            # Rows before the cursor are already < until
+            clauses.append("(timestamp, id) < (?, ?)")
+            params.extend(cursor)
+        elif until is not None:
+            clauses.append("timestamp < ?")
+            params.append(until)
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        with self.pool.connection() as conn:
+            rows = conn.execute(
+                f"""
+                SELECT id, raw, counts_per_second, counts_per_minute,
+                       microsieverts_per_hour, mode, device_id,
+                       timestamp, pushed
+                FROM geiger_readings
+                {where}
+                ORDER BY timestamp DESC, id DESC
+                LIMIT ?
+                """,
+                (*params, limit),
+            ).fetchall()
+
+        readings = [
+            {
+                "id": r[0],
+                "raw": r[1],
+                "cps": r[2],
+                "cpm": r[3],
+                "mode": r[5],
+                "timestamp": r[7],
+            }
+            for r in rows
+        ]
+
+        next_cursor = (rows[-1][7], rows[-1][0]) if len(rows) == limit else None
+        return readings, next_cursor
+
+    def get_rollups(
+        self,
+        resolution: str,
+        limit: int,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Return rollup buckets with since <= bucket < until, oldest first.
+        """
+        clauses: List[str] = []
+        params: List[Any] = []
+
+        if since is not None:
+            clauses.append("bucket >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("bucket < ?")
+            params.append(until)
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        with self.pool.connection() as conn:
+            rows = conn.execute(
+                f"""
+                SELECT bucket, count,
+                       cps_min, cps_max, cps_sum,
+                       cpm_min, cpm_max, cpm_sum,
+                       usv_min, usv_max, usv_sum
+                FROM {rollup_table(resolution)}
+                {where}
+                ORDER BY bucket ASC
+                LIMIT ?
+                """,
+                (*params, limit),
+            ).fetchall()
+
+        return [
+            {
+                "bucket": r[0],
+                "count": r[1],
+                "cps": {"min": r[2], "max": r[3], "avg": r[4] / r[1]},
+                "cpm": {"min": r[5], "max": r[6], "avg": r[7] / r[1]},
+                "usv": {"min": r[8], "max": r[9], "avg": r[10] / r[1]},
+            }
+            for r in rows
+        ]
+
+    def get_bucket_stats(
+        self, since: str, until: str, bucket_seconds: int
+    ) -> List[Dict[str, Any]]:
+        """
+        Aggregate CPM and uSv/h over since <= timestamp < until into
+        epoch-aligned buckets of bucket_seconds, entirely in SQL.
+
+        Percentiles use the nearest-rank method: the value at rank
+        ceil(p/100 * n) within the bucket, ranked by window functions.
+        """
+        percentiles = (50, 90, 99)
+        pct_columns = ",\n".join(
+            f"MAX(CASE WHEN {col}_rn = (n * {p} + 99) / 100 THEN {col} END)"
+            for col in ("cpm", "usv")
+            for p in percentiles
+        )
+
+        with self.pool.connection() as conn:
+            rows = conn.execute(
+                f"""
+                WITH windowed AS (
+                    SELECT CAST(strftime('%s', timestamp) AS INTEGER) / ? AS b,
+                           counts_per_minute AS cpm,
+                           microsieverts_per_hour AS usv
+                    FROM geiger_readings
+                    WHERE timestamp >= ? AND timestamp < ?
+                ),
+                ranked AS (
+                    SELECT b, cpm, usv,
+                           ROW_NUMBER() OVER (PARTITION BY b ORDER BY cpm) AS cpm_rn,
+                           ROW_NUMBER() OVER (PARTITION BY b ORDER BY usv) AS usv_rn,
+                           COUNT(*) OVER (PARTITION BY b) AS n
+                    FROM windowed
+                )
+                SELECT b, n,
+                       AVG(cpm), MIN(cpm), MAX(cpm),
+                       AVG(usv), MIN(usv), MAX(usv),
+                       {pct_columns}
+                FROM ranked
+                GROUP BY b
+                ORDER BY b
+                """,
+                (bucket_seconds, since, until),
+            ).fetchall()
+
+        buckets: List[Dict[str, Any]] = []
+        for r in rows:
+            start = datetime.fromtimestamp(r[0] * bucket_seconds, tz=timezone.utc)
+            cpm_pct, usv_pct = r[8:11], r[11:14]
+            buckets.append(
+                {
+                    "bucket": start.isoformat(),
+                    "count": r[1],
+                    "cpm": {
+                        "avg": r[2],
+                        "min": r[3],
+                        "max": r[4],
+                        **{f"p{p}": v for p, v in zip(percentiles, cpm_pct)},
+                    },
+                    "usv": {
+                        "avg": r[5],
+                        "min": r[6],
+                        "max": r[7],
+                        **{f"p{p}": v for p, v in zip(percentiles, usv_pct)},
+                    },
+                }
+            )
+        return buckets
+
+    def get_counters(self) -> Dict[str, Any]:
+        """
+        Return the trigger-maintained totals (O(1), no table scan).
+        """
+        with self.pool.connection() as conn:
+            row = conn.execute(
+                """
+                SELECT total, pushed, unpushed, last_ingested_at
+                FROM geiger_counters
+                WHERE id = 1
+                """
+            ).fetchone()
+
+        if row is None:
+            return {"total": 0, "pushed": 0, "unpushed": 0, "last_ingested_at": None}
+
+        return {
+            "total": row[0],
+            "pushed": row[1],
+            "unpushed": row[2],
+            "last_ingested_at": row[3],
+        }
 
     def count_readings(self) -> int:
-        conn = sqlite3.connect(self.db_path)
-        try:
+        with self.pool.connection() as conn:
             row = conn.execute("SELECT COUNT(*) FROM geiger_readings").fetchone()
             count = int(row[0])
             return count
-        finally:
-            conn.close()
+
+
+_store: Optional[Store] = None
+_store_lock = threading.Lock()
+
+
+def init_store() -> Store:
+    """
+    Create the process-wide Store once: initialize the schema, then open
+    the read pool. Later calls return the same instance.
+    """
+    global _store
+    with _store_lock:
+        if _store is None:
+            initialize_db(DB_PATH)
+            _store = Store(DB_PATH)
+        return _store
+
+
+def close_store() -> None:
+    global _store
+    with _store_lock:
+        if _store is not None:
+            _store.close()
+            _store = None
 
 
 def get_store() -> Store:
-    return Store(DB_PATH)
+    return _store or init_store()
+
+
+_snapshot_reader = SnapshotReader(SNAPSHOT_PATH)
+
+
+def get_snapshot_reader() -> SnapshotReader:
+    return _snapshot_reader
+
+
+def read_snapshot(reader: SnapshotReader) -> Optional[Dict[str, Any]]:
+    """
+    Return the ingestion snapshot if it is present and fresh, else None.
+    """
+    try:
+        return reader.read(max_age=SNAPSHOT_MAX_AGE_SECONDS)
+    except Exception:
+        return None
+
+
+# ------------------------------------------------------------
+# Prometheus metrics for this process (ingestion has its own, see
+# app.metrics.REGISTRY served by the ingestion health server)
+# ------------------------------------------------------------
+
+API_REGISTRY = Registry()
+DB_QUERY_SECONDS = API_REGISTRY.histogram(
+    "pilog_api_db_query_seconds",
+    "Execution time of one job on the API database executor.",
+)
+DB_RUNNING = API_REGISTRY.gauge(
+    "pilog_api_db_running",
+    "Database executor jobs currently running.",
+)
+DB_QUEUE_DEPTH = API_REGISTRY.gauge(
+    "pilog_api_db_queue_depth",
+    "Database executor jobs waiting for a worker.",
+)
+DB_REJECTED = API_REGISTRY.counter(
+    "pilog_api_db_rejected_total",
+    "Database jobs rejected because the executor was full.",
+)
+DB_TIMEOUTS = API_REGISTRY.counter(
+    "pilog_api_db_timeouts_total",
+    "Database jobs that exceeded their timeout.",
+)
+READINGS_STORED = API_REGISTRY.gauge(
+    "pilog_api_readings_stored",
+    "Readings stored in SQLite.",
+)
+READINGS_UNPUSHED = API_REGISTRY.gauge(
+    "pilog_api_readings_unpushed",
+    "Stored readings not yet acknowledged by the ingestion API.",
+)
+CACHE_HITS = API_REGISTRY.counter(
+    "pilog_api_response_cache_hits_total",
+    "Responses served from the response cache.",
+)
+CACHE_MISSES = API_REGISTRY.counter(
+    "pilog_api_response_cache_misses_total",
+    "Responses that had to be rebuilt.",
+)
+STREAM_SUBSCRIBERS = API_REGISTRY.gauge(
+    "pilog_api_stream_subscribers",
+    "Open /readings/stream connections.",
+)
+
+
+_db_executor: Optional[DBExecutor] = None
+_db_executor_lock = threading.Lock()
+
+
+def get_db_executor() -> DBExecutor:
+    global _db_executor
+    with _db_executor_lock:
+        if _db_executor is None:
+            _db_executor = DBExecutor(
+                max_workers=DB_EXECUTOR_WORKERS,
+                max_queue=DB_EXECUTOR_QUEUE,
+                timeout=DB_QUERY_TIMEOUT_SECONDS,
+                observe=DB_QUERY_SECONDS.observe,
+            )
+        return _db_executor
+
+
+def close_db_executor() -> None:
+    global _db_executor
+    with _db_executor_lock:
+        if _db_executor is not None:
+            _db_executor.shutdown()
+            _db_executor = None
+
+
+_response_cache = ResponseCache(RESPONSE_CACHE_SIZE)
+
+
+def get_response_cache() -> ResponseCache:
+    return _response_cache
+
+
+def render_json(content: Any) -> bytes:
+    """
+    Serialize exactly as FastAPI's JSONResponse does, so cached bodies are
+    byte-identical to uncached ones.
+    """
+    return json.dumps(
+        content,
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+async def cached_response(
+    db: DBExecutor,
+    cache: ResponseCache,
+    key: Hashable,
+    version: Hashable,
+    if_none_match: Optional[str],
+    build: Callable[[], Tuple[bytes, Dict[str, str]]],
+) -> Response:
+    """
+    Serve key from the response cache while version is unchanged, building
+    (querying + serializing, on the DB executor) it only on a miss. A
+    matching If-None-Match gets an empty 304.
+    """
+    entry = cache.get(key, version)
+    if entry is None:
+        body, headers = await db.run(build)
+        entry = cache.put(key, version, body, headers)
+
+    headers = {**entry.headers, "ETag": entry.etag, "Cache-Control": "no-cache"}
+    if etag_matches(if_none_match, entry.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
+
+
+def reading_wire(row: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    The JSON form of Reading(**row), built directly from a Store row.
+
+    Store rows come from NOT NULL typed columns, so per-row pydantic
+    validation only costs CPU. This keeps Reading's field order and its
+    int -> float coercion of cps/cpm, so the wire format is unchanged.
+    """
+    return {
+        "id": row["id"],
+        "timestamp": row["timestamp"],
+        "cps": float(row["cps"]),
+        "cpm": float(row["cpm"]),
+        "mode": row["mode"],
+        "raw": row.get("raw"),
+    }
+
+
+def render_readings(rows: List[Dict[str, Any]]) -> bytes:
+    return render_json([reading_wire(row) for row in rows])
+
+
+def render_reading(row: Dict[str, Any]) -> bytes:
+    return render_json(reading_wire(row))
+
+
+async def _run_stream_query(fn: Callable[..., Any], *args: Any) -> Any:
+    # Resolved per call: the executor is recreated after shutdown
+    return await get_db_executor().run(fn, *args)
+
+
+_broadcaster = ReadingBroadcaster(
+    render_reading,
+    buffer_size=STREAM_BUFFER_SIZE,
+    poll_interval=STREAM_POLL_INTERVAL,
+    run_db=_run_stream_query,
+)
+
+
+def get_broadcaster() -> ReadingBroadcaster:
+    return _broadcaster
+
+
+DB_RUNNING.set_function(lambda: get_db_executor().running)
+DB_QUEUE_DEPTH.set_function(lambda: get_db_executor().queue_depth)
+DB_REJECTED.set_function(lambda: get_db_executor().rejected)
+DB_TIMEOUTS.set_function(lambda: get_db_executor().timeouts)
+CACHE_HITS.set_function(lambda: _response_cache.hits)
+CACHE_MISSES.set_function(lambda: _response_cache.misses)
+STREAM_SUBSCRIBERS.set_function(lambda: _broadcaster.subscriber_count)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    init_store()
+    yield
+    # End open streams first so the server can finish shutting down
+    await _broadcaster.close()
+    close_db_executor()
+    close_store()
+
+
+app = FastAPI(title="Pi-Log API", version="0.1.0", lifespan=lifespan)
+
+
+@app.exception_handler(DBUnavailable)
+async def db_unavailable_handler(request: Request, exc: DBUnavailable) -> JSONResponse:
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc)},
+        headers={"Retry-After": "1"},
+    )
 
 
 def get_uptime_seconds() -> float:
@@ -125,16 +768,23 @@ def get_uptime_seconds() -> float:
 
 
 @app.get("/health", response_model=HealthResponse)
-def health(store: Store = Depends(get_store)) -> HealthResponse:
+async def health(
+    store: Store = Depends(get_store),
+    snapshot_reader: SnapshotReader = Depends(get_snapshot_reader),
+    db: DBExecutor = Depends(get_db_executor),
+) -> HealthResponse:
     uptime = get_uptime_seconds()
     db_status = "ok"
     db_error: Optional[str] = None
 
-    try:
-        store.get_latest_reading()
-    except Exception as exc:
-        db_status = "error"
-        db_error = str(exc)
+    # Snapshots are published after each commit, so a fresh one means
+    # ingestion committed to the DB moments ago
+    if read_snapshot(snapshot_reader) is None:
+        try:
+            await db.run(store.get_latest_reading, timeout=HEALTH_DB_TIMEOUT_SECONDS)
+        except Exception as exc:
+            db_status = "error"
+            db_error = str(exc)
 
     return HealthResponse(
         status="ok",
@@ -144,31 +794,357 @@ def health(store: Store = Depends(get_store)) -> HealthResponse:
 
 
 @app.get("/readings/latest", response_model=Reading)
-def latest_reading(store: Store = Depends(get_store)) -> Reading:
-    row = store.get_latest_reading()
-    if not row:
-        raise HTTPException(status_code=404, detail="No readings available")
+async def latest_reading(
+    store: Store = Depends(get_store),
+    snapshot_reader: SnapshotReader = Depends(get_snapshot_reader),
+    cache: ResponseCache = Depends(get_response_cache),
+    db: DBExecutor = Depends(get_db_executor),
+    if_none_match: Optional[str] = Header(None),
+) -> Response:
+    """
+    The newest reading. Served from the ingestion snapshot when it is
+    fresh, otherwise from SQLite; either way the response carries an ETag
+    and is cached until the underlying data changes.
+    """
+    snapshot = read_snapshot(snapshot_reader)
+    latest = snapshot.get("latest") if snapshot else None
+
+    version: Hashable
+    if latest:
+        version = ("snapshot", latest["id"])
+
+        def build() -> Tuple[bytes, Dict[str, str]]:
+            reading = Reading(
+                id=latest["id"],
+                timestamp=latest["timestamp"],
+                cps=latest["cps"],
+                cpm=latest["cpm"],
+                mode=latest["mode"],
+                raw=latest.get("raw"),
+            )
+            return render_json(reading.model_dump()), {}
+
+    else:
+        version = ("db", await db.run(store.data_version))
+
+        def build() -> Tuple[bytes, Dict[str, str]]:
+            row = store.get_latest_reading()
+            if not row:
+                raise HTTPException(status_code=404, detail="No readings available")
+            return render_reading(row), {}
+
+    return await cached_response(
+        db, cache, (store.db_path, "latest"), version, if_none_match, build
+    )
+
+
+async def stream_events(
+    request: Request,
+    broadcaster: ReadingBroadcaster,
+    sub: Subscription,
+) -> AsyncIterator[str]:
+    """
+    Yield SSE frames for one subscriber until it is dropped, the server
+    shuts down or the client disconnects. Comment lines act as heartbeats.
+    """
+    try:
+        yield f"retry: {int(STREAM_POLL_INTERVAL * 1000) * 4}\n\n"
+        while True:
+            try:
+                frame = await asyncio.wait_for(
+                    sub.get(), timeout=STREAM_HEARTBEAT_SECONDS
+                )
+            except asyncio.TimeoutError:
+                if await request.is_disconnected():
+                    break
+                yield ": keepalive\n\n"
+                continue
+            if frame is None:
+                break
+            yield frame
+    finally:
+        broadcaster.unsubscribe(sub)
+
+
+@app.get("/readings/stream")
+async def stream_readings(
+    request: Request,
+    store: Store = Depends(get_store),
+    broadcaster: ReadingBroadcaster = Depends(get_broadcaster),
+) -> StreamingResponse:
+    """
+    Server-Sent Events stream of new readings (event: reading, id: the
+    reading ID, data: the same JSON object as /readings/latest).
+
+    All clients share one database poller. A client that falls more than
+    STREAM_BUFFER_SIZE events behind is disconnected; EventSource clients
+    reconnect automatically.
+    """
+    sub = broadcaster.subscribe(store)
+    return StreamingResponse(
+        stream_events(request, broadcaster, sub),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def to_utc(value: datetime) -> datetime:
+    """
+    Convert a query datetime to UTC; naive values are taken as UTC.
+    """
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def to_db_timestamp(value: datetime) -> str:
+    """
+    Normalize a query datetime to the stored UTC ISO-8601 form, so string
+    comparison in SQLite orders it correctly.
+    """
+    return to_utc(value).isoformat()
 
-    return Reading(**row)
+
+def encode_cursor(cursor: Cursor) -> str:
+    raw = json.dumps(list(cursor), separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> Cursor:
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        ts, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        if not isinstance(ts, str) or not isinstance(row_id, int):
+            raise ValueError(token)
+        return ts, row_id
+    except (binascii.Error, ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor") from None
 
 
 @app.get("/readings", response_model=List[Reading])
-def list_readings(
+async def list_readings(
     limit: int = Query(10, ge=1, le=1000),
+    since: Optional[datetime] = Query(None),
+    until: Optional[datetime] = Query(None),
+    cursor: Optional[str] = Query(None),
     store: Store = Depends(get_store),
-) -> List[Reading]:
-    rows = store.get_recent_readings(limit=limit)
-    return [Reading(**row) for row in rows]
+    cache: ResponseCache = Depends(get_response_cache),
+    db: DBExecutor = Depends(get_db_executor),
+    if_none_match: Optional[str] = Header(None),
+) -> Response:
+    """
+    Without since/until/cursor: the newest `limit` readings by ID.
+
+    With any of them: readings with since <= timestamp < until, newest
+    first. When more rows remain, the X-Next-Cursor response header holds
+    an opaque cursor; pass it back as `cursor` (with the same since/until)
+    to fetch the next page.
+
+    Responses carry an ETag and are cached until the data changes.
+    """
+    since_ts = to_db_timestamp(since) if since else None
+    until_ts = to_db_timestamp(until) if until else None
+    page_cursor = decode_cursor(cursor) if cursor else None
+
+    def build() -> Tuple[bytes, Dict[str, str]]:
+        headers: Dict[str, str] = {}
+        if since_ts is None and until_ts is None and page_cursor is None:
+            rows = store.get_recent_readings(limit=limit)
+        else:
+            rows, next_cursor = store.get_readings_range(
+                limit=limit,
+                since=since_ts,
+                until=until_ts,
+                cursor=page_cursor,
+            )
+            if next_cursor is not None:
+                headers[NEXT_CURSOR_HEADER] = encode_cursor(next_cursor)
+
+        return render_readings(rows), headers
+
+    key = (store.db_path, "readings", limit, since_ts, until_ts, page_cursor)
+    version = await db.run(store.data_version)
+    return await cached_response(db, cache, key, version, if_none_match, build)
+
+
+def encode_export(chunks: Iterator[List[Tuple[Any, ...]]], fmt: str) -> Iterator[bytes]:
+    """
+    Encode row chunks from Store.iter_readings() as NDJSON or CSV, one
+    bytes block per chunk.
+    """
+    if fmt == "csv":
+        buf = io.StringIO()
+        writer = csv.writer(buf, lineterminator="\n")
+        writer.writerow(EXPORT_COLUMNS)
+        yield buf.getvalue().encode()
+        for rows in chunks:
+            buf.seek(0)
+            buf.truncate()
+            writer.writerows(rows)
+            yield buf.getvalue().encode()
+        return
+
+    for rows in chunks:
+        yield "".join(
+            json.dumps(dict(zip(EXPORT_COLUMNS, row)), separators=(",", ":")) + "\n"
+            for row in rows
+        ).encode()
+
+
+async def export_stream(
+    db: DBExecutor, encoded: Iterator[bytes]
+) -> AsyncIterator[bytes]:
+    """
+    Drive encode_export() one chunk at a time on the DB executor, so the
+    export shares the same bound as every other query.
+    """
+    try:
+        while True:
+            block = await db.run(next, encoded, None)
+            if block is None:
+                break
+            yield block
+    finally:
+        # Stops paging on early disconnect too
+        close = getattr(encoded, "close", None)
+        if close is not None:
+            try:
+                close()
+            except ValueError:
+                # A timed-out step is still running; it is closed when collected
+                pass
+
+
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+@app.get("/readings/export")
+async def export_readings(
+    fmt: Literal["ndjson", "csv"] = Query("ndjson", alias="format"),
+    since: Optional[datetime] = Query(None),
+    until: Optional[datetime] = Query(None),
+    store: Store = Depends(get_store),
+    db: DBExecutor = Depends(get_db_executor),
+) -> StreamingResponse:
+    """
+    Stream the full history (or since <= timestamp < until), oldest first,
+    as NDJSON or CSV. Rows are fetched and encoded EXPORT_CHUNK_SIZE at a
+    time, so memory use does not depend on the size of the export.
+    """
+    if since is not None and until is not None and to_utc(since) >= to_utc(until):
+        raise HTTPException(status_code=400, detail="since must be before until")
+
+    chunks = store.iter_readings(
+        since=to_db_timestamp(since) if since else None,
+        until=to_db_timestamp(until) if until else None,
+        chunk_size=EXPORT_CHUNK_SIZE,
+    )
+    return StreamingResponse(
+        export_stream(db, encode_export(chunks, fmt)),
+        media_type=EXPORT_MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="readings.{fmt}"'},
+    )
+
+
+@app.get("/readings/aggregate", response_model=List[AggregateBucket])
+async def aggregate_readings(
+    resolution: Literal["minute", "hour"] = Query("hour"),
+    since: Optional[datetime] = Query(None),
+    until: Optional[datetime] = Query(None),
+    limit: int = Query(1440, ge=1, le=10000),
+    store: Store = Depends(get_store),
+    db: DBExecutor = Depends(get_db_executor),
+) -> List[AggregateBucket]:
+    """
+    Per-minute or per-hour min/max/avg of CPS, CPM and uSv/h, served from
+    the incrementally maintained rollup tables.
+    """
+    rows = await db.run(
+        store.get_rollups,
+        resolution=resolution,
+        limit=limit,
+        since=to_db_timestamp(since) if since else None,
+        until=to_db_timestamp(until) if until else None,
+    )
+    return [AggregateBucket(**row) for row in rows]
+
+
+MAX_STATS_BUCKETS = 10000
+
+
+@app.get("/readings/stats", response_model=List[StatsBucket])
+async def reading_stats(
+    since: Optional[datetime] = Query(None),
+    until: Optional[datetime] = Query(None),
+    bucket_seconds: int = Query(3600, ge=1, le=31 * 86400),
+    store: Store = Depends(get_store),
+    db: DBExecutor = Depends(get_db_executor),
+) -> List[StatsBucket]:
+    """
+    Time-bucketed avg/min/max/p50/p90/p99 of CPM and uSv/h, computed in
+    SQL. The window defaults to the 24 hours before `until` (default now);
+    buckets are aligned to multiples of bucket_seconds since the epoch.
+    """
+    until_dt = until or datetime.now(timezone.utc)
+    since_dt = since or until_dt - timedelta(days=1)
+
+    span = (to_utc(until_dt) - to_utc(since_dt)).total_seconds()
+    if span <= 0:
+        raise HTTPException(status_code=400, detail="since must be before until")
+    if span / bucket_seconds > MAX_STATS_BUCKETS:
+        raise HTTPException(status_code=400, detail="Too many buckets requested")
+
+    rows = await db.run(
+        store.get_bucket_stats,
+        since=to_db_timestamp(since_dt),
+        until=to_db_timestamp(until_dt),
+        bucket_seconds=bucket_seconds,
+    )
+    return [StatsBucket(**row) for row in rows]
 
 
 @app.get("/metrics", response_model=MetricsResponse)
-def metrics(store: Store = Depends(get_store)) -> MetricsResponse:
+async def metrics(
+    store: Store = Depends(get_store),
+    db: DBExecutor = Depends(get_db_executor),
+) -> MetricsResponse:
+    db_stats = DBExecutorStats(**db.stats())
     try:
-        count = store.count_readings()
+        counters = await db.run(store.get_counters)
     except Exception:
-        count = -1
+        return MetricsResponse(
+            ingested_count=-1,
+            uptime_seconds=get_uptime_seconds(),
+            db_executor=db_stats,
+        )
 
     return MetricsResponse(
-        ingested_count=count,
+        ingested_count=counters["total"],
         uptime_seconds=get_uptime_seconds(),
+        db_executor=db_stats,
+        pushed_count=counters["pushed"],
+        unpushed_count=counters["unpushed"],
+        last_ingested_at=counters["last_ingested_at"],
     )
+
+
+@app.get("/metrics/prometheus", response_class=PlainTextResponse)
+async def prometheus_metrics(
+    store: Store = Depends(get_store),
+    db: DBExecutor = Depends(get_db_executor),
+) -> PlainTextResponse:
+    """
+    API process metrics in the Prometheus text format. Ingestion stage
+    latencies are exported by the ingestion process itself, on its health
+    server's /metrics.
+    """
+    try:
+        counters = await db.run(store.get_counters)
+    except Exception:
+        READINGS_STORED.set(math.nan)
+        READINGS_UNPUSHED.set(math.nan)
+    else:
+        READINGS_STORED.set(counters["total"])
+        READINGS_UNPUSHED.set(counters["unpushed"])
+
+    return PlainTextResponse(API_REGISTRY.render(), media_type=CONTENT_TYPE)
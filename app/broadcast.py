@@ -0,0 +1,206 @@
+# filename: app/broadcast.py
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Protocol,
+    Set,
+    Tuple,
+)
+
+log = logging.getLogger(__name__)
+
+
+class ReadingSource(Protocol):
+    def data_version(self) -> Tuple[int, int]: ...
+
+    def get_readings_after(self, after_id: int, limit: int) -> List[Dict[str, Any]]: ...
+
+
+RenderFn = Callable[[Dict[str, Any]], bytes]
+# Runs a blocking call off the event loop, e.g. DBExecutor.run
+RunDBFn = Callable[..., Awaitable[Any]]
+
+
+def format_event(reading_id: int, data: bytes) -> str:
+    """
+    One Server-Sent Events frame. The reading ID doubles as the event ID.
+    """
+    return f"id: {reading_id}\nevent: reading\ndata: {data.decode()}\n\n"
+
+
+class Subscription:
+    """
+    One client's bounded buffer of pending SSE frames.
+
+    get() returns None once the subscription is closed, either because the
+    client fell more than buffer_size events behind or because the
+    broadcaster shut down.
+    """
+
+    def __init__(self, buffer_size: int) -> None:
+        self._queue: asyncio.Queue[Optional[str]] = asyncio.Queue(buffer_size + 1)
+        self.buffer_size = buffer_size
+        self.closed = False
+
+    def offer(self, frame: str) -> bool:
+        """
+        Queue a frame without blocking. Returns False (and closes the
+        subscription) when the buffer is full.
+        """
+        if self.closed:
+            return False
+        if self._queue.qsize() >= self.buffer_size:
+            self.close()
+            return False
+        self._queue.put_nowait(frame)
+        return True
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        self.closed = True
+        # The spare slot guarantees room for the end-of-stream marker
+        self._queue.put_nowait(None)
+
+    async def get(self) -> Optional[str]:
+        return await self._queue.get()
+
+
+class ReadingBroadcaster:
+    """
+    Fans new readings out to every streaming client from one poller.
+
+    The poller runs only while there are subscribers. It checks the cheap
+    data_version() token every poll_interval and queries rows with
+    id > last seen only when it changed, so the database cost is the same
+    for one client or a hundred. Each row is rendered once and the frame is
+    offered to every subscriber; a subscriber whose buffer is full is
+    dropped rather than allowed to grow memory.
+
+    Source queries go through run_db (the API's bounded DBExecutor);
+    without it they run on asyncio's default thread pool.
+    """
+
+    def __init__(
+        self,
+        render: RenderFn,
+        buffer_size: int = 100,
+        poll_interval: float = 0.5,
+        page_size: int = 500,
+        run_db: Optional[RunDBFn] = None,
+    ) -> None:
+        if buffer_size < 1:
+            raise ValueError("ReadingBroadcaster requires buffer_size >= 1")
+
+        self._render = render
+        self._run_db: RunDBFn = run_db or asyncio.to_thread
+        self.buffer_size = buffer_size
+        self.poll_interval = poll_interval
+        self.page_size = page_size
+
+        self._subscribers: Set[Subscription] = set()
+        self._poller: Optional[asyncio.Task[None]] = None
+        self.dropped = 0
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    # ------------------------------------------------------------
+    # Subscribers
+    # ------------------------------------------------------------
+
+    def subscribe(self, source: ReadingSource) -> Subscription:
+        """
+        Register a subscriber; the first one starts the poller on source.
+        Must be called from the event loop.
+        """
+        sub = Subscription(self.buffer_size)
+        self._subscribers.add(sub)
+        if self._poller is None or self._poller.done():
+            self._poller = asyncio.get_running_loop().create_task(
+                self._poll(source), name="reading-broadcaster"
+            )
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        self._subscribers.discard(sub)
+        if not self._subscribers and self._poller is not None:
+            self._poller.cancel()
+            self._poller = None
+
+    def publish(self, reading: Dict[str, Any]) -> int:
+        """
+        Offer one reading to every subscriber. Returns how many accepted it.
+        """
+        frame = format_event(reading["id"], self._render(reading))
+        delivered = 0
+        for sub in list(self._subscribers):
+            if sub.offer(frame):
+                delivered += 1
+            else:
+                self._subscribers.discard(sub)
+                self.dropped += 1
+                log.warning(
+                    "stream_subscriber_dropped", extra={"buffer": sub.buffer_size}
+                )
+        return delivered
+
+    async def close(self) -> None:
+        """
+        Stop the poller and end every open stream.
+        """
+        if self._poller is not None:
+            self._poller.cancel()
+            self._poller = None
+        for sub in list(self._subscribers):
+            sub.close()
+        self._subscribers.clear()
+
+    # ------------------------------------------------------------
+    # Poller
+    # ------------------------------------------------------------
+
+    async def _poll(self, source: ReadingSource) -> None:
+        version = -1
+        # None until a data_version() call succeeds; only rows committed
+        # after that first successful poll are streamed
+        last_id: Optional[int] = None
+        delay = 0.0
+
+        while True:
+            await asyncio.sleep(delay)
+            delay = self.poll_interval
+            try:
+                current = await self._run_db(source.data_version)
+                if last_id is None:
+                    version, last_id = current
+                    continue
+                if current == (version, last_id):
+                    continue
+                version = current[0]
+
+                rows = await self._run_db(
+                    source.get_readings_after, last_id, self.page_size
+                )
+                for row in rows:
+                    self.publish(row)
+                    last_id = row["id"]
+
+                # Catch up on the next tick rather than looping here
+                if len(rows) == self.page_size:
+                    version = -1
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                # Never crash the poller; streams just stay idle
+                log.error("stream_poll_failed", extra={"error": repr(exc)})
@@ -0,0 +1,175 @@
+# filename: app/db_executor.py
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class DBUnavailable(RuntimeError):
+    """
+    The database could not serve a request in time; maps to HTTP 503.
+    """
+
+
+class DBExecutorFull(DBUnavailable):
+    pass
+
+
+class DBQueryTimeout(DBUnavailable):
+    pass
+
+
+class DBExecutor:
+    """
+    Dedicated, bounded thread pool for blocking SQLite work from async
+    endpoints.
+
+    At most max_workers queries run at once and at most max_queue more may
+    wait; beyond that run() fails fast with DBExecutorFull instead of
+    queueing without bound. run() gives up waiting after timeout seconds
+    with DBQueryTimeout. SQLite calls cannot be cancelled from another
+    thread, so a timed-out query still occupies its slot until it returns,
+    which keeps the bound honest.
+
+    Keeping this separate from Starlette's threadpool means slow queries
+    can only exhaust this pool, never the event loop or cheap endpoints.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 4,
+        max_queue: int = 32,
+        timeout: float = 10.0,
+        observe: Optional[Callable[[float], None]] = None,
+    ) -> None:
+        if max_workers < 1:
+            raise ValueError("DBExecutor requires max_workers >= 1")
+        if max_queue < 0:
+            raise ValueError("DBExecutor requires max_queue >= 0")
+
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        # Called with each job's execution time (e.g. Histogram.observe)
+        self._observe = observe
+
+        self._pool = ThreadPoolExecutor(max_workers, thread_name_prefix="db")
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self.max_queue_depth = 0
+
+    # ------------------------------------------------------------
+    # Submission
+    # ------------------------------------------------------------
+
+    async def run(
+        self,
+        fn: Callable[..., T],
+        *args: Any,
+        timeout: Optional[float] = None,
+        **kwargs: Any,
+    ) -> T:
+        """
+        Run fn(*args, **kwargs) on the DB pool and await its result.
+        """
+        with self._lock:
+            if self._queued + self._running >= self.max_workers + self.max_queue:
+                self.rejected += 1
+                raise DBExecutorFull("Database busy")
+            self._queued += 1
+            self.max_queue_depth = max(self.max_queue_depth, self._queued)
+
+        call = functools.partial(self._call, fn, *args, **kwargs)
+        try:
+            future: Future[T] = self._pool.submit(call)
+        except RuntimeError:
+            with self._lock:
+                self._queued -= 1
+            raise DBExecutorFull("Database executor is shut down") from None
+        future.add_done_callback(self._on_done)
+
+        wait = self.timeout if timeout is None else timeout
+        wrapped = asyncio.wrap_future(future)
+        try:
+            # Not wait_for(): on 3.11+ asyncio.TimeoutError is the builtin
+            # TimeoutError, which fn itself may raise (e.g. pool exhausted)
+            done, _ = await asyncio.wait({wrapped}, timeout=wait)
+        except asyncio.CancelledError:
+            wrapped.cancel()
+            raise
+        if not done:
+            wrapped.cancel()
+            with self._lock:
+                self.timeouts += 1
+            raise DBQueryTimeout("Database query timed out")
+        return wrapped.result()
+
+    def _call(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        with self._lock:
+            self._queued -= 1
+            self._running += 1
+        started = time.perf_counter()
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException:
+            with self._lock:
+                self.failed += 1
+            raise
+        else:
+            with self._lock:
+                self.completed += 1
+            return result
+        finally:
+            if self._observe is not None:
+                self._observe(time.perf_counter() - started)
+            with self._lock:
+                self._running -= 1
+
+    def _on_done(self, future: Future[Any]) -> None:
+        # A job cancelled while still queued (timeout) never reached _call
+        if future.cancelled():
+            with self._lock:
+                self._queued -= 1
+
+    # ------------------------------------------------------------
+    # Introspection
+    # ------------------------------------------------------------
+
+    @property
+    def queue_depth(self) -> int:
+        with self._lock:
+            return self._queued
+
+    @property
+    def running(self) -> int:
+        with self._lock:
+            return self._running
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "running": self._running,
+                "queue_depth": self._queued,
+                "max_queue_depth": self.max_queue_depth,
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+                "timeouts": self.timeouts,
+            }
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
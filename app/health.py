@@ -6,6 +6,8 @@ import json
 from http.server import BaseHTTPRequestHandler, HTTPServer
 import threading
 
+from app.metrics import CONTENT_TYPE, REGISTRY
+
 
 def health_check() -> Dict[str, str]:
     """
@@ -22,6 +24,12 @@ class HealthHandler(BaseHTTPRequestHandler):
             self.send_header("Content-Type", "application/json")
             self.end_headers()
             self.wfile.write(payload)
+        elif self.path == "/metrics":
+            payload = REGISTRY.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.end_headers()
+            self.wfile.write(payload)
         else:
             self.send_response(404)
             self.end_headers()
@@ -29,7 +37,8 @@ class HealthHandler(BaseHTTPRequestHandler):
 
 def start_health_server(port: int = 8080) -> None:
     """
-    Starts a background HTTP server exposing /health.
+    Starts a background HTTP server exposing /health and, in Prometheus
+    text format, /metrics.
     """
     server = HTTPServer(("0.0.0.0", port), HealthHandler)
     thread = threading.Thread(target=server.serve_forever, daemon=True)
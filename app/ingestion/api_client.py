@@ -2,21 +2,130 @@
 
 from __future__ import annotations
 
-import sqlite3
+import json
+import logging
+import threading
 import requests
 from datetime import datetime, timezone
-from typing import Any, Dict
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
+from app.ingestion.batch_writer import BatchWriter, CommitStats
+from app.ingestion.push_worker import PushWorker
+from app.ingestion.replay import ReplayEngine
+from app.metrics import (
+    COMMIT_PENDING,
+    PUSH_FAILURES,
+    PUSH_QUEUE_DEPTH,
+    PUSH_SECONDS,
+    record_ingestion,
+)
 from app.models import GeigerRecord
+from app.snapshot import SnapshotWriter
+
+log = logging.getLogger(__name__)
+
+
+def push_payload(record: GeigerRecord) -> Dict[str, Any]:
+    """
+    JSON payload of one reading as sent to the ingestion API.
+    """
+    return {
+        "counts_per_second": record.counts_per_second,
+        "counts_per_minute": record.counts_per_minute,
+        "microsieverts_per_hour": record.microsieverts_per_hour,
+        "mode": record.mode,
+        "device_id": record.device_id,
+        "timestamp": record.timestamp.isoformat(),
+    }
+
+
+def snapshot_payload(
+    record: GeigerRecord,
+    ingested: int,
+    queue_depth: int,
+    push_dropped: int,
+    replayed: int,
+) -> Dict[str, Any]:
+    """
+    Snapshot document for the newest committed reading and the pipeline
+    counters (see app/snapshot.py).
+    """
+    return {
+        "latest": {
+            "id": record.id,
+            "timestamp": record.timestamp.isoformat(),
+            "cps": record.counts_per_second,
+            "cpm": record.counts_per_minute,
+            "usv": record.microsieverts_per_hour,
+            "mode": record.mode,
+            "device_id": record.device_id,
+            "raw": record.raw,
+        },
+        "counters": {
+            "ingested": ingested,
+            "queue_depth": queue_depth,
+            "push_dropped": push_dropped,
+            "replayed": replayed,
+        },
+    }
+
+
+def iter_push_batches(
+    records: List[GeigerRecord], max_records: int, max_bytes: int
+) -> Iterator[Tuple[List[GeigerRecord], bytes]]:
+    """
+    Split records into JSON array bodies bounded by max_records and
+    max_bytes. A single oversized record is sent on its own.
+    """
+    batch: List[GeigerRecord] = []
+    parts: List[bytes] = []
+    size = 2  # surrounding brackets
+
+    for record in records:
+        part = json.dumps(push_payload(record), separators=(",", ":")).encode()
+        extra = len(part) + (1 if parts else 0)
+
+        if batch and (len(batch) >= max_records or size + extra > max_bytes):
+            yield batch, b"[" + b",".join(parts) + b"]"
+            batch, parts, size = [], [], 2
+            extra = len(part)
+
+        batch.append(record)
+        parts.append(part)
+        size += extra
+
+    if batch:
+        yield batch, b"[" + b",".join(parts) + b"]"
+
+
+def accepted_ids_in(batch: List[GeigerRecord], result: Any) -> List[int]:
+    """
+    Row IDs of batch accepted by a 2xx batch response with JSON body result.
+
+    The whole array is accepted unless result carries "accepted": a list of
+    positions (0-based, within the array) that were stored.
+    """
+    positions: Iterable[int] = range(len(batch))
+    if isinstance(result, dict) and isinstance(result.get("accepted"), list):
+        positions = [
+            p for p in result["accepted"] if isinstance(p, int) and 0 <= p < len(batch)
+        ]
+    return [rid for rid in (batch[p].id for p in positions) if rid is not None]
 
 
 class PushClient:
     """
     PushClient is the ingestion engine:
       - receives parsed records via handle_record()
-      - writes them to SQLite
-      - pushes them immediately to the ingestion API
-      - marks them pushed on success
+      - writes them to SQLite through a group-commit BatchWriter
+      - hands them to a background PushWorker, which pushes them to the
+        ingestion API and marks them pushed on success
+      - replays rows left unpushed (failures, overflow) via a ReplayEngine
+      - optionally publishes the latest reading and pipeline counters to a
+        shared-memory snapshot read by the API process
+
+    The serial loop only parses and persists; call start() to run the push
+    worker and close() on shutdown.
 
     Device identity headers (X-Device-Name, X-Device-Token) are added to every
     push request so Beamwarden can authenticate the device.
@@ -30,6 +139,19 @@ class PushClient:
         db_path: str,
         device_name: str | None = None,
         device_token: str | None = None,
+        commit_batch_size: int = 100,
+        commit_max_latency: float = 1.0,
+        push_queue_size: int = 1000,
+        push_overflow: str = "spill",
+        batch_push: bool = False,
+        batch_url: Optional[str] = None,
+        max_batch_records: int = 500,
+        max_batch_bytes: int = 256 * 1024,
+        batch_timeout: float = 30.0,
+        replay_interval: float = 60.0,
+        replay_rate_limit: float = 50.0,
+        replay_page_size: int = 100,
+        snapshot_path: Optional[str] = None,
     ) -> None:
         if not api_url:
             raise ValueError("PushClient requires a non-empty api_url")
@@ -43,71 +165,104 @@ class PushClient:
         self.device_name = device_name or device_id
         self.device_token = device_token or ""
 
-        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
-        self._conn.execute("PRAGMA journal_mode=WAL;")
-        self._conn.execute("PRAGMA synchronous=NORMAL;")
+        # The snapshot only ever shows readings that are committed
+        self._writer = BatchWriter(
+            self.db_path,
+            max_batch_size=commit_batch_size,
+            max_latency_seconds=commit_max_latency,
+            on_commit=self._publish_snapshot,
+        )
+
+        # Batch push: arrays of payloads per POST (defaults to ingest_url)
+        self.batch_url = batch_url or api_url
+        self.max_batch_records = max_batch_records
+        self.max_batch_bytes = max_batch_bytes
+        self.batch_timeout = batch_timeout
+
+        push_batch = self._push_batch if batch_push else None
+
+        self._replay = ReplayEngine(
+            self.db_path,
+            self._writer,
+            push_batch=push_batch or self._push_each,
+            page_size=replay_page_size,
+            rate_limit=replay_rate_limit,
+            interval_seconds=replay_interval,
+        )
+
+        self._ingested = 0
+        self._ingested_lock = threading.Lock()
+        self._snapshot: Optional[SnapshotWriter] = None
+        if snapshot_path:
+            try:
+                self._snapshot = SnapshotWriter(snapshot_path)
+            except OSError as exc:
+                log.warning("snapshot_disabled", extra={"error": repr(exc)})
+
+        self._worker = PushWorker(
+            push=self._push_single,
+            writer=self._writer,
+            queue_size=push_queue_size,
+            push_batch=push_batch,
+            batch_size=max_batch_records,
+            replay=self._replay,
+            overflow_policy=push_overflow,
+        )
 
     # ------------------------------------------------------------
     # SQLite helpers
     # ------------------------------------------------------------
 
-    def _insert_record(self, parsed: Dict[str, Any]) -> int:
+    def _insert_record(self, parsed: Dict[str, Any], device_id: str) -> int:
         """
         Insert a parsed geiger record into SQLite.
-        Returns the inserted row ID.
+        Returns the inserted row ID; the row is committed with its batch.
         """
+        return self._writer.insert(parsed, device_id)
 
-        timestamp = parsed.get("timestamp") or datetime.now(timezone.utc)
+    @property
+    def commit_stats(self) -> CommitStats:
+        return self._writer.stats
 
-        cur = self._conn.cursor()
-        cur.execute(
-            """
-            INSERT INTO geiger_readings (
-                raw,
-                counts_per_second,
-                counts_per_minute,
-                microsieverts_per_hour,
-                mode,
-                device_id,
-                timestamp,
-                pushed
-            )
-            VALUES (?, ?, ?, ?, ?, ?, ?, 0)
-            """,
-            (
-                parsed["raw"],
-                parsed["cps"],
-                parsed["cpm"],
-                parsed["usv"],
-                parsed["mode"],
-                self.device_id,
-                timestamp.isoformat(),
-            ),
-        )
-        self._conn.commit()
+    # ------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------
 
-        rowid = cur.lastrowid
-        assert rowid is not None
-        return rowid
+    @property
+    def queue_depth(self) -> int:
+        """
+        Number of persisted records waiting in the push handoff queue.
+        """
+        return self._worker.queue_depth
 
-    def _mark_pushed(self, row_id: int) -> None:
-        cur = self._conn.cursor()
-        cur.execute(
-            "UPDATE geiger_readings SET pushed = 1 WHERE id = ?",
-            (row_id,),
-        )
-        self._conn.commit()
+    def start(self) -> None:
+        """
+        Start the background push worker.
+        """
+        PUSH_QUEUE_DEPTH.set_function(lambda: self._worker.queue_depth)
+        COMMIT_PENDING.set_function(lambda: self._writer.pending)
+        self._worker.start()
+
+    def close(self) -> None:
+        """
+        Stop the push worker, flush pending writes and release SQLite.
+        Records still queued stay in SQLite with pushed = 0.
+        """
+        PUSH_QUEUE_DEPTH.set_function(None)
+        COMMIT_PENDING.set_function(None)
+        self._worker.stop()
+        if self._worker.is_alive():
+            self._worker.join(timeout=10.0)
+        self._writer.close()
+        if self._snapshot is not None:
+            self._snapshot.close()
+            self._snapshot = None
 
     # ------------------------------------------------------------
     # Push logic
     # ------------------------------------------------------------
 
-    def _push_single(self, record: GeigerRecord) -> bool:
-        """
-        Push a single GeigerRecord to the ingestion endpoint.
-        Returns True on success.
-        """
-
+    def _headers(self) -> Dict[str, str]:
         headers = {
             "X-Device-Name": self.device_name,
             "X-Device-Token": self.device_token,
@@ -116,27 +271,87 @@ class PushClient:
         if self.api_token:
             headers["Authorization"] = f"Bearer {self.api_token}"
 
-        payload = {
-            "counts_per_second": record.counts_per_second,
-            "counts_per_minute": record.counts_per_minute,
-            "microsieverts_per_hour": record.microsieverts_per_hour,
-            "mode": record.mode,
-            "device_id": record.device_id,
-            "timestamp": record.timestamp.isoformat(),
-        }
+        return headers
+
+    @staticmethod
+    def _payload(record: GeigerRecord) -> Dict[str, Any]:
+        return push_payload(record)
+
+    def _push_single(self, record: GeigerRecord) -> bool:
+        """
+        Push a single GeigerRecord to the ingestion endpoint.
+        Returns True on success.
+        """
 
         try:
-            resp = requests.post(
-                self.ingest_url,
-                json=payload,
-                headers=headers,
-                timeout=5,
-            )
+            with PUSH_SECONDS.time():
+                resp = requests.post(
+                    self.ingest_url,
+                    json=self._payload(record),
+                    headers=self._headers(),
+                    timeout=5,
+                )
             resp.raise_for_status()
             return True
         except Exception:
+            PUSH_FAILURES.inc()
             return False
 
+    def _push_each(self, records: List[GeigerRecord]) -> List[int]:
+        """
+        Push records one request at a time; returns the IDs that succeeded.
+        Stops at the first failure, since the rest would likely fail too.
+        """
+        accepted_ids: List[int] = []
+        for record in records:
+            if record.id is None:
+                continue
+            if not self._push_single(record):
+                break
+            accepted_ids.append(record.id)
+        return accepted_ids
+
+    def _iter_batches(
+        self, records: List[GeigerRecord]
+    ) -> Iterator[Tuple[List[GeigerRecord], bytes]]:
+        return iter_push_batches(records, self.max_batch_records, self.max_batch_bytes)
+
+    def _push_batch(self, records: List[GeigerRecord]) -> List[int]:
+        """
+        Push records as JSON arrays to the batch endpoint.
+        Returns the row IDs the server accepted.
+
+        A 2xx response accepts the whole array unless its JSON body carries
+        "accepted": a list of positions (0-based, within that array) that
+        were stored; everything else is left for a later retry.
+        """
+        accepted_ids: List[int] = []
+        headers = {**self._headers(), "Content-Type": "application/json"}
+
+        for batch, body in self._iter_batches(records):
+            try:
+                with PUSH_SECONDS.time():
+                    resp = requests.post(
+                        self.batch_url,
+                        data=body,
+                        headers=headers,
+                        timeout=self.batch_timeout,
+                    )
+                resp.raise_for_status()
+            except Exception:
+                PUSH_FAILURES.inc()
+                # Later batches would most likely fail the same way
+                break
+
+            try:
+                result = resp.json()
+            except ValueError:
+                result = None
+
+            accepted_ids.extend(accepted_ids_in(batch, result))
+
+        return accepted_ids
+
     # ------------------------------------------------------------
     # Public callback for SerialReader
     # ------------------------------------------------------------
@@ -144,22 +359,53 @@ class PushClient:
     def handle_record(self, parsed: Dict[str, Any]) -> None:
         """
         Called by SerialReader for every parsed record.
+
+        Persists the record and hands it to the push worker; never blocks
+        on the network (unless the push queue's overflow policy is
+        "block"). parsed["device_id"], set by multi-device readers,
+        overrides the client's device_id.
         """
+        record = self._persist(parsed)
+        self._worker.submit(record)
 
-        row_id = self._insert_record(parsed)
+    def spill_record(self, parsed: Dict[str, Any]) -> None:
+        """
+        Persist a parsed record without handing it to the push worker;
+        the backlog replay pushes it later. Used by stage queues that
+        overflow with the "spill" policy, from any thread.
+        """
+        self._persist(parsed)
 
+    def _persist(self, parsed: Dict[str, Any]) -> GeigerRecord:
         timestamp = parsed.get("timestamp") or datetime.now(timezone.utc)
+        device_id = parsed.get("device_id") or self.device_id
+
+        row_id = self._insert_record({**parsed, "timestamp": timestamp}, device_id)
 
-        record = GeigerRecord(
+        with self._ingested_lock:
+            self._ingested += 1
+        record_ingestion(parsed)
+        return GeigerRecord(
             id=row_id,
             raw=parsed["raw"],
             counts_per_second=parsed["cps"],
             counts_per_minute=parsed["cpm"],
             microsieverts_per_hour=parsed["usv"],
             mode=parsed["mode"],
-            device_id=self.device_id,
+            device_id=device_id,
             timestamp=timestamp,
         )
 
-        if self._push_single(record):
-            self._mark_pushed(row_id)
+    def _publish_snapshot(self, record: GeigerRecord) -> None:
+        if self._snapshot is None:
+            return
+
+        self._snapshot.publish(
+            snapshot_payload(
+                record,
+                ingested=self._ingested,
+                queue_depth=self._worker.queue_depth,
+                push_dropped=self._worker.dropped,
+                replayed=self._replay.replayed,
+            )
+        )
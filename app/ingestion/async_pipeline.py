@@ -0,0 +1,610 @@
+# filename: app/ingestion/async_pipeline.py
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, TypeVar
+
+import httpx
+
+from app.ingestion.api_client import (
+    accepted_ids_in,
+    iter_push_batches,
+    push_payload,
+    snapshot_payload,
+)
+from app.ingestion.batch_writer import BatchWriter, CommitStats
+from app.ingestion.csv_parser import parse_geiger_bytes
+from app.ingestion.multi_reader import DeviceSpec
+from app.ingestion.push_worker import observe_acked
+from app.ingestion.serial_reader import SerialReader
+from app.ingestion.replay import ReplayEngine
+from app.ingestion.stage_queue import OVERFLOW_POLICIES, overflow_action
+from app.ingestion.watchdog import ReconnectBackoff
+from app.metrics import (
+    COMMIT_PENDING,
+    LINES_READ,
+    PARSE_FAILURES,
+    PARSE_SECONDS,
+    PUSH_DROPPED,
+    PUSH_FAILURES,
+    PUSH_QUEUE_DEPTH,
+    PUSH_SECONDS,
+    SERIAL_DISCONNECTED,
+    SERIAL_RECONNECT_ATTEMPTS,
+    SERIAL_RECONNECT_SECONDS,
+    SERIAL_RECONNECTS,
+    record_ingestion,
+)
+from app.models import GeigerRecord
+from app.snapshot import SnapshotWriter
+
+log = logging.getLogger(__name__)
+
+R = TypeVar("R")
+
+
+class AsyncSerialSource:
+    """
+    One serial device read from the event loop.
+
+    The port is opened non-blocking and its fd registered with
+    loop.add_reader(), so read_frames() only touches the port once the tty
+    is readable and then pulls everything waiting (SerialReader in buffered
+    mode). A port that errors or stays silent for dead_threshold_seconds is
+    closed and reopened with the same policy as WatchdogSerialReader:
+    failed attempts back off exponentially with jitter (reopen_sleep_seconds
+    up to max_backoff_seconds), and a missing device node is polled every
+    path_poll_seconds. Every wait is an asyncio.sleep, so the other tasks
+    keep running.
+    """
+
+    def __init__(
+        self,
+        spec: DeviceSpec,
+        baudrate: int = 9600,
+        dead_threshold_seconds: float = 5.0,
+        reopen_sleep_seconds: float = 2.0,
+        max_backoff_seconds: float = 60.0,
+        path_poll_seconds: float = 0.5,
+        buffer_size: int = 64 * 1024,
+    ) -> None:
+        self.spec = spec
+        self.reader = SerialReader(
+            spec.path,
+            baudrate,
+            timeout=0,
+            buffered=True,
+            buffer_size=buffer_size,
+        )
+        self._dead_threshold = dead_threshold_seconds
+        self._path_poll = path_poll_seconds
+        self._backoff = ReconnectBackoff(
+            initial=reopen_sleep_seconds,
+            maximum=max(max_backoff_seconds, reopen_sleep_seconds),
+        )
+        self._ready = asyncio.Event()
+        self._fd: Optional[int] = None
+        self.last_frame_ts = time.monotonic()
+        # monotonic time the port was lost, None while connected
+        self.disconnected_at: Optional[float] = None
+        self.reopens = 0
+
+    async def read_frames(self) -> List[bytes]:
+        """
+        Wait for and return the next non-empty list of complete frames,
+        reopening the port as often as needed.
+        """
+        while True:
+            if self.reader.ser is None:
+                if not os.path.exists(self.spec.path):
+                    # Adapter unplugged: wait for udev to recreate the node
+                    await asyncio.sleep(self._path_poll)
+                    continue
+                if not self._open():
+                    SERIAL_RECONNECT_ATTEMPTS.inc()
+                    await self._reopen()
+                    continue
+
+            try:
+                frames = self.reader.read_frames()
+            except Exception as exc:
+                log.error(
+                    "async_source_read_failed",
+                    extra={"device_id": self.spec.device_id, "error": repr(exc)},
+                )
+                await self._reopen()
+                continue
+
+            if frames:
+                self.last_frame_ts = time.monotonic()
+                return frames
+
+            remaining = self._dead_threshold - (time.monotonic() - self.last_frame_ts)
+            if remaining <= 0:
+                log.warning(
+                    "watchdog_dead_link_detected",
+                    extra={
+                        "device_id": self.spec.device_id,
+                        "last_frame_age": time.monotonic() - self.last_frame_ts,
+                    },
+                )
+                await self._reopen()
+                continue
+
+            self._ready.clear()
+            try:
+                await asyncio.wait_for(self._ready.wait(), remaining)
+            except asyncio.TimeoutError:
+                pass
+
+    def _open(self) -> bool:
+        try:
+            fd = self.reader.open_port().fileno()
+            asyncio.get_running_loop().add_reader(fd, self._ready.set)
+            self._fd = fd
+        except Exception as exc:
+            log.error(
+                "async_source_open_failed",
+                extra={"device_id": self.spec.device_id, "error": repr(exc)},
+            )
+            self.close()
+            return False
+
+        # A freshly opened port gets a full dead_threshold to produce data
+        self.last_frame_ts = time.monotonic()
+        self._backoff.reset()
+        log.info(
+            "async_source_open",
+            extra={"device_id": self.spec.device_id, "path": self.spec.path},
+        )
+
+        if self.disconnected_at is not None:
+            downtime = time.monotonic() - self.disconnected_at
+            self.disconnected_at = None
+            SERIAL_RECONNECTS.inc()
+            SERIAL_RECONNECT_SECONDS.observe(downtime)
+            SERIAL_DISCONNECTED.dec()
+        return True
+
+    async def _reopen(self) -> None:
+        self.close()
+        if self.disconnected_at is None:
+            self.disconnected_at = time.monotonic()
+            SERIAL_DISCONNECTED.inc()
+        self.reopens += 1
+        delay = self._backoff.next_delay()
+        log.warning(
+            "watchdog_reopen_start",
+            extra={"device_id": self.spec.device_id, "retry_in": delay},
+        )
+        await asyncio.sleep(delay)
+
+    def close(self) -> None:
+        if self._fd is not None:
+            try:
+                asyncio.get_running_loop().remove_reader(self._fd)
+            except (RuntimeError, ValueError, OSError):
+                pass
+            self._fd = None
+
+        ser = self.reader.ser
+        self.reader.ser = None
+        if ser is None:
+            return
+        try:
+            ser.close()
+        except Exception as exc:
+            log.error(
+                "watchdog_close_failed",
+                extra={"device_id": self.spec.device_id, "error": repr(exc)},
+            )
+
+
+class AsyncIngestionPipeline:
+    """
+    asyncio variant of SerialReader + PushClient: reads, persists and
+    pushes in one event loop thread.
+
+      - one reader task per device (AsyncSerialSource)
+      - SQLite goes through the group-commit BatchWriter, but every call
+        runs on a single dedicated "sqlite-writer" thread so the loop never
+        blocks on the database; all frames from one wakeup are inserted in
+        one hop
+      - persisted records are handed to a pusher task through a bounded
+        asyncio.Queue and POSTed with httpx.AsyncClient. When the queue is
+        full, push_overflow decides as for PushClient: "spill" leaves the
+        new record to the replay (it stays in SQLite, pushed = 0),
+        "drop-oldest" does that to the oldest queued record instead, and
+        "block" makes the device's read task wait for room
+      - a replay task re-pushes pushed = 0 rows with the same ReplayEngine
+        as PushClient (at most replay_rate_limit records per second, pausing
+        replay_interval after a pass or a page the server rejected
+        entirely); its SQLite halves run on the writer thread and the page
+        is pushed from the loop
+
+    run() returns when stop() is called or the task running it is
+    cancelled. Either way the tasks are cancelled, pending writes are
+    committed and the HTTP client is closed; records still queued stay in
+    SQLite with pushed = 0.
+    """
+
+    def __init__(
+        self,
+        devices: Sequence[DeviceSpec],
+        api_url: str,
+        api_token: str,
+        db_path: str,
+        baudrate: int = 9600,
+        device_name: str | None = None,
+        device_token: str | None = None,
+        commit_batch_size: int = 100,
+        commit_max_latency: float = 1.0,
+        push_queue_size: int = 1000,
+        push_overflow: str = "spill",
+        batch_push: bool = False,
+        batch_url: Optional[str] = None,
+        max_batch_records: int = 500,
+        max_batch_bytes: int = 256 * 1024,
+        batch_timeout: float = 30.0,
+        replay_interval: float = 60.0,
+        replay_rate_limit: float = 50.0,
+        replay_page_size: int = 100,
+        snapshot_path: Optional[str] = None,
+        dead_threshold_seconds: float = 5.0,
+        reopen_sleep_seconds: float = 2.0,
+        max_backoff_seconds: float = 60.0,
+        path_poll_seconds: float = 0.5,
+        client: Optional[httpx.AsyncClient] = None,
+    ) -> None:
+        if not devices:
+            raise ValueError("AsyncIngestionPipeline requires at least one device")
+        if not api_url:
+            raise ValueError("AsyncIngestionPipeline requires a non-empty api_url")
+        if push_overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {push_overflow!r}")
+
+        self.sources = [
+            AsyncSerialSource(
+                spec,
+                baudrate,
+                dead_threshold_seconds=dead_threshold_seconds,
+                reopen_sleep_seconds=reopen_sleep_seconds,
+                max_backoff_seconds=max_backoff_seconds,
+                path_poll_seconds=path_poll_seconds,
+            )
+            for spec in devices
+        ]
+        self.push_overflow = push_overflow
+        self.ingest_url = api_url
+        self.batch_url = batch_url or api_url
+        self.db_path = db_path
+        self.batch_push = batch_push
+        self.max_batch_records = max_batch_records
+        self.max_batch_bytes = max_batch_bytes
+        self.batch_timeout = batch_timeout
+        self.replay_interval = replay_interval
+
+        device_id = devices[0].device_id
+        self._headers = {
+            "X-Device-Name": device_name or device_id,
+            "X-Device-Token": device_token or "",
+        }
+        if api_token:
+            self._headers["Authorization"] = f"Bearer {api_token}"
+        self._batch_headers = {**self._headers, "Content-Type": "application/json"}
+
+        self._client = client
+        self._owns_client = client is None
+
+        self._db = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sqlite-writer")
+        # The snapshot only ever shows readings that are committed
+        self._writer = BatchWriter(
+            db_path,
+            max_batch_size=commit_batch_size,
+            max_latency_seconds=commit_max_latency,
+            on_commit=self._publish_snapshot,
+        )
+        self._replay = ReplayEngine(
+            db_path,
+            self._writer,
+            page_size=replay_page_size,
+            rate_limit=replay_rate_limit,
+            interval_seconds=replay_interval,
+        )
+
+        self._queue: asyncio.Queue[GeigerRecord] = asyncio.Queue(
+            maxsize=push_queue_size
+        )
+        # IDs queued or being pushed live; replay skips them
+        self._queued_ids: Set[int] = set()
+        self._stop = asyncio.Event()
+
+        self.ingested = 0
+        self.dropped = 0
+
+        self._snapshot: Optional[SnapshotWriter] = None
+        if snapshot_path:
+            try:
+                self._snapshot = SnapshotWriter(snapshot_path)
+            except OSError as exc:
+                log.warning("snapshot_disabled", extra={"error": repr(exc)})
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    @property
+    def commit_stats(self) -> CommitStats:
+        return self._writer.stats
+
+    @property
+    def replayed(self) -> int:
+        return self._replay.replayed
+
+    # ------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------
+
+    def stop(self) -> None:
+        """
+        Ask run() to shut down; call from the event loop thread.
+        """
+        self._stop.set()
+
+    async def run(self) -> None:
+        if self._client is None:
+            self._client = httpx.AsyncClient()
+
+        PUSH_QUEUE_DEPTH.set_function(lambda: self._queue.qsize())
+        COMMIT_PENDING.set_function(lambda: self._writer.pending)
+
+        tasks = [
+            asyncio.create_task(self._read_loop(source), name=source.spec.device_id)
+            for source in self.sources
+        ]
+        tasks.append(asyncio.create_task(self._push_loop(), name="push"))
+        tasks.append(asyncio.create_task(self._replay_loop(), name="replay"))
+        stopped = asyncio.create_task(self._stop.wait())
+
+        try:
+            await asyncio.wait([stopped, *tasks], return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in (stopped, *tasks):
+                task.cancel()
+            await asyncio.gather(stopped, *tasks, return_exceptions=True)
+            await self._shutdown()
+
+    async def _shutdown(self) -> None:
+        PUSH_QUEUE_DEPTH.set_function(None)
+        COMMIT_PENDING.set_function(None)
+        for source in self.sources:
+            source.close()
+            if source.disconnected_at is not None:
+                source.disconnected_at = None
+                SERIAL_DISCONNECTED.dec()
+
+        try:
+            await self._db_call(self._writer.close)
+        finally:
+            self._db.shutdown(wait=True)
+            if self._owns_client and self._client is not None:
+                await self._client.aclose()
+                self._client = None
+            if self._snapshot is not None:
+                self._snapshot.close()
+                self._snapshot = None
+
+    def _db_call(self, fn: Callable[..., R], *args: Any) -> asyncio.Future[R]:
+        """
+        Run fn(*args) on the SQLite writer thread.
+        """
+        return asyncio.get_running_loop().run_in_executor(self._db, fn, *args)
+
+    # ------------------------------------------------------------
+    # Read + persist
+    # ------------------------------------------------------------
+
+    async def _read_loop(self, source: AsyncSerialSource) -> None:
+        device_id = source.spec.device_id
+        while True:
+            frames = await source.read_frames()
+            rows = [p for p in (self._parse(raw) for raw in frames) if p is not None]
+            if not rows:
+                continue
+
+            try:
+                records = await self._db_call(self._persist, rows, device_id)
+            except Exception as exc:
+                log.error(
+                    "async_pipeline_persist_failed",
+                    extra={"device_id": device_id, "error": repr(exc)},
+                )
+                continue
+
+            await self._submit(records)
+            for parsed in rows:
+                self.ingested += 1
+                record_ingestion(parsed)
+
+    @staticmethod
+    def _parse(raw: bytes) -> Optional[Dict[str, Any]]:
+        with PARSE_SECONDS.time():
+            parsed = parse_geiger_bytes(raw)
+
+        if parsed is not None:
+            LINES_READ.inc()
+            parsed["timestamp"] = datetime.now(timezone.utc)
+        elif raw.strip():
+            LINES_READ.inc()
+            PARSE_FAILURES.inc()
+        return parsed
+
+    def _persist(
+        self, rows: List[Dict[str, Any]], device_id: str
+    ) -> List[GeigerRecord]:
+        # Runs on the writer thread
+        return [
+            GeigerRecord(
+                id=self._writer.insert(parsed, device_id),
+                raw=parsed["raw"],
+                counts_per_second=parsed["cps"],
+                counts_per_minute=parsed["cpm"],
+                microsieverts_per_hour=parsed["usv"],
+                mode=parsed["mode"],
+                device_id=device_id,
+                timestamp=parsed["timestamp"],
+            )
+            for parsed in rows
+        ]
+
+    async def _submit(self, records: List[GeigerRecord]) -> None:
+        # Shield the whole batch from replay before the first await: under
+        # "block" the replay task runs while we wait for room
+        self._queued_ids.update(r.id for r in records if r.id is not None)
+
+        for record in records:
+            if self.push_overflow == "block":
+                await self._queue.put(record)
+                continue
+
+            action = overflow_action("push", self.push_overflow, self._queue.full())
+            if action == "spill":
+                self._left_for_replay(record)
+                continue
+            if action == "evict":
+                self._left_for_replay(self._queue.get_nowait())
+            self._queue.put_nowait(record)
+
+    def _left_for_replay(self, record: GeigerRecord) -> None:
+        # Already persisted with pushed = 0: the replay task sends it later
+        self.dropped += 1
+        PUSH_DROPPED.inc()
+        if record.id is not None:
+            self._queued_ids.discard(record.id)
+
+    # ------------------------------------------------------------
+    # Push
+    # ------------------------------------------------------------
+
+    async def _push_loop(self) -> None:
+        limit = self.max_batch_records if self.batch_push else 1
+        while True:
+            records = [await self._queue.get()]
+            while len(records) < limit and not self._queue.empty():
+                records.append(self._queue.get_nowait())
+
+            try:
+                accepted = await self._push(records)
+                await self._db_call(self._writer.mark_records_pushed, accepted)
+            except Exception as exc:
+                # Never crash the pusher; unacked rows are replayed later
+                log.error("async_pipeline_push_error", extra={"error": repr(exc)})
+                continue
+            finally:
+                # Only now, so replay cannot pick up a row while it is in flight
+                self._queued_ids.difference_update(
+                    r.id for r in records if r.id is not None
+                )
+            observe_acked(records, accepted)
+
+    async def _push(self, records: List[GeigerRecord]) -> List[int]:
+        """
+        Push records and return the row IDs the server accepted, stopping
+        at the first failed request.
+        """
+        if self.batch_push:
+            return await self._push_batch(records)
+
+        accepted: List[int] = []
+        for record in records:
+            if record.id is None:
+                continue
+            resp = await self._post(
+                self.ingest_url, self._headers, 5.0, json=push_payload(record)
+            )
+            if resp is None:
+                break
+            accepted.append(record.id)
+        return accepted
+
+    async def _push_batch(self, records: List[GeigerRecord]) -> List[int]:
+        accepted: List[int] = []
+        batches = iter_push_batches(
+            records, self.max_batch_records, self.max_batch_bytes
+        )
+        for batch, body in batches:
+            resp = await self._post(
+                self.batch_url, self._batch_headers, self.batch_timeout, content=body
+            )
+            if resp is None:
+                break
+            try:
+                result = resp.json()
+            except ValueError:
+                result = None
+            accepted.extend(accepted_ids_in(batch, result))
+        return accepted
+
+    async def _post(
+        self, url: str, headers: Dict[str, str], timeout: float, **kwargs: Any
+    ) -> Optional[httpx.Response]:
+        assert self._client is not None
+        try:
+            with PUSH_SECONDS.time():
+                resp = await self._client.post(
+                    url, headers=headers, timeout=timeout, **kwargs
+                )
+            resp.raise_for_status()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            PUSH_FAILURES.inc()
+            return None
+        return resp
+
+    # ------------------------------------------------------------
+    # Backlog replay
+    # ------------------------------------------------------------
+
+    async def _replay_loop(self) -> None:
+        while True:
+            delay = self._replay.seconds_until_due()
+            if delay > 0:
+                await asyncio.sleep(delay)
+                continue
+
+            try:
+                page = await self._db_call(
+                    self._replay.take_page, frozenset(self._queued_ids)
+                )
+                if page is None:
+                    continue
+                accepted = await self._push(page.candidates) if page.candidates else []
+                await self._db_call(self._replay.finish_page, page, accepted)
+            except Exception as exc:
+                log.error("async_pipeline_replay_error", extra={"error": repr(exc)})
+                await asyncio.sleep(self.replay_interval)
+
+    # ------------------------------------------------------------
+    # Snapshot
+    # ------------------------------------------------------------
+
+    def _publish_snapshot(self, record: GeigerRecord) -> None:
+        if self._snapshot is None:
+            return
+
+        self._snapshot.publish(
+            snapshot_payload(
+                record,
+                ingested=self.ingested,
+                queue_depth=self._queue.qsize(),
+                push_dropped=self.dropped,
+                replayed=self._replay.replayed,
+            )
+        )
@@ -0,0 +1,314 @@
+# filename: app/ingestion/batch_parser.py
+
+"""
+Columnar parsing of captured MightyOhm output (many lines at once).
+
+parse_geiger_csv_many() turns a buffer of newline-separated lines into
+array.array columns; iter_geiger_file() does the same for a file of any
+size by memory-mapping it and parsing it in bounded chunks. Per line, a
+row is valid exactly when parse_geiger_bytes() accepts the line, except
+that counts outside the signed 64-bit range are rejected (they do not fit
+the column).
+"""
+
+from __future__ import annotations
+
+import mmap
+import operator
+import os
+from array import array
+from dataclasses import dataclass, field
+from itertools import accumulate
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+from app.ingestion.csv_parser import parse_geiger_bytes
+
+Buffer = Union[bytes, bytearray]
+
+# Mode code stored for rows that did not parse
+INVALID_MODE = 0xFFFF
+
+DEFAULT_CHUNK_SIZE = 8 * 1024 * 1024
+
+# Unit of the columnar-or-per-line decision inside one buffer
+BLOCK_SIZE = 16 * 1024
+
+_INT64_MIN = -(2**63)
+_INT64_MAX = 2**63 - 1
+
+
+@dataclass
+class ParsedColumns:
+    """
+    One entry per non-blank line, in input order.
+
+    cps/cpm/usv hold the parsed values (0 for invalid rows), mode holds a
+    code into mode_names (INVALID_MODE for invalid rows) and valid is 1/0
+    per row. starts/ends are absolute byte offsets of each line without its
+    line terminator; invalid_offsets repeats the start offsets of the rows
+    that did not parse. Blank lines are skipped entirely.
+    """
+
+    cps: array = field(default_factory=lambda: array("q"))
+    cpm: array = field(default_factory=lambda: array("q"))
+    usv: array = field(default_factory=lambda: array("d"))
+    mode: array = field(default_factory=lambda: array("H"))
+    valid: bytearray = field(default_factory=bytearray)
+    starts: array = field(default_factory=lambda: array("Q"))
+    ends: array = field(default_factory=lambda: array("Q"))
+    invalid_offsets: array = field(default_factory=lambda: array("Q"))
+    mode_names: List[str] = field(default_factory=list)
+    # The parsed buffer and its absolute offset, for raw()
+    data: bytes = b""
+    base_offset: int = 0
+
+    def __len__(self) -> int:
+        return len(self.valid)
+
+    @property
+    def valid_count(self) -> int:
+        return len(self.valid) - len(self.invalid_offsets)
+
+    def raw(self, i: int) -> str:
+        """
+        The original line of row i, stripped, as parse_geiger_csv reports it.
+        """
+        start = self.starts[i] - self.base_offset
+        end = self.ends[i] - self.base_offset
+        return self.data[start:end].decode("utf-8", errors="ignore").strip()
+
+    def mode_name(self, i: int) -> Optional[str]:
+        code = self.mode[i]
+        return None if code == INVALID_MODE else self.mode_names[code]
+
+
+class _ModeTable:
+    """
+    Dictionary encoding of mode strings, shared across chunks of one file
+    so codes stay stable.
+    """
+
+    def __init__(self) -> None:
+        self.codes: Dict[bytes, int] = {}
+        self.names: List[str] = []
+
+    def code(self, mode: bytes) -> int:
+        code = self.codes.get(mode)
+        if code is None:
+            code = len(self.names)
+            if code >= INVALID_MODE:
+                raise ValueError("Too many distinct modes to encode")
+            self.codes[mode] = code
+            self.names.append(mode.decode("utf-8"))
+        return code
+
+
+def _spans(
+    buf: Any, size: int, chunk_size: int, start: int = 0
+) -> Iterator[Tuple[int, int]]:
+    """
+    Yield [start, end) spans of buf (bytes or mmap) of about chunk_size
+    bytes that end on a newline (except the last), so no line is split.
+    """
+    while start < size:
+        end = min(start + chunk_size, size)
+        if end < size:
+            newline = buf.rfind(b"\n", start, end)
+            if newline == -1:
+                # A single line longer than chunk_size: extend to its end
+                newline = buf.find(b"\n", end)
+                end = size if newline == -1 else newline + 1
+            else:
+                end = newline + 1
+        yield start, end
+        start = end
+
+
+def _parse_block_columnar(
+    block: bytes, base_offset: int, modes: _ModeTable, cols: ParsedColumns
+) -> bool:
+    """
+    Parse a block in which every line is a well-formed reading using
+    whole-block operations: one split yields every field, and each column
+    is converted with a single map(). Returns False, without touching cols,
+    when any line needs the per-line path.
+    """
+    if not block.isascii():
+        return False
+    data = block if block.endswith(b"\n") else block + b"\n"
+    lines = data.count(b"\n")
+
+    # With "\n" turned into its own field, every line of exactly 7 fields
+    # puts a "\n" at each 8th position; any other shape breaks the stride.
+    fields = data.replace(b"\n", b",\n,").split(b",")
+    if len(fields) != 8 * lines + 1 or fields[7::8].count(b"\n") != lines:
+        return False
+    del fields[-1]
+
+    # Same edge-whitespace guard as parse_geiger_bytes, once per distinct
+    # label and mode field rather than once per line
+    for label in set(fields[0::8]):
+        if not label.lstrip()[:1].isalpha():
+            return False
+    mode_fields = fields[6::8]
+    distinct_modes = {field: field.strip() for field in set(mode_fields)}
+    if not all(mode.isalpha() for mode in distinct_modes.values()):
+        return False
+
+    try:
+        cps = array("q", map(int, fields[1::8]))
+        cpm = array("q", map(int, fields[3::8]))
+        usv = array("d", map(float, fields[5::8]))
+    except (ValueError, OverflowError):
+        return False
+
+    codes = {field: modes.code(mode) for field, mode in distinct_modes.items()}
+    lengths = list(map(len, data.split(b"\n", lines)[:lines]))
+    starts = array("Q", accumulate(map((1).__add__, lengths[:-1]), initial=base_offset))
+
+    cols.cps.extend(cps)
+    cols.cpm.extend(cpm)
+    cols.usv.extend(usv)
+    cols.mode.extend(array("H", map(codes.__getitem__, mode_fields)))
+    cols.valid.extend(b"\x01" * lines)
+    cols.starts.extend(starts)
+    cols.ends.extend(array("Q", map(operator.add, starts, lengths)))
+    return True
+
+
+def _parse_block_lines(
+    block: bytes, base_offset: int, modes: _ModeTable, cols: ParsedColumns
+) -> None:
+    """
+    Parse a block line by line, with exactly parse_geiger_bytes' semantics.
+    """
+    # Local bindings keep the per-line loop free of attribute lookups
+    cps_append = cols.cps.append
+    cpm_append = cols.cpm.append
+    usv_append = cols.usv.append
+    mode_append = cols.mode.append
+    valid_append = cols.valid.append
+    starts_append = cols.starts.append
+    ends_append = cols.ends.append
+    invalid_append = cols.invalid_offsets.append
+    mode_code = modes.code
+    mode_codes = modes.codes
+
+    pos = base_offset
+    for line in block.split(b"\n"):
+        start = pos
+        pos += len(line) + 1
+
+        # Inline copy of parse_geiger_bytes' ASCII fast path, minus the dict
+        parts = line.split(b",")
+        cps = cpm = 0
+        usv = 0.0
+        code = INVALID_MODE
+        if len(parts) == 7 and line.isascii():
+            try:
+                cps = int(parts[1])
+                cpm = int(parts[3])
+                usv = float(parts[5])
+                mode = parts[6].strip()
+                if mode.isalpha() and line.lstrip()[:1].isalpha():
+                    known = mode_codes.get(mode)
+                    code = mode_code(mode) if known is None else known
+            except ValueError:
+                pass
+
+        if code == INVALID_MODE and (len(parts) == 7 or not line.isascii()):
+            # Anything the inline path could not decide exactly
+            parsed = parse_geiger_bytes(line)
+            if parsed is not None:
+                cps, cpm, usv = parsed["cps"], parsed["cpm"], parsed["usv"]
+                code = mode_code(parsed["mode"].encode("utf-8"))
+
+        if code != INVALID_MODE and not (
+            _INT64_MIN <= cps <= _INT64_MAX and _INT64_MIN <= cpm <= _INT64_MAX
+        ):
+            code = INVALID_MODE
+
+        if code == INVALID_MODE:
+            if not line.strip():
+                continue
+            cps = cpm = 0
+            usv = 0.0
+            invalid_append(start)
+            valid_append(0)
+        else:
+            valid_append(1)
+
+        cps_append(cps)
+        cpm_append(cpm)
+        usv_append(usv)
+        mode_append(code)
+        starts_append(start)
+        ends_append(start + len(line))
+
+
+def parse_geiger_csv_many(
+    data: Buffer,
+    base_offset: int = 0,
+    _modes: Optional[_ModeTable] = None,
+) -> ParsedColumns:
+    """
+    Parse every line of data ("\\n"-terminated; the last line may be
+    unterminated) into columns. base_offset is added to reported offsets.
+
+    data is processed in blocks of about BLOCK_SIZE bytes. A block of
+    well-formed readings is parsed columnar; a block containing anything
+    else (a corrupt line, a blank line, non-ASCII bytes) falls back to the
+    per-line path, so one bad line only slows down its own block.
+    """
+    data = bytes(data)
+    modes = _modes or _ModeTable()
+    cols = ParsedColumns(mode_names=modes.names, data=data, base_offset=base_offset)
+
+    for start, end in _spans(data, len(data), BLOCK_SIZE):
+        block = data[start:end]
+        if not _parse_block_columnar(block, base_offset + start, modes, cols):
+            _parse_block_lines(block, base_offset + start, modes, cols)
+    return cols
+
+
+def iter_geiger_file(
+    path: str, chunk_size: int = DEFAULT_CHUNK_SIZE, start: int = 0
+) -> Iterator[ParsedColumns]:
+    """
+    Memory-map a capture file and yield ParsedColumns per chunk of about
+    chunk_size bytes, so memory stays bounded for multi-GB files. Offsets
+    are absolute within the file and mode codes are shared by all chunks.
+
+    start skips to a byte offset, which must be the start of a line (for
+    example the end of a previously yielded chunk, to resume).
+    """
+    if chunk_size < 1:
+        raise ValueError("iter_geiger_file requires chunk_size >= 1")
+
+    modes = _ModeTable()
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size <= start:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for begin, end in _spans(mm, size, chunk_size, start):
+                yield parse_geiger_csv_many(mm[begin:end], begin, modes)
+
+
+def parse_geiger_file(path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> ParsedColumns:
+    """
+    Parse a whole capture file into one set of columns (raw() is not
+    available on the result; use iter_geiger_file() for that).
+    """
+    total = ParsedColumns()
+    for cols in iter_geiger_file(path, chunk_size):
+        total.cps.extend(cols.cps)
+        total.cpm.extend(cols.cpm)
+        total.usv.extend(cols.usv)
+        total.mode.extend(cols.mode)
+        total.valid.extend(cols.valid)
+        total.starts.extend(cols.starts)
+        total.ends.extend(cols.ends)
+        total.invalid_offsets.extend(cols.invalid_offsets)
+        total.mode_names = cols.mode_names
+    return total
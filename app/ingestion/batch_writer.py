@@ -0,0 +1,274 @@
+# filename: app/ingestion/batch_writer.py
+
+from __future__ import annotations
+
+import logging
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, replace
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from app.metrics import COMMIT_SECONDS, INSERT_SECONDS
+from app.models import GeigerRecord
+
+log = logging.getLogger(__name__)
+
+
+@dataclass
+class CommitStats:
+    """
+    Running statistics for BatchWriter commits.
+
+    Batch sizes count statements (inserts + pushed-flag updates) per commit.
+    """
+
+    commits: int = 0
+    statements: int = 0
+    last_batch_size: int = 0
+    max_batch_size: int = 0
+    last_commit_seconds: float = 0.0
+    max_commit_seconds: float = 0.0
+    total_commit_seconds: float = 0.0
+
+    @property
+    def avg_batch_size(self) -> float:
+        return self.statements / self.commits if self.commits else 0.0
+
+    @property
+    def avg_commit_seconds(self) -> float:
+        return self.total_commit_seconds / self.commits if self.commits else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "commits": self.commits,
+            "statements": self.statements,
+            "last_batch_size": self.last_batch_size,
+            "max_batch_size": self.max_batch_size,
+            "avg_batch_size": self.avg_batch_size,
+            "last_commit_seconds": self.last_commit_seconds,
+            "max_commit_seconds": self.max_commit_seconds,
+            "avg_commit_seconds": self.avg_commit_seconds,
+        }
+
+
+class BatchWriter:
+    """
+    Group-commit writer for the canonical geiger_readings table.
+
+    Inserts and pushed-flag updates are executed immediately inside one open
+    transaction (so row IDs are available to the caller right away), and the
+    transaction is committed when either:
+      - max_batch_size statements are pending, or
+      - the oldest pending statement is max_latency_seconds old.
+
+    A background thread enforces the latency bound when no new writes arrive.
+    close() commits whatever is pending; data written less than
+    max_latency_seconds before a crash may be lost.
+
+    on_commit, when set, is called after every commit that included inserts,
+    with the newest reading it made durable. It runs under the writer lock,
+    so calls never overlap (e.g. a single-writer snapshot can be published
+    from it).
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        max_batch_size: int = 100,
+        max_latency_seconds: float = 1.0,
+        on_commit: Optional[Callable[[GeigerRecord], None]] = None,
+    ) -> None:
+        if max_batch_size < 1:
+            raise ValueError("BatchWriter requires max_batch_size >= 1")
+        if max_latency_seconds <= 0:
+            raise ValueError("BatchWriter requires max_latency_seconds > 0")
+
+        self.db_path = db_path
+        self.max_batch_size = max_batch_size
+        self.max_latency_seconds = max_latency_seconds
+        self._on_commit = on_commit
+
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL;")
+        self._conn.execute("PRAGMA synchronous=NORMAL;")
+
+        self._lock = threading.RLock()
+        self._pending = 0
+        self._oldest_pending: Optional[float] = None
+        self._stats = CommitStats()
+        self._closed = False
+        # (row ID, parsed, device_id, timestamp) of the newest pending insert
+        self._last_insert: Optional[Tuple[int, Dict[str, Any], str, datetime]] = None
+
+        self._stop = threading.Event()
+        self._timer = threading.Thread(
+            target=self._flush_loop,
+            name="batch-writer-flush",
+            daemon=True,
+        )
+        self._timer.start()
+
+    # ------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------
+
+    def insert(self, parsed: Dict[str, Any], device_id: str) -> int:
+        """
+        Insert a parsed geiger record and return its row ID.
+        The row becomes durable on the next commit.
+        """
+        timestamp = parsed.get("timestamp") or datetime.now(timezone.utc)
+
+        with self._lock:
+            self._ensure_open()
+            started = time.perf_counter()
+            cur = self._conn.execute(
+                """
+                INSERT INTO geiger_readings (
+                    raw,
+                    counts_per_second,
+                    counts_per_minute,
+                    microsieverts_per_hour,
+                    mode,
+                    device_id,
+                    timestamp,
+                    pushed
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?, 0)
+                """,
+                (
+                    parsed["raw"],
+                    parsed["cps"],
+                    parsed["cpm"],
+                    parsed["usv"],
+                    parsed["mode"],
+                    device_id,
+                    timestamp.isoformat(),
+                ),
+            )
+            INSERT_SECONDS.observe(time.perf_counter() - started)
+            rowid = cur.lastrowid
+            assert rowid is not None
+            self._last_insert = (rowid, parsed, device_id, timestamp)
+            self._note_pending(1)
+            return rowid
+
+    def mark_records_pushed(self, ids: Iterable[int]) -> None:
+        """
+        Set pushed = 1 for the given row IDs as part of the current batch.
+        """
+        params = [(i,) for i in ids]
+        if not params:
+            return
+
+        with self._lock:
+            self._ensure_open()
+            self._conn.executemany(
+                "UPDATE geiger_readings SET pushed = 1 WHERE id = ?",
+                params,
+            )
+            self._note_pending(len(params))
+
+    # ------------------------------------------------------------
+    # Commit control
+    # ------------------------------------------------------------
+
+    def flush(self) -> None:
+        """
+        Commit all pending statements now.
+        """
+        with self._lock:
+            if self._pending == 0 or self._closed:
+                return
+
+            batch_size = self._pending
+            started = time.monotonic()
+            self._conn.commit()
+            elapsed = time.monotonic() - started
+            COMMIT_SECONDS.observe(elapsed)
+
+            self._pending = 0
+            self._oldest_pending = None
+
+            stats = self._stats
+            stats.commits += 1
+            stats.statements += batch_size
+            stats.last_batch_size = batch_size
+            stats.max_batch_size = max(stats.max_batch_size, batch_size)
+            stats.last_commit_seconds = elapsed
+            stats.max_commit_seconds = max(stats.max_commit_seconds, elapsed)
+            stats.total_commit_seconds += elapsed
+
+            last, self._last_insert = self._last_insert, None
+            if last is not None and self._on_commit is not None:
+                rowid, parsed, device_id, timestamp = last
+                record = GeigerRecord.from_parsed(parsed, device_id, timestamp)
+                record.id = rowid
+                try:
+                    self._on_commit(record)
+                except Exception as exc:
+                    log.error(
+                        "batch_writer_on_commit_failed", extra={"error": repr(exc)}
+                    )
+
+    def flush_if_due(self) -> None:
+        with self._lock:
+            if self._oldest_pending is None:
+                return
+            if time.monotonic() - self._oldest_pending >= self.max_latency_seconds:
+                self.flush()
+
+    @property
+    def pending(self) -> int:
+        with self._lock:
+            return self._pending
+
+    @property
+    def stats(self) -> CommitStats:
+        """
+        Return a snapshot copy of the commit statistics.
+        """
+        with self._lock:
+            return replace(self._stats)
+
+    def close(self) -> None:
+        """
+        Commit pending statements, stop the flush thread and close SQLite.
+        Safe to call more than once.
+        """
+        self._stop.set()
+        if self._timer.is_alive() and threading.current_thread() is not self._timer:
+            self._timer.join(timeout=self.max_latency_seconds + 1.0)
+
+        with self._lock:
+            if self._closed:
+                return
+            self.flush()
+            self._closed = True
+            self._conn.close()
+
+    # ------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------
+
+    def _ensure_open(self) -> None:
+        if self._closed:
+            raise RuntimeError("BatchWriter is closed")
+
+    def _note_pending(self, count: int) -> None:
+        if self._oldest_pending is None:
+            self._oldest_pending = time.monotonic()
+        self._pending += count
+        if self._pending >= self.max_batch_size:
+            self.flush()
+
+    def _flush_loop(self) -> None:
+        tick = max(self.max_latency_seconds / 4.0, 0.01)
+        while not self._stop.wait(tick):
+            try:
+                self.flush_if_due()
+            except Exception as exc:
+                # Never crash the flush thread; the next write retries commit
+                log.error("batch_writer_flush_failed", extra={"error": repr(exc)})
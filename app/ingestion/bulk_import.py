@@ -0,0 +1,608 @@
+# filename: app/ingestion/bulk_import.py
+
+"""
+Bulk import of historical readings into geiger_readings.
+
+Sources are raw MightyOhm captures (one line per reading and no
+timestamps, so they are synthesized from --start and --interval) or CSV
+files written by GET /readings/export?format=csv.
+
+The importer writes one large executemany() transaction per chunk on a
+connection with relaxed durability pragmas. The secondary indexes and
+insert triggers are dropped for the duration of the import. Afterwards
+the indexes are rebuilt once, the rollups are recomputed and the
+counters row is reseeded. Progress is committed together with each chunk
+in bulk_import_progress, so an interrupted import resumes where it
+stopped when rerun. The ID range of every chunk is recorded in
+bulk_import_chunks, so --restart can remove a source's rows before
+importing it again.
+
+Several raw captures in one run are treated as consecutive: each file
+continues the timestamps where the previous one ended.
+
+Usage:
+    python -m app.ingestion.bulk_import --db /var/lib/pi-log/readings.db \\
+        --device-id pi-01 --start 2025-01-01T00:00:00+00:00 capture.log
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import logging
+import os
+import sqlite3
+import sys
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from itertools import compress
+from typing import Any, Iterator, List, Optional, Sequence, Tuple
+
+from app.ingestion.batch_parser import DEFAULT_CHUNK_SIZE, iter_geiger_file
+from app.rollups import rebuild_rollups
+from app.sqlite_store import ROLLUP_BUCKET_FORMATS, initialize_db, rollup_table
+
+log = logging.getLogger(__name__)
+
+
+PROGRESS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS bulk_import_progress (
+    source TEXT PRIMARY KEY,
+    byte_offset INTEGER NOT NULL,
+    lines INTEGER NOT NULL,
+    imported INTEGER NOT NULL,
+    invalid INTEGER NOT NULL,
+    -- Timestamp synthesis of raw captures; NULL for CSV exports
+    start TEXT,
+    interval REAL,
+    completed_at TEXT
+);
+
+CREATE TABLE IF NOT EXISTS bulk_import_chunks (
+    source TEXT NOT NULL,
+    first_id INTEGER NOT NULL,
+    last_id INTEGER NOT NULL
+);
+"""
+
+# Rebuilt once after the import instead of maintained per row
+DEFERRED_INDEXES = (
+    "idx_geiger_readings_unpushed",
+    "idx_geiger_readings_timestamp",
+)
+DEFERRED_TRIGGERS = tuple(
+    f"trg_{rollup_table(resolution)}_insert" for resolution in ROLLUP_BUCKET_FORMATS
+) + ("trg_geiger_counters_insert",)
+
+# Durability is traded for speed: a crash loses at most the open chunk,
+# whose progress row is rolled back with it.
+IMPORT_PRAGMAS = (
+    "PRAGMA synchronous=OFF",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",
+)
+
+# Columns an export must contain (device_id and raw are optional)
+REQUIRED_CSV_COLUMNS = (
+    "timestamp",
+    "counts_per_second",
+    "counts_per_minute",
+    "microsieverts_per_hour",
+    "mode",
+)
+
+MAX_REPORTED_INVALID = 100
+
+INSERT_SQL = """
+INSERT INTO geiger_readings (
+    raw,
+    counts_per_second,
+    counts_per_minute,
+    microsieverts_per_hour,
+    mode,
+    device_id,
+    timestamp,
+    pushed
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+Row = Tuple[str, int, int, float, str, str, str, int]
+
+
+@dataclass
+class ImportResult:
+    source: str
+    format: str
+    imported: int = 0
+    invalid: int = 0
+    # Byte offsets of the first MAX_REPORTED_INVALID invalid lines
+    invalid_offsets: List[int] = field(default_factory=list)
+    # Non-blank lines in the whole source, including earlier runs
+    lines: int = 0
+    resumed_from: int = 0
+    skipped: bool = False
+
+
+@dataclass
+class _Chunk:
+    rows: List[Row]
+    invalid_offsets: Sequence[int]
+    lines: int
+    end_offset: int
+
+
+# ------------------------------------------------------------
+# Sources
+# ------------------------------------------------------------
+
+
+def detect_format(path: str) -> str:
+    """
+    "csv" for files starting with an export header, otherwise "raw".
+    """
+    with open(path, "rb") as f:
+        first = f.readline()
+    return "csv" if first.startswith(b"id,") else "raw"
+
+
+def _utc_iso(value: datetime) -> str:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).isoformat()
+
+
+def _raw_chunks(
+    path: str,
+    offset: int,
+    lines: int,
+    chunk_bytes: int,
+    device_id: str,
+    pushed: int,
+    start: datetime,
+    interval: float,
+) -> Iterator[_Chunk]:
+    """
+    Every non-blank line counts as one interval, valid or not, so
+    timestamps stay aligned with the device's output across bad lines.
+    """
+    for cols in iter_geiger_file(path, chunk_bytes, offset):
+        names = cols.mode_names
+        rows: List[Row] = []
+        for i in compress(range(len(cols)), cols.valid):
+            timestamp = start + timedelta(seconds=(lines + i) * interval)
+            rows.append(
+                (
+                    cols.raw(i),
+                    cols.cps[i],
+                    cols.cpm[i],
+                    cols.usv[i],
+                    names[cols.mode[i]],
+                    device_id,
+                    timestamp.isoformat(),
+                    pushed,
+                )
+            )
+        lines += len(cols)
+        yield _Chunk(
+            rows=rows,
+            invalid_offsets=cols.invalid_offsets,
+            lines=len(cols),
+            end_offset=cols.base_offset + len(cols.data),
+        )
+
+
+def _csv_row(
+    line: bytes, columns: List[str], device_id: str, pushed: int
+) -> Optional[Row]:
+    try:
+        fields = next(csv.reader([line.decode("utf-8")]))
+        if len(fields) != len(columns):
+            return None
+        values = dict(zip(columns, fields))
+        mode = values["mode"].strip()
+        if not mode:
+            return None
+        return (
+            values.get("raw", ""),
+            int(values["counts_per_second"]),
+            int(values["counts_per_minute"]),
+            float(values["microsieverts_per_hour"]),
+            mode,
+            values.get("device_id") or device_id,
+            _utc_iso(datetime.fromisoformat(values["timestamp"])),
+            pushed,
+        )
+    except (UnicodeDecodeError, csv.Error, StopIteration, ValueError):
+        return None
+
+
+def _csv_chunks(
+    path: str,
+    offset: int,
+    chunk_bytes: int,
+    device_id: str,
+    pushed: int,
+) -> Iterator[_Chunk]:
+    with open(path, "rb") as f:
+        header = f.readline()
+        columns = next(csv.reader([header.decode("utf-8")]))
+        missing = [c for c in REQUIRED_CSV_COLUMNS if c not in columns]
+        if missing:
+            raise ValueError(f"CSV export is missing columns: {', '.join(missing)}")
+
+        pos = max(offset, f.tell())
+        f.seek(pos)
+        while True:
+            batch = f.readlines(chunk_bytes)
+            if not batch:
+                return
+
+            rows: List[Row] = []
+            invalid: List[int] = []
+            lines = 0
+            for line in batch:
+                start = pos
+                pos += len(line)
+                if not line.strip():
+                    continue
+                lines += 1
+                row = _csv_row(line, columns, device_id, pushed)
+                if row is None:
+                    invalid.append(start)
+                else:
+                    rows.append(row)
+
+            yield _Chunk(
+                rows=rows, invalid_offsets=invalid, lines=lines, end_offset=pos
+            )
+
+
+# ------------------------------------------------------------
+# Schema helpers
+# ------------------------------------------------------------
+
+
+def _defer_indexes(conn: sqlite3.Connection) -> None:
+    with conn:
+        for index in DEFERRED_INDEXES:
+            conn.execute(f"DROP INDEX IF EXISTS {index}")
+        for trigger in DEFERRED_TRIGGERS:
+            conn.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+
+
+def restore_derived_data(db_path: str) -> None:
+    """
+    Recreate the deferred indexes and triggers, reseed the counters row
+    and rebuild the rollups from geiger_readings.
+    """
+    conn = sqlite3.connect(db_path)
+    try:
+        with conn:
+            # initialize_db() seeds the row from a full scan when it is missing
+            conn.execute("DELETE FROM geiger_counters")
+    finally:
+        conn.close()
+
+    initialize_db(db_path)
+    rebuild_rollups(db_path)
+
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    finally:
+        conn.close()
+
+
+def _load_progress(conn: sqlite3.Connection, source: str) -> Tuple[Any, ...]:
+    row = conn.execute(
+        """
+        SELECT byte_offset, lines, imported, invalid, start, interval,
+               completed_at
+        FROM bulk_import_progress
+        WHERE source = ?
+        """,
+        (source,),
+    ).fetchone()
+    return tuple(row) if row else (0, 0, 0, 0, None, None, None)
+
+
+def _delete_imported(conn: sqlite3.Connection, source: str) -> int:
+    """
+    Delete the rows earlier imports of source wrote, and its progress.
+    """
+    ranges = conn.execute(
+        "SELECT first_id, last_id FROM bulk_import_chunks WHERE source = ?",
+        (source,),
+    ).fetchall()
+    with conn:
+        deleted = 0
+        for first_id, last_id in ranges:
+            deleted += conn.execute(
+                "DELETE FROM geiger_readings WHERE id BETWEEN ? AND ?",
+                (first_id, last_id),
+            ).rowcount
+        conn.execute("DELETE FROM bulk_import_chunks WHERE source = ?", (source,))
+        conn.execute("DELETE FROM bulk_import_progress WHERE source = ?", (source,))
+    return deleted
+
+
+# ------------------------------------------------------------
+# Import
+# ------------------------------------------------------------
+
+
+def import_file(
+    db_path: str,
+    path: str,
+    device_id: str,
+    fmt: str = "auto",
+    start: Optional[datetime] = None,
+    interval: float = 1.0,
+    pushed: bool = True,
+    chunk_bytes: int = DEFAULT_CHUNK_SIZE,
+    restart: bool = False,
+) -> ImportResult:
+    """
+    Import one raw capture or CSV export into geiger_readings.
+
+    Raw captures require start (the time of the first line); line n is
+    stamped start + n * interval. A partial import only resumes with the
+    start and interval it was begun with; anything else raises ValueError.
+    Imported rows are marked pushed unless pushed=False, in which case the
+    replay engine uploads them. A source that was imported completely
+    before is skipped unless restart=True, which first deletes the rows
+    the earlier imports of it wrote.
+    """
+    if fmt == "auto":
+        fmt = detect_format(path)
+    if fmt not in ("raw", "csv"):
+        raise ValueError(f"Unknown import format: {fmt}")
+    if fmt == "raw" and start is None:
+        raise ValueError("Raw captures require a start time")
+    if interval <= 0:
+        raise ValueError("interval must be > 0")
+    if start is not None:
+        start = datetime.fromisoformat(_utc_iso(start))
+    # Only raw captures synthesize timestamps
+    synth_start = start.isoformat() if fmt == "raw" and start is not None else None
+    synth_interval = interval if synth_start is not None else None
+
+    source = os.path.realpath(path)
+    result = ImportResult(source=source, format=fmt)
+
+    initialize_db(db_path)
+    conn = sqlite3.connect(db_path)
+    deferred = False
+    try:
+        for pragma in IMPORT_PRAGMAS:
+            conn.execute(pragma)
+        conn.executescript(PROGRESS_SCHEMA)
+
+        if restart:
+            deleted = _delete_imported(conn, source)
+            log.info(
+                "bulk_import_restarted", extra={"source": source, "deleted": deleted}
+            )
+        (
+            offset,
+            lines,
+            imported,
+            invalid,
+            saved_start,
+            saved_interval,
+            completed_at,
+        ) = _load_progress(conn, source)
+        result.lines = lines
+        if completed_at is not None:
+            log.info("bulk_import_skipped", extra={"source": source})
+            result.skipped = True
+            return result
+        if offset and (saved_start, saved_interval) != (synth_start, synth_interval):
+            raise ValueError(
+                f"{source} was partially imported with start={saved_start} "
+                f"interval={saved_interval}; resume with the same values "
+                "or restart"
+            )
+        result.resumed_from = offset
+
+        _defer_indexes(conn)
+        deferred = True
+
+        flag = 1 if pushed else 0
+        chunks = (
+            _raw_chunks(
+                path, offset, lines, chunk_bytes, device_id, flag, start, interval
+            )
+            if fmt == "raw" and start is not None
+            else _csv_chunks(path, offset, chunk_bytes, device_id, flag)
+        )
+
+        for chunk in chunks:
+            offset = chunk.end_offset
+            lines += chunk.lines
+            imported += len(chunk.rows)
+            invalid += len(chunk.invalid_offsets)
+            with conn:
+                conn.executemany(INSERT_SQL, chunk.rows)
+                if chunk.rows:
+                    # One write transaction on an AUTOINCREMENT table: the
+                    # chunk's IDs are contiguous
+                    (last_id,) = conn.execute("SELECT last_insert_rowid()").fetchone()
+                    conn.execute(
+                        """
+                        INSERT INTO bulk_import_chunks (source, first_id, last_id)
+                        VALUES (?, ?, ?)
+                        """,
+                        (source, last_id - len(chunk.rows) + 1, last_id),
+                    )
+                conn.execute(
+                    """
+                    INSERT INTO bulk_import_progress (
+                        source, byte_offset, lines, imported, invalid,
+                        start, interval
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (source) DO UPDATE SET
+                        byte_offset = excluded.byte_offset,
+                        lines = excluded.lines,
+                        imported = excluded.imported,
+                        invalid = excluded.invalid
+                    """,
+                    (
+                        source,
+                        offset,
+                        lines,
+                        imported,
+                        invalid,
+                        synth_start,
+                        synth_interval,
+                    ),
+                )
+
+            room = MAX_REPORTED_INVALID - len(result.invalid_offsets)
+            result.invalid_offsets.extend(chunk.invalid_offsets[:room])
+            log.info(
+                "bulk_import_chunk",
+                extra={"source": source, "offset": offset, "rows": imported},
+            )
+
+        with conn:
+            conn.execute(
+                """
+                INSERT INTO bulk_import_progress (
+                    source, byte_offset, lines, imported, invalid,
+                    start, interval, completed_at
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (source) DO UPDATE SET
+                    completed_at = excluded.completed_at
+                """,
+                (
+                    source,
+                    offset,
+                    lines,
+                    imported,
+                    invalid,
+                    synth_start,
+                    synth_interval,
+                    datetime.now(timezone.utc).isoformat(),
+                ),
+            )
+        result.lines = lines
+        result.imported = imported
+        result.invalid = invalid
+    finally:
+        conn.close()
+        # Also after an interruption, so the database is never left
+        # without its indexes, rollups or counters
+        if deferred:
+            restore_derived_data(db_path)
+
+    return result
+
+
+# ------------------------------------------------------------
+# CLI
+# ------------------------------------------------------------
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="bulk_import",
+        description="Import raw MightyOhm captures or CSV exports into SQLite.",
+    )
+    parser.add_argument("files", nargs="+", type=str)
+    parser.add_argument("--db", required=True, type=str)
+    parser.add_argument(
+        "--device-id",
+        required=True,
+        type=str,
+        help="Device ID for raw captures and CSV rows without one.",
+    )
+    parser.add_argument(
+        "--format", dest="fmt", default="auto", choices=["auto", "raw", "csv"]
+    )
+    parser.add_argument(
+        "--start",
+        required=False,
+        default=None,
+        type=datetime.fromisoformat,
+        help=(
+            "ISO-8601 time of the first line of a raw capture (naive = UTC). "
+            "Further raw captures continue where the previous one ended."
+        ),
+    )
+    parser.add_argument(
+        "--interval",
+        required=False,
+        default=1.0,
+        type=float,
+        help="Seconds between consecutive lines of a raw capture.",
+    )
+    parser.add_argument(
+        "--push",
+        action="store_true",
+        help="Leave imported rows unpushed so the replay engine uploads them.",
+    )
+    parser.add_argument(
+        "--chunk-bytes",
+        required=False,
+        default=DEFAULT_CHUNK_SIZE,
+        type=int,
+        help="Bytes of input per transaction.",
+    )
+    parser.add_argument(
+        "--restart",
+        action="store_true",
+        help="Delete previously imported rows of each file and import it again.",
+    )
+    return parser
+
+
+def main() -> int:
+    parser = build_parser()
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(message)s",
+    )
+
+    for path in args.files:
+        fmt = detect_format(path) if args.fmt == "auto" else args.fmt
+        if fmt == "raw" and args.start is None:
+            parser.error(f"{path}: raw captures require --start")
+
+    start = args.start
+    for path in args.files:
+        try:
+            result = import_file(
+                args.db,
+                path,
+                args.device_id,
+                fmt=args.fmt,
+                start=start,
+                interval=args.interval,
+                pushed=not args.push,
+                chunk_bytes=args.chunk_bytes,
+                restart=args.restart,
+            )
+        except ValueError as exc:
+            logging.error(f"{path}: {exc}")
+            return 1
+        if result.format == "raw" and start is not None:
+            # The next capture picks up where this one ended
+            start += timedelta(seconds=result.lines * args.interval)
+        if result.skipped:
+            logging.info(f"{path}: already imported (use --restart to re-import)")
+            continue
+        for offset in result.invalid_offsets:
+            logging.warning(f"{path}: invalid line at byte offset {offset}")
+        logging.info(
+            f"{path}: imported {result.imported} rows ({result.format}), "
+            f"{result.invalid} invalid lines, resumed from byte {result.resumed_from}"
+        )
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
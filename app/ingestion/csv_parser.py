@@ -54,3 +54,49 @@ def parse_geiger_csv(line: Any) -> Optional[Dict[str, Any]]:
         "usv": usv,
         "mode": mode,
     }
+
+
+def parse_geiger_bytes(line: Any) -> Optional[Dict[str, Any]]:
+    """
+    Parse a raw line as returned by serial.readline(), undecoded.
+
+    Same accept/reject semantics and output as
+    parse_geiger_csv(line.decode("utf-8", errors="ignore")), i.e. what
+    SerialReader.read_line() followed by parse_geiger_csv() produces.
+    ASCII lines are split and converted as bytes (int() and float() accept
+    bytes and ignore surrounding whitespace), with one decode for raw and
+    mode; anything else takes the general path. Input that is not
+    bytes/bytearray returns None.
+    """
+    if not isinstance(line, (bytes, bytearray)):
+        return None
+    if not line.isascii():
+        return parse_geiger_csv(line.decode("utf-8", errors="ignore"))
+
+    parts = line.split(b",")
+    if len(parts) != 7:
+        return None
+
+    try:
+        cps = int(parts[1])
+        cpm = int(parts[3])
+        usv = float(parts[5])
+    except ValueError:
+        # May still be valid once str.strip() has removed \x1c-\x1f
+        return parse_geiger_csv(line.decode("ascii"))
+
+    raw = line.strip()
+    mode = parts[6].strip()
+    # str.strip() also strips \x1c-\x1f, bytes.strip() does not. MightyOhm
+    # lines start with a letter and end in an alphabetic mode, so only
+    # unusual lines pay for the exact general path.
+    if not (mode.isalpha() and raw[:1].isalpha()):
+        return parse_geiger_csv(line.decode("ascii"))
+
+    return {
+        "raw": raw.decode("ascii"),
+        "cps": cps,
+        "cpm": cpm,
+        "usv": usv,
+        "mode": mode.decode("ascii"),
+    }
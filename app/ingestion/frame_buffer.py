@@ -0,0 +1,88 @@
+# filename: app/ingestion/frame_buffer.py
+
+from __future__ import annotations
+
+import logging
+from typing import List
+
+log = logging.getLogger(__name__)
+
+
+class FrameBuffer:
+    """
+    Reusable receive buffer that splits a serial byte stream into
+    newline-terminated frames.
+
+    Reads land in one preallocated bytearray through a memoryview
+    (writable() / commit()), so the receive buffer is reused across reads
+    and frames are split in place instead of re-concatenating the stream.
+    (pyserial's readinto() still goes through read() internally, so a read
+    may allocate a temporary bytes object.) frames() returns every complete frame received so far, without the
+    trailing b"\\n", and keeps a trailing partial frame for the next read.
+    The partial frame is moved to the front of the buffer only when the
+    tail runs out of room.
+
+    A partial frame that fills the whole buffer cannot be a valid reading.
+    It is returned as a frame of its own (and fails to parse), so a noisy
+    line never stalls the reader.
+    """
+
+    def __init__(self, capacity: int = 64 * 1024) -> None:
+        if capacity < 1:
+            raise ValueError("FrameBuffer requires capacity >= 1")
+
+        self.capacity = capacity
+        self._buf = bytearray(capacity)
+        self._view = memoryview(self._buf)
+        self._start = 0
+        self._end = 0
+        self.overflows = 0
+
+    @property
+    def pending(self) -> int:
+        """
+        Bytes received but not yet returned as part of a frame.
+        """
+        return self._end - self._start
+
+    def clear(self) -> None:
+        """
+        Drop any partial frame (e.g. after the port was reopened).
+        """
+        self._start = self._end = 0
+
+    def writable(self, size: int) -> memoryview:
+        """
+        View of up to size free bytes to read into; pass the number of
+        bytes actually written to commit().
+        """
+        if self._end + size > self.capacity and self._start:
+            pending = self.pending
+            self._buf[:pending] = bytes(self._view[self._start : self._end])
+            self._start, self._end = 0, pending
+        return self._view[self._end : min(self._end + size, self.capacity)]
+
+    def commit(self, size: int) -> None:
+        if size < 0 or self._end + size > self.capacity:
+            raise ValueError("FrameBuffer.commit() size out of range")
+        self._end += size
+
+    def frames(self) -> List[bytes]:
+        """
+        Remove and return every complete frame, oldest first.
+        """
+        last = self._buf.rfind(b"\n", self._start, self._end)
+        if last == -1:
+            if self.pending < self.capacity:
+                return []
+            self.overflows += 1
+            log.warning("frame_buffer_overflow", extra={"capacity": self.capacity})
+            frame = bytes(self._view[self._start : self._end])
+            self.clear()
+            return [frame]
+
+        frames = bytes(self._view[self._start : last]).split(b"\n")
+        self._start = last + 1
+        if self._start == self._end:
+            self.clear()
+        return frames
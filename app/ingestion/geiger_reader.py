@@ -1,13 +1,23 @@
 # filename: app/ingestion/geiger_reader.py
 
 import argparse
+import asyncio
 import logging
+import signal
 import sys
+from types import FrameType
+from typing import Optional, Union
 
 from app.ingestion.api_client import PushClient
+from app.ingestion.async_pipeline import AsyncIngestionPipeline
+from app.ingestion.multi_reader import MultiDeviceReader, parse_device_specs
 from app.ingestion.serial_reader import SerialReader
+from app.ingestion.stage_queue import OVERFLOW_POLICIES
+from app.ingestion.staged_pipeline import StagedPipeline
 from app.ingestion.watchdog import WatchdogSerialReader
 from app.health import start_health_server
+from app.snapshot import DEFAULT_SNAPSHOT_PATH
+from app.sqlite_store import initialize_db
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -16,19 +26,151 @@ def build_parser() -> argparse.ArgumentParser:
         description="Ingestion loop for MightyOhm Geiger counter readings.",
     )
 
-    parser.add_argument("--device", required=True, type=str)
+    parser.add_argument(
+        "--device",
+        required=True,
+        action="append",
+        type=str,
+        help="Serial device as PATH or ID=PATH; repeat to read several boards.",
+    )
     parser.add_argument("--baudrate", required=True, type=int)
     parser.add_argument("--device-type", required=True, choices=["mightyohm"])
     parser.add_argument("--db", required=True, type=str)
     parser.add_argument("--api-url", required=True, type=str)
     parser.add_argument("--api-token", required=False, default="", type=str)
-    parser.add_argument("--device-id", required=True, type=str)
+    parser.add_argument(
+        "--device-id",
+        required=True,
+        type=str,
+        help="Device ID for a single --device without ID= (prefix for several).",
+    )
+    parser.add_argument(
+        "--buffered-reads",
+        action="store_true",
+        help="Read all waiting serial bytes per wakeup instead of one readline() "
+        "(several devices and --asyncio always do).",
+    )
+    parser.add_argument(
+        "--reconnect-max-backoff",
+        required=False,
+        default=60.0,
+        type=float,
+        help="Max seconds between attempts to reopen a lost serial port.",
+    )
+    parser.add_argument(
+        "--asyncio",
+        action="store_true",
+        help="Read, persist and push from one asyncio event loop.",
+    )
+    parser.add_argument(
+        "--staged",
+        action="store_true",
+        help="Run read, parse, persist and push as separate queued stages.",
+    )
+    parser.add_argument(
+        "--stage-queue-size",
+        required=False,
+        default=None,
+        type=int,
+        help="Max items buffered between two --staged stages (default: 1000).",
+    )
+    parser.add_argument(
+        "--overflow-policy",
+        required=False,
+        default="spill",
+        choices=OVERFLOW_POLICIES,
+        help="What a full push queue (and, with --staged, every stage queue) "
+        "does: wait, drop its oldest item, or leave the item in SQLite for "
+        "replay.",
+    )
+    parser.add_argument(
+        "--commit-batch-size",
+        required=False,
+        default=100,
+        type=int,
+        help="Max SQLite statements per group commit.",
+    )
+    parser.add_argument(
+        "--commit-max-latency",
+        required=False,
+        default=1.0,
+        type=float,
+        help="Max seconds a pending write waits before it is committed.",
+    )
+    parser.add_argument(
+        "--push-queue-size",
+        required=False,
+        default=1000,
+        type=int,
+        help="Max records buffered in memory between serial loop and pusher.",
+    )
+    parser.add_argument(
+        "--batch-push",
+        action="store_true",
+        help="Push JSON arrays of readings instead of one reading per request.",
+    )
+    parser.add_argument(
+        "--batch-url",
+        required=False,
+        default=None,
+        type=str,
+        help="Batch ingest endpoint (defaults to --api-url).",
+    )
+    parser.add_argument("--batch-max-records", required=False, default=500, type=int)
+    parser.add_argument(
+        "--batch-max-bytes", required=False, default=256 * 1024, type=int
+    )
+    parser.add_argument(
+        "--replay-interval",
+        required=False,
+        default=60.0,
+        type=float,
+        help="Seconds between backlog replay passes over pushed = 0 rows.",
+    )
+    parser.add_argument(
+        "--replay-rate-limit",
+        required=False,
+        default=50.0,
+        type=float,
+        help="Max backlog records pushed per second.",
+    )
+    parser.add_argument("--replay-page-size", required=False, default=100, type=int)
+    parser.add_argument(
+        "--snapshot-path",
+        required=False,
+        default=DEFAULT_SNAPSHOT_PATH,
+        type=str,
+        help="Shared-memory snapshot file read by the API ('' to disable).",
+    )
 
     return parser
 
 
+def _exit_on_sigterm(signum: int, frame: Optional[FrameType]) -> None:
+    # Turn systemd/docker stop into a normal exit so pending writes are flushed
+    sys.exit(0)
+
+
+async def _run_pipeline(pipeline: AsyncIngestionPipeline) -> None:
+    # SIGTERM stops the loop cleanly so pending writes are flushed
+    asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, pipeline.stop)
+    await pipeline.run()
+
+
 def main() -> int:
-    args = build_parser().parse_args()
+    parser = build_parser()
+    args = parser.parse_args()
+
+    try:
+        devices = parse_device_specs(args.device, args.device_id)
+    except ValueError as exc:
+        parser.error(str(exc))
+    if args.staged and (args.asyncio or len(devices) > 1):
+        parser.error("--staged reads a single --device without --asyncio")
+    if args.stage_queue_size is not None and not args.staged:
+        parser.error("--stage-queue-size only applies with --staged")
+    if args.buffered_reads and (args.asyncio or len(devices) > 1):
+        parser.error("--buffered-reads applies to a single --device without --asyncio")
 
     logging.basicConfig(
         level=logging.INFO,
@@ -37,7 +179,8 @@ def main() -> int:
     start_health_server()
 
     logging.info("Starting ingestion agent")
-    logging.info(f"Device: {args.device}")
+    for spec in devices:
+        logging.info(f"Device: {spec.path} ({spec.device_id})")
     logging.info(f"Baudrate: {args.baudrate}")
     logging.info(f"Device type: {args.device_type}")
     logging.info(f"DB path: {args.db}")
@@ -45,25 +188,96 @@ def main() -> int:
     logging.info(
         "API token: <empty>" if args.api_token == "" else "API token: <provided>"
     )
-    logging.info(f"Device ID: {args.device_id}")
 
-    base_reader = SerialReader(
-        device=args.device,
-        baudrate=args.baudrate,
-    )
+    initialize_db(args.db)
 
-    reader = WatchdogSerialReader(base_reader)
+    if args.asyncio:
+        pipeline = AsyncIngestionPipeline(
+            devices,
+            api_url=args.api_url,
+            api_token=args.api_token,
+            db_path=args.db,
+            baudrate=args.baudrate,
+            commit_batch_size=args.commit_batch_size,
+            commit_max_latency=args.commit_max_latency,
+            push_queue_size=args.push_queue_size,
+            push_overflow=args.overflow_policy,
+            batch_push=args.batch_push,
+            batch_url=args.batch_url,
+            max_batch_records=args.batch_max_records,
+            max_batch_bytes=args.batch_max_bytes,
+            replay_interval=args.replay_interval,
+            replay_rate_limit=args.replay_rate_limit,
+            replay_page_size=args.replay_page_size,
+            snapshot_path=args.snapshot_path,
+            max_backoff_seconds=args.reconnect_max_backoff,
+        )
+        try:
+            asyncio.run(_run_pipeline(pipeline))
+        except KeyboardInterrupt:
+            pass
+        logging.info(f"Commit stats: {pipeline.commit_stats.as_dict()}")
+        return 0
 
+    # One board keeps the blocking reader; several share one selector loop
+    reader: Union[WatchdogSerialReader, MultiDeviceReader]
+    if len(devices) == 1:
+        base_reader = SerialReader(
+            device=devices[0].path,
+            baudrate=args.baudrate,
+            buffered=args.buffered_reads,
+        )
+        reader = WatchdogSerialReader(
+            base_reader, max_backoff_seconds=args.reconnect_max_backoff
+        )
+    else:
+        reader = MultiDeviceReader(
+            devices,
+            baudrate=args.baudrate,
+            max_backoff_seconds=args.reconnect_max_backoff,
+        )
 
     client = PushClient(
         api_url=args.api_url,
         api_token=args.api_token,
-        device_id=args.device_id,
+        # Readings from several boards carry their own device_id
+        device_id=devices[0].device_id if len(devices) == 1 else args.device_id,
         db_path=args.db,
+        commit_batch_size=args.commit_batch_size,
+        commit_max_latency=args.commit_max_latency,
+        push_queue_size=args.push_queue_size,
+        push_overflow=args.overflow_policy,
+        batch_push=args.batch_push,
+        batch_url=args.batch_url,
+        max_batch_records=args.batch_max_records,
+        max_batch_bytes=args.batch_max_bytes,
+        replay_interval=args.replay_interval,
+        replay_rate_limit=args.replay_rate_limit,
+        replay_page_size=args.replay_page_size,
+        snapshot_path=args.snapshot_path,
     )
 
-    reader.set_handler(client.handle_record)
-    reader.run()
+    signal.signal(signal.SIGTERM, _exit_on_sigterm)
+
+    client.start()
+    try:
+        if args.staged:
+            assert isinstance(reader, WatchdogSerialReader)
+            StagedPipeline(
+                reader,
+                client,
+                queue_size=(
+                    1000 if args.stage_queue_size is None else args.stage_queue_size
+                ),
+                overflow_policy=args.overflow_policy,
+            ).run()
+        else:
+            reader.set_handler(client.handle_record)
+            reader.run()
+    finally:
+        reader.close()
+        client.close()
+        logging.info(f"Commit stats: {client.commit_stats.as_dict()}")
 
     return 0
 
@@ -0,0 +1,325 @@
+# filename: app/ingestion/multi_reader.py
+
+from __future__ import annotations
+
+import logging
+import os
+import selectors
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from app.ingestion.csv_parser import parse_geiger_bytes
+from app.ingestion.serial_reader import SerialReader
+from app.ingestion.watchdog import ReconnectBackoff
+from app.metrics import (
+    LINES_READ,
+    PARSE_FAILURES,
+    PARSE_SECONDS,
+    SERIAL_DISCONNECTED,
+    SERIAL_RECONNECT_ATTEMPTS,
+    SERIAL_RECONNECT_SECONDS,
+    SERIAL_RECONNECTS,
+)
+
+log = logging.getLogger(__name__)
+
+ParsedHandler = Callable[[Dict[str, Any]], None]
+
+
+@dataclass(frozen=True)
+class DeviceSpec:
+    device_id: str
+    path: str
+
+
+def parse_device_specs(values: Sequence[str], default_id: str) -> List[DeviceSpec]:
+    """
+    Parse --device values of the form PATH or ID=PATH.
+
+    A bare PATH gets default_id when it is the only device, otherwise
+    "<default_id>-<basename of PATH>". Raises ValueError on duplicates.
+    """
+    specs: List[DeviceSpec] = []
+    for value in values:
+        device_id, sep, path = value.partition("=")
+        if not sep:
+            path = value
+            device_id = (
+                default_id
+                if len(values) == 1
+                else f"{default_id}-{os.path.basename(path)}"
+            )
+        if not device_id or not path:
+            raise ValueError(f"Invalid device spec: {value!r}")
+        specs.append(DeviceSpec(device_id=device_id, path=path))
+
+    for field in ("device_id", "path"):
+        seen = [getattr(spec, field) for spec in specs]
+        duplicates = sorted({v for v in seen if seen.count(v) > 1})
+        if duplicates:
+            raise ValueError(f"Duplicate device {field}: {', '.join(duplicates)}")
+    return specs
+
+
+class _Device:
+    """
+    One device's buffered non-blocking reader plus its watchdog state.
+    """
+
+    def __init__(
+        self,
+        spec: DeviceSpec,
+        baudrate: int,
+        buffer_size: int,
+        backoff: ReconnectBackoff,
+    ) -> None:
+        self.spec = spec
+        self.reader = SerialReader(
+            spec.path,
+            baudrate,
+            timeout=0,
+            buffered=True,
+            buffer_size=buffer_size,
+        )
+        self.last_frame_ts = time.monotonic()
+        self.backoff = backoff
+        # monotonic time of the next open attempt while the port is closed
+        self.reopen_at = 0.0
+        # monotonic time the port was lost, None while connected
+        self.disconnected_at: Optional[float] = None
+        self.reopens = 0
+
+    @property
+    def is_open(self) -> bool:
+        return self.reader.ser is not None
+
+
+class MultiDeviceReader:
+    """
+    Reads several MightyOhm boards from one thread.
+
+    Each port is opened non-blocking and registered with a selector; a
+    wakeup reads whatever every ready port has waiting (see
+    SerialReader.read_frames) and forwards each parsed record to the
+    handler with parsed["device_id"] set to that port's device ID, so one
+    PushClient (and one BatchWriter) serves all devices.
+
+    Every device has its own watchdog, with the same reconnect policy as
+    WatchdogSerialReader: a port that errors or stays silent for
+    dead_threshold_seconds is closed, and reopen attempts back off
+    exponentially with jitter (from reopen_sleep_seconds up to
+    max_backoff_seconds). While a device node is missing it is polled
+    every path_poll_seconds instead. None of this blocks the other devices.
+    """
+
+    def __init__(
+        self,
+        devices: Sequence[DeviceSpec],
+        baudrate: int = 9600,
+        dead_threshold_seconds: float = 5.0,
+        reopen_sleep_seconds: float = 2.0,
+        max_backoff_seconds: float = 60.0,
+        path_poll_seconds: float = 0.5,
+        buffer_size: int = 64 * 1024,
+    ) -> None:
+        if not devices:
+            raise ValueError("MultiDeviceReader requires at least one device")
+
+        self._devices = [
+            _Device(
+                spec,
+                baudrate,
+                buffer_size,
+                ReconnectBackoff(
+                    initial=reopen_sleep_seconds,
+                    maximum=max(max_backoff_seconds, reopen_sleep_seconds),
+                ),
+            )
+            for spec in devices
+        ]
+        self._dead_threshold = dead_threshold_seconds
+        self._path_poll = path_poll_seconds
+        self._selector = selectors.DefaultSelector()
+        self._handler: Optional[ParsedHandler] = None
+        self._stop = threading.Event()
+
+    def set_handler(self, handler: ParsedHandler) -> None:
+        self._handler = handler
+
+    @property
+    def open_devices(self) -> List[str]:
+        return [d.spec.device_id for d in self._devices if d.is_open]
+
+    # ------------------------------------------------------------
+    # Loop
+    # ------------------------------------------------------------
+
+    def run(self) -> None:
+        try:
+            while not self._stop.is_set():
+                try:
+                    self.poll(timeout=1.0)
+                except (KeyboardInterrupt, StopIteration):
+                    break
+                except Exception as exc:
+                    log.error(f"Error in multi-device serial loop: {exc}")
+                    time.sleep(0.1)
+        finally:
+            self.close()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def poll(self, timeout: float) -> int:
+        """
+        One loop iteration: open due ports, wait up to timeout for data,
+        handle every complete frame and run the watchdogs. Returns the
+        number of frames handled.
+        """
+        now = time.monotonic()
+        for device in self._devices:
+            if device.is_open or device.reopen_at > now:
+                continue
+            if not os.path.exists(device.spec.path):
+                # Adapter unplugged: wait for udev to recreate the node
+                device.reopen_at = now + self._path_poll
+                continue
+            self._open(device)
+
+        wait = timeout
+        closed = [d.reopen_at for d in self._devices if not d.is_open]
+        if closed:
+            wait = max(0.0, min(wait, min(closed) - now))
+
+        if self._selector.get_map():
+            ready = self._selector.select(wait)
+        else:
+            time.sleep(wait)
+            ready = []
+
+        handled = 0
+        for key, _ in ready:
+            device = key.data
+            try:
+                frames = device.reader.read_frames()
+            except Exception as exc:
+                log.error(
+                    "multi_reader_read_failed",
+                    extra={"device_id": device.spec.device_id, "error": repr(exc)},
+                )
+                self._close(device)
+                continue
+
+            if frames:
+                device.last_frame_ts = time.monotonic()
+            for raw in frames:
+                self._handle_frame(device, raw)
+                handled += 1
+
+        now = time.monotonic()
+        for device in self._devices:
+            if device.is_open and now - device.last_frame_ts > self._dead_threshold:
+                log.warning(
+                    "watchdog_dead_link_detected",
+                    extra={
+                        "device_id": device.spec.device_id,
+                        "last_frame_age": now - device.last_frame_ts,
+                    },
+                )
+                self._close(device)
+
+        return handled
+
+    def _handle_frame(self, device: _Device, raw: bytes) -> None:
+        with PARSE_SECONDS.time():
+            parsed = parse_geiger_bytes(raw)
+
+        if parsed is None:
+            if raw.strip():
+                LINES_READ.inc()
+                PARSE_FAILURES.inc()
+            return
+        LINES_READ.inc()
+
+        parsed["device_id"] = device.spec.device_id
+        if self._handler is None:
+            return
+        try:
+            self._handler(parsed)
+        except Exception as exc:
+            log.error(
+                "multi_reader_handler_failed",
+                extra={"device_id": device.spec.device_id, "error": repr(exc)},
+            )
+
+    # ------------------------------------------------------------
+    # Per-device watchdog
+    # ------------------------------------------------------------
+
+    def _open(self, device: _Device) -> None:
+        try:
+            ser = device.reader.open_port()
+            self._selector.register(ser.fileno(), selectors.EVENT_READ, device)
+        except Exception as exc:
+            log.error(
+                "multi_reader_open_failed",
+                extra={"device_id": device.spec.device_id, "error": repr(exc)},
+            )
+            SERIAL_RECONNECT_ATTEMPTS.inc()
+            self._close(device)
+            return
+
+        # A freshly opened port gets a full dead_threshold to produce data
+        device.last_frame_ts = time.monotonic()
+        device.backoff.reset()
+        log.info(
+            "multi_reader_device_open",
+            extra={"device_id": device.spec.device_id, "path": device.spec.path},
+        )
+
+        if device.disconnected_at is not None:
+            downtime = time.monotonic() - device.disconnected_at
+            device.disconnected_at = None
+            SERIAL_RECONNECTS.inc()
+            SERIAL_RECONNECT_SECONDS.observe(downtime)
+            SERIAL_DISCONNECTED.dec()
+
+    def _close(self, device: _Device, reopen: bool = True) -> None:
+        ser = device.reader.ser
+        device.reader.ser = None
+        if reopen:
+            if device.disconnected_at is None:
+                device.disconnected_at = time.monotonic()
+                SERIAL_DISCONNECTED.inc()
+            delay = device.backoff.next_delay()
+            device.reopen_at = time.monotonic() + delay
+            device.reopens += 1
+            log.warning(
+                "watchdog_reopen_start",
+                extra={"device_id": device.spec.device_id, "retry_in": delay},
+            )
+        if ser is None:
+            return
+
+        try:
+            self._selector.unregister(ser.fileno())
+        except (KeyError, ValueError, OSError):
+            pass
+        try:
+            ser.close()
+        except Exception as exc:
+            log.error(
+                "watchdog_close_failed",
+                extra={"device_id": device.spec.device_id, "error": repr(exc)},
+            )
+
+    def close(self) -> None:
+        for device in self._devices:
+            if device.is_open:
+                self._close(device, reopen=False)
+            if device.disconnected_at is not None:
+                device.disconnected_at = None
+                SERIAL_DISCONNECTED.dec()
+        self._selector.close()
@@ -0,0 +1,183 @@
+# filename: app/ingestion/push_worker.py
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import Callable, List, Optional, Set
+
+from app.ingestion.batch_writer import BatchWriter
+from app.ingestion.replay import ReplayEngine
+from app.ingestion.stage_queue import StageQueue
+from app.metrics import (
+    END_TO_END_SECONDS,
+    PUSH_DROPPED,
+    READINGS_PUSHED,
+    STAGE_ITEMS,
+    STAGE_SECONDS,
+)
+from app.models import GeigerRecord
+
+log = logging.getLogger(__name__)
+
+
+PushFn = Callable[[GeigerRecord], bool]
+PushBatchFn = Callable[[List[GeigerRecord]], List[int]]
+
+
+class PushWorker(threading.Thread):
+    """
+    Background worker that pushes persisted records to the ingestion API,
+    so the serial loop never waits on the network.
+
+    Records are handed off through a bounded StageQueue (the "push" stage).
+    Under the default "spill" policy a record that finds the queue full is
+    dropped from the handoff only: it is already in SQLite with pushed = 0.
+    "drop-oldest" evicts the oldest queued record the same way, and "block"
+    makes submit() wait for room. Such rows, and live pushes that failed, are
+    re-read from SQLite by the optional ReplayEngine, which the worker runs
+    between live batches so backlog traffic never delays fresh readings by
+    more than one replay page.
+
+    With push_batch set, up to batch_size queued records are sent per call
+    and only the IDs it reports as accepted are marked pushed.
+    """
+
+    def __init__(
+        self,
+        push: PushFn,
+        writer: BatchWriter,
+        queue_size: int = 1000,
+        poll_interval: float = 0.5,
+        push_batch: Optional[PushBatchFn] = None,
+        batch_size: int = 500,
+        replay: Optional[ReplayEngine] = None,
+        overflow_policy: str = "spill",
+    ) -> None:
+        super().__init__(name="push-worker", daemon=True)
+        self._push = push
+        self._writer = writer
+        self._replay = replay
+        self.poll_interval = poll_interval
+        self._push_batch = push_batch
+        self.batch_size = batch_size
+
+        self._stop_flag = threading.Event()
+
+        self._lock = threading.Lock()
+        self._dropped = 0
+        # IDs waiting in the handoff queue; replay skips them
+        self._queued_ids: Set[int] = set()
+
+        self.q: StageQueue[GeigerRecord] = StageQueue(
+            "push",
+            queue_size,
+            overflow_policy,
+            on_overflow=self._on_overflow,
+        )
+
+    # ------------------------------------------------------------
+    # Producer side (serial loop)
+    # ------------------------------------------------------------
+
+    def submit(self, record: GeigerRecord) -> bool:
+        """
+        Hand a persisted record to the worker. Returns False when the
+        handoff queue was full (or the worker stopped) and the record was
+        left for replay. Only waits under the "block" overflow policy.
+        """
+        if record.id is not None:
+            with self._lock:
+                self._queued_ids.add(record.id)
+        return self.q.put(record)
+
+    def _on_overflow(self, record: GeigerRecord) -> None:
+        with self._lock:
+            self._dropped += 1
+            if record.id is not None:
+                self._queued_ids.discard(record.id)
+        PUSH_DROPPED.inc()
+
+    @property
+    def queue_depth(self) -> int:
+        return self.q.qsize()
+
+    @property
+    def dropped(self) -> int:
+        with self._lock:
+            return self._dropped
+
+    # ------------------------------------------------------------
+    # Worker loop
+    # ------------------------------------------------------------
+
+    def stop(self) -> None:
+        self._stop_flag.set()
+        # Release producers blocked on a full queue
+        self.q.close()
+
+    def run(self) -> None:
+        while not self._stop_flag.is_set():
+            try:
+                timeout = self.poll_interval
+                if self._replay is not None:
+                    timeout = min(timeout, self._replay.seconds_until_due())
+
+                limit = self.batch_size if self._push_batch is not None else 1
+                records = self.q.get_batch(limit, timeout)
+                if records:
+                    with self._lock:
+                        self._queued_ids.difference_update(
+                            r.id for r in records if r.id is not None
+                        )
+                    with STAGE_SECONDS.labels("push").time():
+                        self._push_records(records)
+                    STAGE_ITEMS.labels("push").inc(len(records))
+
+                if self._replay is not None and self._replay.due():
+                    with self._lock:
+                        queued = set(self._queued_ids)
+                    self._replay.step(exclude=queued)
+
+            except Exception as exc:
+                # Never crash the worker
+                log.error("push_worker_error", extra={"error": repr(exc)})
+                self._stop_flag.wait(1.0)
+
+    def _push_records(self, records: List[GeigerRecord]) -> None:
+        if self._push_batch is not None:
+            for start in range(0, len(records), self.batch_size):
+                if self._stop_flag.is_set():
+                    break
+                chunk = records[start : start + self.batch_size]
+                accepted = self._push_batch(chunk)
+                self._writer.mark_records_pushed(accepted)
+                observe_acked(chunk, accepted)
+            return
+
+        pushed_ids: List[int] = []
+        for record in records:
+            if self._stop_flag.is_set():
+                break
+            if record.id is not None and self._push(record):
+                pushed_ids.append(record.id)
+
+        self._writer.mark_records_pushed(pushed_ids)
+        observe_acked(records, pushed_ids)
+
+
+def observe_acked(records: List[GeigerRecord], acked_ids: List[int]) -> None:
+    """
+    Count records the ingestion API acknowledged and record their
+    end-to-end latency.
+    """
+    if not acked_ids:
+        return
+    READINGS_PUSHED.inc(len(acked_ids))
+
+    acked = set(acked_ids)
+    now = time.time()
+    for record in records:
+        if record.id in acked:
+            END_TO_END_SECONDS.observe(now - record.timestamp.timestamp())
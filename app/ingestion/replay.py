@@ -0,0 +1,184 @@
+# filename: app/ingestion/replay.py
+
+from __future__ import annotations
+
+import logging
+import time
+from dataclasses import dataclass
+from typing import AbstractSet, Callable, List, Optional
+
+from app.ingestion.batch_writer import BatchWriter
+from app.metrics import READINGS_PUSHED
+from app.models import GeigerRecord
+from app.sqlite_store import get_unpushed_records
+
+log = logging.getLogger(__name__)
+
+
+PushBatchFn = Callable[[List[GeigerRecord]], List[int]]
+
+
+@dataclass
+class ReplayPage:
+    """
+    One page of backlog read by ReplayEngine.take_page().
+    """
+
+    rows: List[GeigerRecord]
+    # rows not excluded as live, i.e. the ones to push
+    candidates: List[GeigerRecord]
+    limit: int
+
+
+class ReplayEngine:
+    """
+    Re-pushes rows left with pushed = 0 (failed or dropped live pushes).
+
+    The backlog is walked in passes, one keyset page (id > cursor) at a time,
+    so it is never loaded into memory at once. A pass starts immediately on
+    startup and then every interval_seconds. Backlog throughput is capped by a
+    token bucket of rate_limit records per second; the caller (PushWorker)
+    serves live records first and only calls step() between live batches.
+
+    If a page is rejected entirely (server down), the pass pauses at the same
+    cursor and resumes after interval_seconds.
+
+    step() reads, pushes and marks a page in one call. A caller that pushes
+    asynchronously (AsyncIngestionPipeline) runs the two SQLite halves,
+    take_page() and finish_page(), on its writer thread and pushes the page
+    itself in between; it does not need push_batch.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        writer: BatchWriter,
+        push_batch: Optional[PushBatchFn] = None,
+        page_size: int = 100,
+        rate_limit: float = 50.0,
+        interval_seconds: float = 60.0,
+    ) -> None:
+        if page_size < 1:
+            raise ValueError("ReplayEngine requires page_size >= 1")
+        if rate_limit <= 0:
+            raise ValueError("ReplayEngine requires rate_limit > 0")
+
+        self.db_path = db_path
+        self._writer = writer
+        self._push_batch = push_batch
+        self.page_size = page_size
+        self.rate_limit = rate_limit
+        self.interval_seconds = interval_seconds
+
+        self._cursor = 0
+        self._resume_at = 0.0  # first pass starts immediately
+        self._tokens = float(page_size)
+        self._refilled_at = time.monotonic()
+
+        self.passes = 0
+        self.replayed = 0
+
+    # ------------------------------------------------------------
+    # Scheduling
+    # ------------------------------------------------------------
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._refilled_at
+        self._refilled_at = now
+        self._tokens = min(
+            float(self.page_size), self._tokens + elapsed * self.rate_limit
+        )
+
+    def seconds_until_due(self) -> float:
+        """
+        Seconds until step() has work it is allowed to do (0 when due now).
+        """
+        now = time.monotonic()
+        self._refill(now)
+
+        if now < self._resume_at:
+            return self._resume_at - now
+        if self._tokens >= 1.0:
+            return 0.0
+        return (1.0 - self._tokens) / self.rate_limit
+
+    def due(self) -> bool:
+        return self.seconds_until_due() == 0.0
+
+    # ------------------------------------------------------------
+    # Replay
+    # ------------------------------------------------------------
+
+    def step(self, exclude: Optional[AbstractSet[int]] = None) -> int:
+        """
+        Push at most one page of backlog rows, within the rate limit.
+
+        exclude holds IDs still waiting in the live queue; they are skipped
+        so a record is not pushed by both paths. Returns the number of
+        backlog rows accepted by the server.
+        """
+        assert self._push_batch is not None, "step() needs push_batch"
+        page = self.take_page(exclude)
+        if page is None:
+            return 0
+        accepted = self._push_batch(page.candidates) if page.candidates else []
+        return self.finish_page(page, accepted)
+
+    def take_page(
+        self, exclude: Optional[AbstractSet[int]] = None
+    ) -> Optional[ReplayPage]:
+        """
+        Read the next page of backlog rows to push, or None when replay is
+        not due or the pass just ended. The candidates are charged to the
+        rate limit here; hand the page back to finish_page() once pushed.
+        """
+        if not self.due():
+            return None
+
+        limit = min(self.page_size, int(self._tokens))
+
+        # Commit pending inserts and pushed flags so the read below sees them
+        self._writer.flush()
+        rows = get_unpushed_records(self.db_path, after_id=self._cursor, limit=limit)
+
+        if not rows:
+            self._finish_pass()
+            return None
+
+        candidates = [
+            r for r in rows if r.id is not None and not (exclude and r.id in exclude)
+        ]
+        self._tokens -= len(candidates)
+        return ReplayPage(rows, candidates, limit)
+
+    def finish_page(self, page: ReplayPage, accepted: List[int]) -> int:
+        """
+        Mark the accepted IDs of page pushed and advance the cursor, or
+        pause the pass if the server rejected every candidate. Returns the
+        number of backlog rows accepted.
+        """
+        if page.candidates and not accepted:
+            self._resume_at = time.monotonic() + self.interval_seconds
+            log.warning("replay_paused", extra={"cursor": self._cursor})
+            return 0
+
+        self._writer.mark_records_pushed(accepted)
+        last_id = page.rows[-1].id
+        assert last_id is not None
+        self._cursor = last_id
+        self.replayed += len(accepted)
+        READINGS_PUSHED.inc(len(accepted))
+
+        if len(page.rows) < page.limit:
+            self._finish_pass()
+
+        return len(accepted)
+
+    def _finish_pass(self) -> None:
+        self.passes += 1
+        self._cursor = 0
+        self._resume_at = time.monotonic() + self.interval_seconds
+        log.info(
+            "replay_pass_complete",
+            extra={"passes": self.passes, "replayed": self.replayed},
+        )
@@ -4,10 +4,12 @@ from __future__ import annotations
 
 import logging
 import time
-from typing import Any, Callable, cast, Dict, Optional
+from typing import Any, Callable, cast, Dict, List, Optional
 import serial
 
-from app.ingestion.csv_parser import parse_geiger_csv
+from app.ingestion.csv_parser import parse_geiger_bytes
+from app.ingestion.frame_buffer import FrameBuffer
+from app.metrics import LINES_READ, PARSE_FAILURES, PARSE_SECONDS, SERIAL_READ_SECONDS
 
 
 ParsedRecord = Dict[str, Any]
@@ -18,49 +20,115 @@ class SerialReader:
     """
     Reads raw lines from a serial device, parses them, and forwards parsed
     records to a callback set by the ingestion loop.
+
+    With buffered=True, run() reads whatever the port has waiting into a
+    reusable FrameBuffer and handles every complete frame per wakeup,
+    instead of one readline() (a read() per byte) per line.
     """
 
-    def __init__(self, device: str, baudrate: int = 9600, timeout: float = 1.0) -> None:
+    def __init__(
+        self,
+        device: str,
+        baudrate: int = 9600,
+        timeout: float = 1.0,
+        buffered: bool = False,
+        buffer_size: int = 64 * 1024,
+    ) -> None:
         self.device = device
         self.baudrate = baudrate
         self.timeout = timeout
+        self.buffered = buffered
 
         self.ser: Optional[serial.Serial] = None
         self._handle_parsed: Optional[ParsedHandler] = None
+        self._frames = FrameBuffer(buffer_size)
 
     def set_handler(self, handler: ParsedHandler) -> None:
         self._handle_parsed = handler
 
-    def read_line(self) -> str:
+    def open_port(self) -> serial.Serial:
+        """
+        The open port, opening it on first use (and after a reopen).
+        """
         if self.ser is None:
             self.ser = serial.Serial(
                 self.device,
                 self.baudrate,
                 timeout=self.timeout,
             )
+            # A partial frame from before a reopen would corrupt the next one
+            self._frames.clear()
+        return self.ser
+
+    def read_frame(self) -> bytes:
+        """
+        Read one raw line from the device, undecoded (b"" on timeout).
+        """
+        return cast(bytes, self.open_port().readline())
+
+    def read_frames(self) -> List[bytes]:
+        """
+        Read every complete frame available, waiting up to timeout for the
+        first one ([] on timeout).
+
+        Buffered mode blocks for a single byte only when nothing is waiting,
+        then pulls all in_waiting bytes in one read. Unbuffered mode is one
+        readline() per call.
+        """
+        if not self.buffered:
+            frame = self.read_frame()
+            return [frame] if frame else []
+
+        ser = self.open_port()
+        buf = self._frames
+        while True:
+            read = ser.readinto(buf.writable(max(1, ser.in_waiting)))
+            if read:
+                buf.commit(read)
+            frames = buf.frames()
+            if frames or not read:
+                return frames
 
-        raw = self.ser.readline()
+    def read_line(self) -> str:
+        raw = self.read_frame()
         if not raw:
             return ""
 
-        decoded = cast(str, raw.decode("utf-8", errors="ignore"))
+        decoded = raw.decode("utf-8", errors="ignore")
         return decoded.strip()
 
-    def run(self) -> None:
-        while True:
-            try:
-                raw = self.read_line()
-                logging.info(f"RAW: {raw!r}")
+    def _handle_frame(self, raw: bytes) -> None:
+        logging.info(f"RAW: {raw!r}")
+
+        with PARSE_SECONDS.time():
+            parsed = parse_geiger_bytes(raw)
+        logging.info(f"PARSED: {parsed}")
 
-                parsed = parse_geiger_csv(raw)
-                logging.info(f"PARSED: {parsed}")
+        if parsed is not None:
+            LINES_READ.inc()
+        elif raw.strip():
+            LINES_READ.inc()
+            PARSE_FAILURES.inc()
 
-                if parsed is not None and self._handle_parsed is not None:
-                    self._handle_parsed(parsed)
+        if parsed is not None and self._handle_parsed is not None:
+            self._handle_parsed(parsed)
 
+    def run(self) -> None:
+        while True:
+            try:
+                with SERIAL_READ_SECONDS.time():
+                    frames = self.read_frames()
             except (KeyboardInterrupt, StopIteration):
                 break
-
             except Exception as exc:
                 logging.error(f"Error in serial loop: {exc}")
                 time.sleep(0.1)
+                continue
+
+            for raw in frames:
+                try:
+                    self._handle_frame(raw)
+                except (KeyboardInterrupt, StopIteration):
+                    return
+                except Exception as exc:
+                    logging.error(f"Error in serial loop: {exc}")
@@ -0,0 +1,170 @@
+# filename: app/ingestion/stage_queue.py
+
+from __future__ import annotations
+
+import collections
+import logging
+import threading
+import time
+from typing import Callable, Deque, Generic, List, Optional, TypeVar
+
+from app.metrics import STAGE_DROPPED, STAGE_SPILLED
+
+log = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+OVERFLOW_POLICIES = ("block", "drop-oldest", "spill")
+
+
+def overflow_action(stage: str, policy: str, full: bool) -> str:
+    """
+    What a producer does with a new item for stage under policy: "queue"
+    it, "evict" the oldest queued item first, or "spill" the new item.
+    Evictions and spills are counted per stage in app.metrics. A "block"
+    producer waits for room before asking, so it always gets "queue".
+    """
+    if not full:
+        return "queue"
+    if policy == "spill":
+        STAGE_SPILLED.labels(stage).inc()
+        return "spill"
+    STAGE_DROPPED.labels(stage).inc()
+    return "evict"
+
+
+class StageQueue(Generic[T]):
+    """
+    Bounded FIFO between two pipeline stages with an explicit overflow
+    policy for when the consumer falls behind:
+
+      - "block": put() waits for room, so backpressure reaches the producer
+      - "drop-oldest": the oldest queued item is evicted to make room
+      - "spill": the new item is not queued; on_overflow(item) persists it
+        to SQLite with pushed = 0 instead, and the backlog replay pushes it
+
+    on_overflow, when set, is called (outside the queue lock) with every item
+    that leaves the queue unconsumed: the evicted item under drop-oldest,
+    the rejected item under spill, and items put after close(). Evictions
+    and spills are counted per stage in app.metrics.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        maxsize: int,
+        policy: str = "block",
+        on_overflow: Optional[Callable[[T], None]] = None,
+    ) -> None:
+        if maxsize < 1:
+            raise ValueError("StageQueue requires maxsize >= 1")
+        if policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {policy!r}")
+        if policy == "spill" and on_overflow is None:
+            raise ValueError("StageQueue with policy 'spill' requires on_overflow")
+
+        self.name = name
+        self.maxsize = maxsize
+        self.policy = policy
+        self._on_overflow = on_overflow
+
+        self._items: Deque[T] = collections.deque()
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+        self._closed = False
+
+        self.dropped = 0
+        self.spilled = 0
+
+    def qsize(self) -> int:
+        with self._lock:
+            return len(self._items)
+
+    def __len__(self) -> int:
+        return self.qsize()
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    # ------------------------------------------------------------
+    # Producer side
+    # ------------------------------------------------------------
+
+    def put(self, item: T) -> bool:
+        """
+        Queue item according to the overflow policy. Returns False when
+        item itself was not queued (spilled, or the queue is closed).
+        """
+        evicted: Optional[T] = None
+        with self._lock:
+            if self.policy == "block":
+                while len(self._items) >= self.maxsize and not self._closed:
+                    self._not_full.wait()
+
+            queued = not self._closed
+            if queued:
+                full = len(self._items) >= self.maxsize
+                action = overflow_action(self.name, self.policy, full)
+                if action == "spill":
+                    queued = False
+                    self.spilled += 1
+                elif action == "evict":
+                    evicted = self._items.popleft()
+                    self.dropped += 1
+
+            if queued:
+                self._items.append(item)
+                self._not_empty.notify()
+
+        if evicted is not None:
+            self._divert(evicted)
+        if not queued:
+            self._divert(item)
+        return queued
+
+    def _divert(self, item: T) -> None:
+        if self._on_overflow is None:
+            return
+        try:
+            self._on_overflow(item)
+        except Exception as exc:
+            log.error(
+                "stage_queue_overflow_failed",
+                extra={"stage": self.name, "error": repr(exc)},
+            )
+
+    # ------------------------------------------------------------
+    # Consumer side
+    # ------------------------------------------------------------
+
+    def get_batch(self, max_items: int, timeout: float) -> List[T]:
+        """
+        Remove and return up to max_items, waiting up to timeout for the
+        first one ([] on timeout, or once closed and drained).
+        """
+        deadline = time.monotonic() + timeout
+        with self._lock:
+            while not self._items and not self._closed:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return []
+                self._not_empty.wait(remaining)
+
+            batch: List[T] = []
+            while self._items and len(batch) < max_items:
+                batch.append(self._items.popleft())
+            if batch:
+                self._not_full.notify_all()
+            return batch
+
+    def close(self) -> None:
+        """
+        Stop accepting items and wake every waiting producer and consumer.
+        Items already queued can still be drained with get_batch().
+        """
+        with self._lock:
+            self._closed = True
+            self._not_empty.notify_all()
+            self._not_full.notify_all()
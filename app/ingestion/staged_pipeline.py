@@ -0,0 +1,214 @@
+# filename: app/ingestion/staged_pipeline.py
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Protocol, Tuple, TypeVar
+
+from app.ingestion.api_client import PushClient
+from app.ingestion.csv_parser import parse_geiger_bytes
+from app.ingestion.stage_queue import StageQueue
+from app.metrics import (
+    LINES_READ,
+    PARSE_FAILURES,
+    PARSE_SECONDS,
+    SERIAL_READ_SECONDS,
+    STAGE_ITEMS,
+    STAGE_QUEUE_DEPTH,
+    STAGE_SECONDS,
+)
+
+log = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Raw frame plus the time it was read, so queueing delay never skews timestamps
+Frame = Tuple[datetime, bytes]
+
+
+class FrameSource(Protocol):
+    def read_frames(self) -> List[bytes]: ...
+
+
+class StagedPipeline:
+    """
+    Ingestion as explicit stages, each on its own thread:
+
+        read -> [parse queue] -> parse -> [persist queue] -> persist
+             -> [push queue] -> push
+
+    read pulls frames from a FrameSource (e.g. a WatchdogSerialReader),
+    parse turns them into records, persist writes them through
+    PushClient.handle_record(), and push is the client's PushWorker. Every
+    queue is a bounded StageQueue with the same overflow policy, so a stall
+    in one stage shows up as depth on its input queue instead of stalling
+    the serial read:
+
+      - "block": backpressure; a full queue pauses the stage feeding it
+      - "drop-oldest": the oldest queued item is discarded
+      - "spill": the item is written to SQLite right away (pushed = 0) and
+        left for the backlog replay
+
+    Per-stage depth, item and timing metrics are in app.metrics
+    (pilog_stage_*). close() stops reading and drains the parse and persist
+    queues in order; the PushClient is closed separately by its owner.
+    """
+
+    def __init__(
+        self,
+        source: FrameSource,
+        client: PushClient,
+        queue_size: int = 1000,
+        overflow_policy: str = "spill",
+        batch_size: int = 100,
+        poll_interval: float = 0.1,
+    ) -> None:
+        if batch_size < 1:
+            raise ValueError("StagedPipeline requires batch_size >= 1")
+
+        self._source = source
+        self._client = client
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+
+        spill = overflow_policy == "spill"
+        self.parse_q: StageQueue[Frame] = StageQueue(
+            "parse",
+            queue_size,
+            overflow_policy,
+            on_overflow=self._spill_frame if spill else None,
+        )
+        self.persist_q: StageQueue[Dict[str, Any]] = StageQueue(
+            "persist",
+            queue_size,
+            overflow_policy,
+            on_overflow=client.spill_record if spill else None,
+        )
+
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    # ------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------
+
+    def start(self) -> None:
+        STAGE_QUEUE_DEPTH.labels("parse").set_function(self.parse_q.qsize)
+        STAGE_QUEUE_DEPTH.labels("persist").set_function(self.persist_q.qsize)
+        STAGE_QUEUE_DEPTH.labels("push").set_function(lambda: self._client.queue_depth)
+
+        targets: List[Tuple[str, Callable[[], None]]] = [
+            ("read", self._read_loop),
+            ("parse", lambda: self._consume(self.parse_q, self._parse)),
+            ("persist", lambda: self._consume(self.persist_q, self._persist)),
+        ]
+        for name, target in targets:
+            thread = threading.Thread(target=target, name=f"stage-{name}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def run(self) -> None:
+        """
+        Start the stages and block until stop() (or KeyboardInterrupt /
+        SystemExit in the calling thread), then close().
+        """
+        self.start()
+        try:
+            while not self._stop.wait(1.0):
+                pass
+        finally:
+            self.close()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def close(self, timeout: float = 10.0) -> None:
+        """
+        Stop reading, then let parse and persist drain their queues.
+        """
+        self._stop.set()
+        queues: List[Optional[StageQueue[Any]]] = [None, self.parse_q, self.persist_q]
+        for thread, q in zip(self._threads, queues):
+            if q is not None:
+                q.close()
+            thread.join(timeout=timeout)
+        self._threads = []
+
+        for gauge in STAGE_QUEUE_DEPTH.children():
+            gauge.set_function(None)
+
+    # ------------------------------------------------------------
+    # Stages
+    # ------------------------------------------------------------
+
+    def _read_loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                with SERIAL_READ_SECONDS.time():
+                    frames = self._source.read_frames()
+            except Exception as exc:
+                log.error("stage_read_failed", extra={"error": repr(exc)})
+                self._stop.wait(0.1)
+                continue
+            if not frames:
+                continue
+
+            received = datetime.now(timezone.utc)
+            with STAGE_SECONDS.labels("read").time():
+                for raw in frames:
+                    self.parse_q.put((received, raw))
+            STAGE_ITEMS.labels("read").inc(len(frames))
+
+    def _consume(self, q: StageQueue[T], handle: Callable[[T], None]) -> None:
+        seconds = STAGE_SECONDS.labels(q.name)
+        items = STAGE_ITEMS.labels(q.name)
+        while True:
+            batch = q.get_batch(self.batch_size, self.poll_interval)
+            if not batch:
+                if q.closed:
+                    return
+                continue
+
+            started = time.perf_counter()
+            for item in batch:
+                try:
+                    handle(item)
+                except Exception as exc:
+                    log.error(
+                        "stage_item_failed",
+                        extra={"stage": q.name, "error": repr(exc)},
+                    )
+            seconds.observe(time.perf_counter() - started)
+            items.inc(len(batch))
+
+    def _parse(self, frame: Frame) -> None:
+        parsed = self._parse_frame(frame)
+        if parsed is not None:
+            self.persist_q.put(parsed)
+
+    def _persist(self, parsed: Dict[str, Any]) -> None:
+        self._client.handle_record(parsed)
+
+    def _spill_frame(self, frame: Frame) -> None:
+        parsed = self._parse_frame(frame)
+        if parsed is not None:
+            self._client.spill_record(parsed)
+
+    @staticmethod
+    def _parse_frame(frame: Frame) -> Optional[Dict[str, Any]]:
+        received, raw = frame
+        with PARSE_SECONDS.time():
+            parsed = parse_geiger_bytes(raw)
+
+        if parsed is None:
+            if raw.strip():
+                LINES_READ.inc()
+                PARSE_FAILURES.inc()
+            return None
+        LINES_READ.inc()
+
+        parsed["timestamp"] = received
+        return parsed
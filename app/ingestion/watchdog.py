@@ -1,22 +1,76 @@
 # filename: app/ingestion/watchdog.py
 
+import os
+import random
 import time
 import logging
-from typing import Any, Optional, Callable, Dict, Protocol
+from typing import Any, Optional, Callable, Dict, List, Protocol, TypeVar
 
-from app.ingestion.csv_parser import parse_geiger_csv
+from app.ingestion.csv_parser import parse_geiger_bytes
+from app.metrics import (
+    LINES_READ,
+    PARSE_FAILURES,
+    PARSE_SECONDS,
+    SERIAL_DISCONNECTED,
+    SERIAL_READ_SECONDS,
+    SERIAL_RECONNECT_ATTEMPTS,
+    SERIAL_RECONNECT_SECONDS,
+    SERIAL_RECONNECTS,
+)
 
 log = logging.getLogger(__name__)
 
+T = TypeVar("T", str, bytes, List[bytes])
+
 
 class SerialReaderProtocol(Protocol):
     ser: Any
 
-    def set_handler(self, handler: Callable[[Dict[str, Any]], None]) -> None:
-        ...
+    def set_handler(self, handler: Callable[[Dict[str, Any]], None]) -> None: ...
 
-    def read_line(self) -> str:
-        ...
+    def read_line(self) -> str: ...
+
+    def read_frame(self) -> bytes: ...
+
+    def read_frames(self) -> List[bytes]: ...
+
+
+class ReconnectBackoff:
+    """
+    Jittered exponential reconnect delays.
+
+    Attempt n waits initial * factor**n, capped at maximum, then shortened
+    by a random fraction of up to jitter, so boards (or processes) that lost
+    their ports together do not retry in lockstep.
+    """
+
+    def __init__(
+        self,
+        initial: float = 2.0,
+        maximum: float = 60.0,
+        factor: float = 2.0,
+        jitter: float = 0.5,
+        rng: Callable[[], float] = random.random,
+    ) -> None:
+        if initial < 0 or maximum < initial:
+            raise ValueError("ReconnectBackoff requires 0 <= initial <= maximum")
+        if not 0.0 <= jitter <= 1.0:
+            raise ValueError("ReconnectBackoff requires 0 <= jitter <= 1")
+
+        self.initial = initial
+        self.maximum = maximum
+        self.factor = factor
+        self.jitter = jitter
+        self._rng = rng
+        self.attempts = 0
+
+    def next_delay(self) -> float:
+        base = min(self.maximum, self.initial * self.factor**self.attempts)
+        self.attempts += 1
+        return base * (1.0 - self.jitter * self._rng())
+
+    def reset(self) -> None:
+        self.attempts = 0
 
 
 class WatchdogSerialReader:
@@ -25,6 +79,16 @@ class WatchdogSerialReader:
       - dead-read detection
       - FTDI disappearance detection
       - automatic port reopen
+
+    Losing the port (a read error, or no frame for dead_threshold_seconds)
+    closes it and starts a reconnect state machine instead of sleeping:
+    while disconnected, every read returns empty after waiting at most
+    path_poll_seconds, so the caller's loop keeps running (and the push
+    worker keeps draining the backlog). If the reader has a device path
+    that does not exist, the path is polled every path_poll_seconds until
+    udev recreates the node; reopening is only attempted once it exists,
+    and failed attempts back off exponentially with jitter (starting at
+    reopen_sleep_seconds, capped at max_backoff_seconds).
     """
 
     def __init__(
@@ -32,13 +96,25 @@ class WatchdogSerialReader:
         reader: SerialReaderProtocol,
         dead_threshold_seconds: float = 5.0,
         reopen_sleep_seconds: float = 2.0,
+        max_backoff_seconds: float = 60.0,
+        path_poll_seconds: float = 0.5,
+        backoff: Optional[ReconnectBackoff] = None,
     ) -> None:
         self._reader: SerialReaderProtocol = reader
         self._dead_threshold = dead_threshold_seconds
-        self._reopen_sleep = reopen_sleep_seconds
+        self._path_poll = path_poll_seconds
+        self._backoff = backoff or ReconnectBackoff(
+            initial=reopen_sleep_seconds,
+            maximum=max(max_backoff_seconds, reopen_sleep_seconds),
+        )
         self._last_frame_ts = time.time()
         self._handler: Optional[Callable[[Dict[str, Any]], None]] = None
 
+        # monotonic time the port was lost, None while connected
+        self._disconnected_at: Optional[float] = None
+        self._retry_at = 0.0
+        self.reconnects = 0
+
     # ------------------------------------------------------------
     # Public API: must match SerialReader
     # ------------------------------------------------------------
@@ -47,33 +123,70 @@ class WatchdogSerialReader:
         self._handler = handler
         self._reader.set_handler(handler)
 
+    def _handle_frame(self, raw: bytes) -> None:
+        log.info(f"RAW: {raw!r}")
+
+        with PARSE_SECONDS.time():
+            parsed = parse_geiger_bytes(raw)
+        log.info(f"PARSED: {parsed}")
+
+        if parsed is not None:
+            LINES_READ.inc()
+        elif raw.strip():
+            LINES_READ.inc()
+            PARSE_FAILURES.inc()
+
+        if parsed is not None and self._handler is not None:
+            self._handler(parsed)
+
     def run(self) -> None:
         """
-        Same loop as SerialReader.run(), but using watchdog-aware read_line().
+        Same loop as SerialReader.run(), but using watchdog-aware read_frames().
         """
         while True:
             try:
-                raw = self.read_line()
-                log.info(f"RAW: {raw!r}")
-
-                parsed = parse_geiger_csv(raw)
-                log.info(f"PARSED: {parsed}")
-
-                if parsed is not None and self._handler is not None:
-                    self._handler(parsed)
-
+                with SERIAL_READ_SECONDS.time():
+                    frames = self.read_frames()
             except (KeyboardInterrupt, StopIteration):
                 break
-
             except Exception as exc:
                 log.error(f"Error in watchdog serial loop: {exc}")
                 time.sleep(0.1)
+                continue
+
+            for raw in frames:
+                try:
+                    self._handle_frame(raw)
+                except (KeyboardInterrupt, StopIteration):
+                    return
+                except Exception as exc:
+                    log.error(f"Error in watchdog serial loop: {exc}")
 
     # ------------------------------------------------------------
     # Watchdog logic
     # ------------------------------------------------------------
 
     def read_line(self) -> str:
+        return self._watched(self._reader.read_line, "")
+
+    def read_frame(self) -> bytes:
+        return self._watched(self._reader.read_frame, b"")
+
+    def read_frames(self) -> List[bytes]:
+        return self._watched(self._reader.read_frames, [])
+
+    @property
+    def connected(self) -> bool:
+        return self._disconnected_at is None
+
+    def _watched(self, read: Callable[[], T], empty: T) -> T:
+        """
+        Call read() with dead-link detection; returns empty while the port
+        is lost or being reconnected.
+        """
+        if self._disconnected_at is not None and not self._reconnect():
+            return empty
+
         now = time.time()
 
         # Dead link detection
@@ -83,38 +196,100 @@ class WatchdogSerialReader:
                 extra={"last_frame_age": now - self._last_frame_ts},
             )
             self._reopen()
+            return empty
 
         try:
-            line = self._reader.read_line()
+            line = read()
         except Exception as exc:
             log.error("watchdog_read_exception", extra={"error": repr(exc)})
             self._reopen()
-            line = self._reader.read_line()
+            return empty
 
         if line:
             self._last_frame_ts = time.time()
 
         return line
 
+    def close(self) -> None:
+        """
+        Close the port for good; a port still being reconnected stops
+        counting as disconnected.
+        """
+        self._close_port()
+        if self._disconnected_at is not None:
+            self._disconnected_at = None
+            SERIAL_DISCONNECTED.dec()
+
+    def _close_port(self) -> None:
+        # Best-effort close with proper type narrowing
+        ser = getattr(self._reader, "ser", None)
+        if ser is not None:
+            try:
+                ser.close()
+            except Exception as exc:
+                log.error("watchdog_close_failed", extra={"error": repr(exc)})
+
+        # Force lazy reopen
+        self._reader.ser = None
+
     def _reopen(self) -> None:
-        log.warning("watchdog_reopen_start")
+        """
+        Close the port and enter the reconnecting state; never sleeps.
+        """
+        self._close_port()
 
-        try:
-            # Best-effort close with proper type narrowing
-            ser = getattr(self._reader, "ser", None)
-            if ser is not None:
-                try:
-                    ser.close()
-                except Exception as exc:
-                    log.error("watchdog_close_failed", extra={"error": repr(exc)})
+        if self._disconnected_at is None:
+            self._disconnected_at = time.monotonic()
+            SERIAL_DISCONNECTED.inc()
+        delay = self._backoff.next_delay()
+        self._retry_at = time.monotonic() + delay
+        log.warning("watchdog_reopen_start", extra={"retry_in": delay})
 
-            # Force lazy reopen
-            self._reader.ser = None
+    def _reconnect(self) -> bool:
+        """
+        One step of the reconnect state machine. Returns True once the port
+        is open again; otherwise waits at most path_poll_seconds.
+        """
+        now = time.monotonic()
+        if now < self._retry_at:
+            time.sleep(min(self._retry_at - now, self._path_poll))
+            return False
 
-            time.sleep(self._reopen_sleep)
+        device = getattr(self._reader, "device", None)
+        if isinstance(device, str) and not os.path.exists(device):
+            # Adapter unplugged: wait for udev to recreate the node instead
+            # of hammering serial.Serial()
+            self._retry_at = now + self._path_poll
+            return False
 
-            log.warning("watchdog_reopen_success")
+        open_port = getattr(self._reader, "open_port", None)
+        if open_port is not None:
+            try:
+                open_port()
+            except Exception as exc:
+                SERIAL_RECONNECT_ATTEMPTS.inc()
+                delay = self._backoff.next_delay()
+                self._retry_at = time.monotonic() + delay
+                log.warning(
+                    "watchdog_reopen_failed",
+                    extra={
+                        "error": repr(exc),
+                        "attempts": self._backoff.attempts,
+                        "retry_in": delay,
+                    },
+                )
+                return False
 
-        except Exception as exc:
-            log.error("watchdog_reopen_failed", extra={"error": repr(exc)})
-            raise
+        assert self._disconnected_at is not None
+        downtime = time.monotonic() - self._disconnected_at
+        self._disconnected_at = None
+        self._backoff.reset()
+        # A reopened port gets a full dead_threshold to produce data
+        self._last_frame_ts = time.time()
+
+        self.reconnects += 1
+        SERIAL_RECONNECTS.inc()
+        SERIAL_RECONNECT_SECONDS.observe(downtime)
+        SERIAL_DISCONNECTED.dec()
+        log.warning("watchdog_reopen_success", extra={"downtime": downtime})
+        return True
@@ -1,17 +1,518 @@
-# pi_log/app/metrics.pt
+# filename: app/metrics.py
 
-from typing import Any
-from app.logging import get_logger
+"""
+Process-local instrumentation in the Prometheus text exposition format
+(version 0.0.4), without a client library dependency.
 
-log = get_logger("pi-log")
+The ingestion process records into REGISTRY and serves it from the health
+server's /metrics; the API keeps its own registry (see app.api).
+"""
 
+from __future__ import annotations
 
-def record_ingestion(record: dict[str, Any]) -> None:
+import bisect
+import logging
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+log = logging.getLogger(__name__)
+
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; spans sub-millisecond parses up to multi-second network pushes
+DEFAULT_BUCKETS = (
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _braces(labels: str) -> str:
+    return f"{{{labels}}}" if labels else ""
+
+
+class Counter:
+    """
+    A monotonically increasing total. With set_function() the value is read
+    at scrape time from a source that already counts (e.g. executor stats).
+    """
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str) -> None:
+        self.name = name
+        self.help = help
+        self._value = 0.0
+        self._fn: Optional[Callable[[], float]] = None
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        if amount < 0:
+            raise ValueError("Counter can only increase")
+        with self._lock:
+            self._value += amount
+
+    def set_function(self, fn: Optional[Callable[[], float]]) -> None:
+        with self._lock:
+            self._fn = fn
+
+    @property
+    def value(self) -> float:
+        with self._lock:
+            fn, value = self._fn, self._value
+        return value if fn is None else float(fn())
+
+    def samples(self, labels: str = "") -> List[str]:
+        return [f"{self.name}{_braces(labels)} {_format_value(self.value)}"]
+
+    def render(self) -> List[str]:
+        return [
+            f"# HELP {self.name} {self.help}",
+            f"# TYPE {self.name} {self.kind}",
+            *self.samples(),
+        ]
+
+
+class Gauge:
+    """
+    A value that can go up and down. With set_function() the value is read
+    from a callback at scrape time (e.g. a queue depth).
+    """
+
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str) -> None:
+        self.name = name
+        self.help = help
+        self._value = 0.0
+        self._fn: Optional[Callable[[], float]] = None
+        self._lock = threading.Lock()
+
+    def set(self, value: float) -> None:
+        with self._lock:
+            self._value = float(value)
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._value -= amount
+
+    def set_function(self, fn: Optional[Callable[[], float]]) -> None:
+        with self._lock:
+            self._fn = fn
+
+    @property
+    def value(self) -> float:
+        with self._lock:
+            fn, value = self._fn, self._value
+        if fn is None:
+            return value
+        try:
+            return float(fn())
+        except Exception as exc:
+            log.error(
+                "gauge_callback_failed", extra={"gauge": self.name, "error": repr(exc)}
+            )
+            return math.nan
+
+    def samples(self, labels: str = "") -> List[str]:
+        value = self.value
+        text = "NaN" if math.isnan(value) else _format_value(value)
+        return [f"{self.name}{_braces(labels)} {text}"]
+
+    def render(self) -> List[str]:
+        return [
+            f"# HELP {self.name} {self.help}",
+            f"# TYPE {self.name} {self.kind}",
+            *self.samples(),
+        ]
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        bounds = sorted(float(b) for b in buckets)
+        if not bounds:
+            raise ValueError("Histogram requires at least one bucket")
+
+        self.name = name
+        self.help = help
+        self._bounds = bounds
+        # Per-bucket (non-cumulative) counts; the last slot is +Inf
+        self._counts = [0] * (len(bounds) + 1)
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self._bounds, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+
+    @contextmanager
+    def time(self) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started)
+
+    @property
+    def count(self) -> int:
+        with self._lock:
+            return sum(self._counts)
+
+    @property
+    def sum(self) -> float:
+        with self._lock:
+            return self._sum
+
+    def samples(self, labels: str = "") -> List[str]:
+        with self._lock:
+            counts = list(self._counts)
+            total = self._sum
+
+        prefix = f"{labels}," if labels else ""
+        lines: List[str] = []
+        cumulative = 0
+        for bound, count in zip(self._bounds + [math.inf], counts):
+            cumulative += count
+            lines.append(
+                f'{self.name}_bucket{{{prefix}le="{_format_value(bound)}"}} '
+                f"{cumulative}"
+            )
+        lines.append(f"{self.name}_sum{_braces(labels)} {_format_value(total)}")
+        lines.append(f"{self.name}_count{_braces(labels)} {cumulative}")
+        return lines
+
+    def render(self) -> List[str]:
+        return [
+            f"# HELP {self.name} {self.help}",
+            f"# TYPE {self.name} {self.kind}",
+            *self.samples(),
+        ]
+
+
+M = TypeVar("M", Counter, Gauge, Histogram)
+
+
+class Family(Generic[M]):
+    """
+    One metric name split by label values, e.g. pilog_stage_items_total
+    with a "stage" label. labels() returns the child metric for one
+    combination of values, creating it on first use; the family renders
+    every child under a single HELP/TYPE header.
     """
-    Minimal metrics hook.
 
-    Tests patch this function and assert call counts.
-    The real implementation is intentionally omitted.
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        kind: str,
+        labelnames: Sequence[str],
+        make: Callable[[], M],
+    ) -> None:
+        if not labelnames:
+            raise ValueError("Family requires at least one label name")
+        self.name = name
+        self.help = help
+        self.kind = kind
+        self.labelnames = tuple(labelnames)
+        self._make: Callable[[], M] = make
+        self._children: Dict[Tuple[str, ...], M] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values: str) -> M:
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {', '.join(self.labelnames)}")
+        with self._lock:
+            child = self._children.get(values)
+            if child is None:
+                child = self._children[values] = self._make()
+            return child
+
+    def children(self) -> List[M]:
+        with self._lock:
+            return list(self._children.values())
+
+    def render(self) -> List[str]:
+        with self._lock:
+            children = list(self._children.items())
+        lines = [
+            f"# HELP {self.name} {self.help}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+        for values, child in children:
+            labels = ",".join(
+                f'{name}="{_escape_label(value)}"'
+                for name, value in zip(self.labelnames, values)
+            )
+            lines.extend(child.samples(labels))
+        return lines
+
+
+Metric = Union[Counter, Gauge, Histogram, Family[Any]]
+
+
+class Registry:
+    """
+    Ordered collection of metrics rendered together for one scrape.
+    """
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: Any) -> Any:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Duplicate metric name: {metric.name}")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help: str) -> Counter:
+        metric: Counter = self._register(Counter(name, help))
+        return metric
+
+    def gauge(self, name: str, help: str) -> Gauge:
+        metric: Gauge = self._register(Gauge(name, help))
+        return metric
+
+    def histogram(
+        self, name: str, help: str, buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        metric: Histogram = self._register(Histogram(name, help, buckets))
+        return metric
+
+    def counter_family(
+        self, name: str, help: str, labelnames: Sequence[str]
+    ) -> Family[Counter]:
+        family: Family[Counter] = self._register(
+            Family(name, help, "counter", labelnames, lambda: Counter(name, help))
+        )
+        return family
+
+    def gauge_family(
+        self, name: str, help: str, labelnames: Sequence[str]
+    ) -> Family[Gauge]:
+        family: Family[Gauge] = self._register(
+            Family(name, help, "gauge", labelnames, lambda: Gauge(name, help))
+        )
+        return family
+
+    def histogram_family(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str],
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Family[Histogram]:
+        family: Family[Histogram] = self._register(
+            Family(
+                name,
+                help,
+                "histogram",
+                labelnames,
+                lambda: Histogram(name, help, buckets),
+            )
+        )
+        return family
+
+    def get(self, name: str) -> Optional[Metric]:
+        with self._lock:
+            return self._metrics.get(name)
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# ------------------------------------------------------------
+# Ingestion process metrics
+# ------------------------------------------------------------
+
+REGISTRY = Registry()
+
+SERIAL_READ_SECONDS = REGISTRY.histogram(
+    "pilog_serial_read_seconds",
+    "Time blocked in one serial read (one line, or every waiting frame "
+    "in buffered mode).",
+)
+PARSE_SECONDS = REGISTRY.histogram(
+    "pilog_parse_seconds",
+    "Time to parse one raw line.",
+)
+INSERT_SECONDS = REGISTRY.histogram(
+    "pilog_insert_seconds",
+    "Time to execute one INSERT in the open write transaction.",
+)
+COMMIT_SECONDS = REGISTRY.histogram(
+    "pilog_commit_seconds",
+    "Time of one SQLite group commit.",
+)
+PUSH_SECONDS = REGISTRY.histogram(
+    "pilog_push_seconds",
+    "Round trip of one push request to the ingestion API.",
+)
+END_TO_END_SECONDS = REGISTRY.histogram(
+    "pilog_end_to_end_seconds",
+    "Time from a parsed reading entering the pipeline to the ingestion API "
+    "acknowledging it (live path only).",
+)
+
+LINES_READ = REGISTRY.counter(
+    "pilog_serial_lines_total",
+    "Non-empty lines read from the serial device.",
+)
+PARSE_FAILURES = REGISTRY.counter(
+    "pilog_parse_failures_total",
+    "Non-empty lines that did not parse as a reading.",
+)
+READINGS_INGESTED = REGISTRY.counter(
+    "pilog_readings_ingested_total",
+    "Readings persisted to SQLite.",
+)
+READINGS_PUSHED = REGISTRY.counter(
+    "pilog_readings_pushed_total",
+    "Readings acknowledged by the ingestion API (live and replay).",
+)
+PUSH_FAILURES = REGISTRY.counter(
+    "pilog_push_failures_total",
+    "Push requests that failed or were rejected.",
+)
+PUSH_DROPPED = REGISTRY.counter(
+    "pilog_push_dropped_total",
+    "Readings not handed to the push worker because its queue was full.",
+)
+PUSH_QUEUE_DEPTH = REGISTRY.gauge(
+    "pilog_push_queue_depth",
+    "Readings waiting in the push handoff queue.",
+)
+COMMIT_PENDING = REGISTRY.gauge(
+    "pilog_commit_pending_statements",
+    "Statements executed but not yet committed.",
+)
+
+SERIAL_RECONNECTS = REGISTRY.counter(
+    "pilog_serial_reconnects_total",
+    "Serial ports reopened after a dead link or read error.",
+)
+SERIAL_RECONNECT_ATTEMPTS = REGISTRY.counter(
+    "pilog_serial_reconnect_attempts_total",
+    "Failed attempts to reopen a serial port whose device node exists.",
+)
+SERIAL_RECONNECT_SECONDS = REGISTRY.histogram(
+    "pilog_serial_reconnect_seconds",
+    "Time from losing a serial port to reopening it.",
+    buckets=(0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0, 3600.0),
+)
+SERIAL_DISCONNECTED = REGISTRY.gauge(
+    "pilog_serial_disconnected",
+    "Serial ports currently lost and being reconnected.",
+)
+
+# ------------------------------------------------------------
+# Staged pipeline (read -> parse -> persist -> push)
+# ------------------------------------------------------------
+
+PIPELINE_STAGES = ("read", "parse", "persist", "push")
+# The read stage has no input queue
+QUEUED_STAGES = PIPELINE_STAGES[1:]
+
+STAGE_ITEMS = REGISTRY.counter_family(
+    "pilog_stage_items_total",
+    "Items each pipeline stage has processed.",
+    ["stage"],
+)
+STAGE_SECONDS = REGISTRY.histogram_family(
+    "pilog_stage_seconds",
+    "Time each pipeline stage spent on one batch of items.",
+    ["stage"],
+)
+STAGE_QUEUE_DEPTH = REGISTRY.gauge_family(
+    "pilog_stage_queue_depth",
+    "Items waiting in each pipeline stage's input queue.",
+    ["stage"],
+)
+STAGE_DROPPED = REGISTRY.counter_family(
+    "pilog_stage_dropped_total",
+    "Items evicted from a full stage queue (drop-oldest).",
+    ["stage"],
+)
+STAGE_SPILLED = REGISTRY.counter_family(
+    "pilog_stage_spilled_total",
+    "Items diverted from a full stage queue to SQLite (spill).",
+    ["stage"],
+)
+
+# Every series exists from the first scrape, at zero
+for _stage in PIPELINE_STAGES:
+    STAGE_ITEMS.labels(_stage)
+    STAGE_SECONDS.labels(_stage)
+for _stage in QUEUED_STAGES:
+    STAGE_QUEUE_DEPTH.labels(_stage)
+    STAGE_DROPPED.labels(_stage)
+    STAGE_SPILLED.labels(_stage)
+
+
+def record_ingestion(record: dict[str, Any]) -> None:
+    """
+    Count one reading persisted by the ingestion pipeline.
     """
-    log.debug(f"Metrics: recorded ingestion of {record}")
-    return None
+    READINGS_INGESTED.inc()
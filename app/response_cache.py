@@ -0,0 +1,101 @@
+# filename: app/response_cache.py
+
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, Hashable, Optional
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    version: Hashable
+    body: bytes
+    etag: str
+    headers: Dict[str, str] = field(default_factory=dict)
+
+
+def make_etag(body: bytes) -> str:
+    """
+    Strong ETag derived from the serialized body, so identical content keeps
+    the same tag across cache invalidations and API restarts.
+    """
+    return '"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Evaluate an If-None-Match header against etag (weak comparison).
+    """
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+class ResponseCache:
+    """
+    Small thread-safe LRU of serialized API responses.
+
+    Each entry remembers the data version it was built from (for example
+    SQLite's data_version and the max row ID). get() only returns an entry
+    whose version equals the caller's current one, so an entry is
+    invalidated by the first request after the data changes.
+    """
+
+    def __init__(self, max_entries: int = 256) -> None:
+        if max_entries < 1:
+            raise ValueError("ResponseCache requires max_entries >= 1")
+
+        self.max_entries = max_entries
+        self._entries: OrderedDict[Hashable, CachedResponse] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, version: Hashable) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.version != version:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(
+        self,
+        key: Hashable,
+        version: Hashable,
+        body: bytes,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> CachedResponse:
+        entry = CachedResponse(
+            version=version,
+            body=body,
+            etag=make_etag(body),
+            headers=dict(headers or {}),
+        )
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
@@ -0,0 +1,100 @@
+# filename: app/rollups.py
+
+"""
+Per-minute and per-hour rollups of geiger_readings.
+
+The rollup tables are maintained incrementally by insert triggers (see
+app/sqlite_store.py). This module rebuilds them from the raw table, which is
+needed once for databases that predate the rollups, after rows were
+imported with the triggers disabled, and after any DELETE from
+geiger_readings or UPDATE of its timestamps or values (the triggers only
+track inserts). Readings whose timestamp SQLite cannot parse belong to no
+bucket and are left out.
+
+Usage:
+    python -m app.rollups --db /var/lib/pi-log/readings.db
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import sqlite3
+import sys
+from typing import Dict
+
+from app.sqlite_store import ROLLUP_BUCKET_FORMATS, initialize_db, rollup_table
+
+
+def rebuild_rollups(db_path: str) -> Dict[str, int]:
+    """
+    Recompute every rollup table from geiger_readings in one transaction.
+    Returns the number of buckets written per resolution.
+    """
+    initialize_db(db_path)
+
+    buckets: Dict[str, int] = {}
+    conn = sqlite3.connect(db_path)
+    try:
+        with conn:
+            for resolution, bucket_fmt in ROLLUP_BUCKET_FORMATS.items():
+                table = rollup_table(resolution)
+                conn.execute(f"DELETE FROM {table}")
+                cur = conn.execute(
+                    f"""
+                    INSERT INTO {table} (
+                        bucket, count,
+                        cps_min, cps_max, cps_sum,
+                        cpm_min, cpm_max, cpm_sum,
+                        usv_min, usv_max, usv_sum
+                    )
+                    SELECT
+                        strftime('{bucket_fmt}', timestamp) AS b,
+                        COUNT(*),
+                        MIN(counts_per_second),
+                        MAX(counts_per_second),
+                        SUM(counts_per_second),
+                        MIN(counts_per_minute),
+                        MAX(counts_per_minute),
+                        SUM(counts_per_minute),
+                        MIN(microsieverts_per_hour),
+                        MAX(microsieverts_per_hour),
+                        SUM(microsieverts_per_hour)
+                    FROM geiger_readings
+                    WHERE b IS NOT NULL
+                    GROUP BY b
+                    """
+                )
+                buckets[resolution] = cur.rowcount
+    finally:
+        conn.close()
+
+    return buckets
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="rollups",
+        description="Rebuild per-minute and per-hour rollup tables.",
+    )
+    parser.add_argument("--db", required=True, type=str)
+    return parser
+
+
+def main() -> int:
+    args = build_parser().parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(message)s",
+    )
+
+    buckets = rebuild_rollups(args.db)
+    for resolution, count in buckets.items():
+        logging.info(f"Rebuilt {rollup_table(resolution)}: {count} buckets")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,159 @@
+# filename: app/snapshot.py
+
+"""
+Shared-memory snapshot of the latest reading and pipeline counters.
+
+The ingestion process publishes into a small memory-mapped file; the API
+process maps the same file and reads it without touching SQLite. Consistency
+uses a seqlock: the writer bumps the sequence number to an odd value, writes
+the payload, then bumps it to the next even value. A reader that sees an odd
+number, or a number that changed while it copied the payload, retries.
+
+File layout (fixed SNAPSHOT_SIZE bytes, little-endian):
+    0   4s   magic b"PLSN"
+    4   I    layout version
+    8   Q    sequence number
+    16  d    published_at (unix seconds)
+    24  I    payload length
+    32  ...  payload (UTF-8 JSON)
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import mmap
+import os
+import struct
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+log = logging.getLogger(__name__)
+
+
+DEFAULT_SNAPSHOT_PATH = "/run/pi-log/snapshot.bin"
+
+SNAPSHOT_SIZE = 4096
+MAGIC = b"PLSN"
+VERSION = 1
+
+_HEADER = struct.Struct("<4sIQdI")
+_SEQ = struct.Struct("<Q")
+_SEQ_OFFSET = 8
+_PAYLOAD_OFFSET = 32
+MAX_PAYLOAD = SNAPSHOT_SIZE - _PAYLOAD_OFFSET
+
+
+class SnapshotWriter:
+    """
+    Single-writer side of the snapshot (ingestion process).
+    """
+
+    def __init__(self, path: str = DEFAULT_SNAPSHOT_PATH) -> None:
+        self.path = path
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+
+        # Never unlink/recreate: readers keep their mapping of this inode
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if os.fstat(fd).st_size != SNAPSHOT_SIZE:
+                os.ftruncate(fd, SNAPSHOT_SIZE)
+            self._mm = mmap.mmap(fd, SNAPSHOT_SIZE, access=mmap.ACCESS_WRITE)
+        finally:
+            os.close(fd)
+
+        magic, version, seq, _, _ = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            seq = 0
+        # Resume from an even number so readers never see a stale match
+        self._seq = seq + (seq & 1)
+        _HEADER.pack_into(self._mm, 0, MAGIC, VERSION, self._seq, 0.0, 0)
+
+    def publish(self, payload: Dict[str, Any]) -> bool:
+        """
+        Publish a JSON-serializable payload. Returns False (and publishes
+        nothing) if it does not fit in the snapshot.
+        """
+        data = json.dumps(payload, separators=(",", ":")).encode()
+        if len(data) > MAX_PAYLOAD:
+            log.warning("snapshot_payload_too_large", extra={"bytes": len(data)})
+            return False
+
+        mm = self._mm
+        self._seq += 1
+        _SEQ.pack_into(mm, _SEQ_OFFSET, self._seq)
+
+        mm[_PAYLOAD_OFFSET : _PAYLOAD_OFFSET + len(data)] = data
+        _HEADER.pack_into(mm, 0, MAGIC, VERSION, self._seq, time.time(), len(data))
+
+        self._seq += 1
+        _SEQ.pack_into(mm, _SEQ_OFFSET, self._seq)
+        return True
+
+    def close(self) -> None:
+        self._mm.close()
+
+
+class SnapshotReader:
+    """
+    Lock-free reader side of the snapshot (API process).
+
+    The file is mapped lazily, so the reader can be created before the
+    ingestion process has written anything. read() returns None when the
+    snapshot is missing, torn after several retries, or older than max_age.
+    """
+
+    def __init__(self, path: str = DEFAULT_SNAPSHOT_PATH, retries: int = 8) -> None:
+        self.path = path
+        self.retries = retries
+        self._mm: Optional[mmap.mmap] = None
+
+    def _map(self) -> Optional[mmap.mmap]:
+        if self._mm is not None:
+            return self._mm
+        try:
+            fd = os.open(self.path, os.O_RDONLY)
+        except OSError:
+            return None
+        try:
+            if os.fstat(fd).st_size < SNAPSHOT_SIZE:
+                return None
+            self._mm = mmap.mmap(fd, SNAPSHOT_SIZE, access=mmap.ACCESS_READ)
+        finally:
+            os.close(fd)
+        return self._mm
+
+    def read(self, max_age: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        mm = self._map()
+        if mm is None:
+            return None
+
+        for _ in range(self.retries):
+            magic, version, seq, published_at, length = _HEADER.unpack_from(mm, 0)
+            if magic != MAGIC or version != VERSION or seq == 0:
+                return None
+            if seq & 1 or length > MAX_PAYLOAD:
+                continue
+
+            data = mm[_PAYLOAD_OFFSET : _PAYLOAD_OFFSET + length]
+            if _SEQ.unpack_from(mm, _SEQ_OFFSET)[0] != seq:
+                continue
+
+            if max_age is not None and time.time() - published_at > max_age:
+                return None
+            if length == 0:
+                return None
+
+            try:
+                payload: Dict[str, Any] = json.loads(data)
+            except ValueError:
+                continue
+            return payload
+
+        return None
+
+    def close(self) -> None:
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
@@ -0,0 +1,114 @@
+# filename: app/sqlite_pool.py
+
+from __future__ import annotations
+
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, List
+
+
+class ReadConnectionPool:
+    """
+    Thread-safe pool of read-only SQLite connections shared by the API.
+
+    Connections are opened lazily (up to `size`), in read-only URI mode with
+    PRAGMA query_only, and reused across requests. The ingestion process
+    runs the database in WAL mode, so these readers never block its writer.
+    A connection that raised a sqlite3.Error is discarded, not returned.
+    """
+
+    def __init__(self, db_path: str, size: int = 4, timeout: float = 5.0) -> None:
+        if size < 1:
+            raise ValueError("ReadConnectionPool requires size >= 1")
+
+        self.db_path = db_path
+        self.size = size
+        self.timeout = timeout
+
+        self._idle: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue()
+        self._all: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _connect(self) -> sqlite3.Connection:
+        uri = f"{Path(self.db_path).resolve().as_uri()}?mode=ro"
+        conn = sqlite3.connect(
+            uri,
+            uri=True,
+            timeout=self.timeout,
+            check_same_thread=False,
+        )
+        conn.execute("PRAGMA query_only = ON;")
+        return conn
+
+    def _acquire(self) -> sqlite3.Connection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("ReadConnectionPool is closed")
+            if len(self._all) < self.size:
+                conn = self._connect()
+                self._all.append(conn)
+                return conn
+
+        try:
+            return self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise TimeoutError("No SQLite read connection available") from None
+
+    def _discard(self, conn: sqlite3.Connection) -> None:
+        with self._lock:
+            if conn in self._all:
+                self._all.remove(conn)
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        conn = self._acquire()
+        broken = False
+        try:
+            yield conn
+        except sqlite3.Error:
+            broken = True
+            raise
+        finally:
+            if broken:
+                self._discard(conn)
+            else:
+                self._release(conn)
+
+    def _release(self, conn: sqlite3.Connection) -> None:
+        if conn.in_transaction:
+            conn.rollback()
+        with self._lock:
+            closed = self._closed
+        if closed:
+            self._discard(conn)
+        else:
+            self._idle.put(conn)
+
+    @property
+    def open_connections(self) -> int:
+        with self._lock:
+            return len(self._all)
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            conns = list(self._all)
+            self._all.clear()
+        for conn in conns:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
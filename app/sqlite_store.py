@@ -4,7 +4,7 @@ from __future__ import annotations
 
 import sqlite3
 from datetime import datetime, timezone
-from typing import List
+from typing import Iterator, List, Optional
 
 from app.models import GeigerRecord
 
@@ -21,16 +21,159 @@ CREATE TABLE IF NOT EXISTS geiger_readings (
     timestamp TEXT NOT NULL,
     pushed INTEGER NOT NULL DEFAULT 0
 );
+
+-- Only unpushed rows are indexed, so backlog lookups cost O(backlog),
+-- not O(table), and the index shrinks as rows are pushed.
+CREATE INDEX IF NOT EXISTS idx_geiger_readings_unpushed
+    ON geiger_readings (id)
+    WHERE pushed = 0;
+
+-- Time-range queries and (timestamp, id) keyset cursors.
+CREATE INDEX IF NOT EXISTS idx_geiger_readings_timestamp
+    ON geiger_readings (timestamp, id);
+"""
+
+
+# Rollup resolution -> strftime() format of the UTC bucket start. Buckets use
+# the same ISO-8601 form as geiger_readings.timestamp, so they compare as text.
+ROLLUP_BUCKET_FORMATS = {
+    "minute": "%Y-%m-%dT%H:%M:00+00:00",
+    "hour": "%Y-%m-%dT%H:00:00+00:00",
+}
+
+
+def rollup_table(resolution: str) -> str:
+    return f"geiger_rollup_{resolution}"
+
+
+def _rollup_schema(resolution: str) -> str:
+    table = rollup_table(resolution)
+    bucket_fmt = ROLLUP_BUCKET_FORMATS[resolution]
+    return f"""
+CREATE TABLE IF NOT EXISTS {table} (
+    bucket TEXT PRIMARY KEY,
+    count INTEGER NOT NULL,
+    cps_min INTEGER NOT NULL,
+    cps_max INTEGER NOT NULL,
+    cps_sum INTEGER NOT NULL,
+    cpm_min INTEGER NOT NULL,
+    cpm_max INTEGER NOT NULL,
+    cpm_sum INTEGER NOT NULL,
+    usv_min REAL NOT NULL,
+    usv_max REAL NOT NULL,
+    usv_sum REAL NOT NULL
+) WITHOUT ROWID;
+
+-- Keep the rollup current as rows arrive. Only INSERT is tracked: after
+-- a DELETE, or an UPDATE of timestamp or values, rebuild with app/rollups.py.
+-- Rows whose timestamp strftime() cannot parse have no bucket and are left
+-- out (a NULL key would fail the INSERT into geiger_readings). Recreated on
+-- every initialize_db() so existing databases get the current definition.
+DROP TRIGGER IF EXISTS trg_{table}_insert;
+CREATE TRIGGER trg_{table}_insert
+AFTER INSERT ON geiger_readings
+WHEN strftime('{bucket_fmt}', NEW.timestamp) IS NOT NULL
+BEGIN
+    INSERT INTO {table} (
+        bucket, count,
+        cps_min, cps_max, cps_sum,
+        cpm_min, cpm_max, cpm_sum,
+        usv_min, usv_max, usv_sum
+    )
+    VALUES (
+        strftime('{bucket_fmt}', NEW.timestamp), 1,
+        NEW.counts_per_second, NEW.counts_per_second, NEW.counts_per_second,
+        NEW.counts_per_minute, NEW.counts_per_minute, NEW.counts_per_minute,
+        NEW.microsieverts_per_hour, NEW.microsieverts_per_hour,
+        NEW.microsieverts_per_hour
+    )
+    ON CONFLICT (bucket) DO UPDATE SET
+        count = count + 1,
+        cps_min = min(cps_min, excluded.cps_min),
+        cps_max = max(cps_max, excluded.cps_max),
+        cps_sum = cps_sum + excluded.cps_sum,
+        cpm_min = min(cpm_min, excluded.cpm_min),
+        cpm_max = max(cpm_max, excluded.cpm_max),
+        cpm_sum = cpm_sum + excluded.cpm_sum,
+        usv_min = min(usv_min, excluded.usv_min),
+        usv_max = max(usv_max, excluded.usv_max),
+        usv_sum = usv_sum + excluded.usv_sum;
+END;
+"""
+
+
+ROLLUP_SCHEMA = "".join(_rollup_schema(r) for r in ROLLUP_BUCKET_FORMATS)
+
+
+# Single-row counters kept current by triggers, so /metrics never needs
+# COUNT(*). The seed scans geiger_readings only when the row does not exist
+# yet (WHERE skips the scan, HAVING drops the empty aggregate row).
+COUNTERS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS geiger_counters (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    total INTEGER NOT NULL,
+    pushed INTEGER NOT NULL,
+    unpushed INTEGER NOT NULL,
+    last_ingested_at TEXT
+);
+
+INSERT INTO geiger_counters (id, total, pushed, unpushed, last_ingested_at)
+SELECT 1, COUNT(*), COALESCE(SUM(pushed), 0),
+       COUNT(*) - COALESCE(SUM(pushed), 0), MAX(timestamp)
+FROM geiger_readings
+WHERE NOT EXISTS (SELECT 1 FROM geiger_counters)
+HAVING NOT EXISTS (SELECT 1 FROM geiger_counters);
+
+CREATE TRIGGER IF NOT EXISTS trg_geiger_counters_insert
+AFTER INSERT ON geiger_readings
+BEGIN
+    UPDATE geiger_counters SET
+        total = total + 1,
+        pushed = pushed + NEW.pushed,
+        unpushed = unpushed + 1 - NEW.pushed,
+        last_ingested_at = CASE
+            WHEN last_ingested_at IS NULL OR NEW.timestamp > last_ingested_at
+            THEN NEW.timestamp
+            ELSE last_ingested_at
+        END
+    WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_geiger_counters_pushed
+AFTER UPDATE OF pushed ON geiger_readings
+WHEN OLD.pushed != NEW.pushed
+BEGIN
+    UPDATE geiger_counters SET
+        pushed = pushed + NEW.pushed - OLD.pushed,
+        unpushed = unpushed - NEW.pushed + OLD.pushed
+    WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_geiger_counters_delete
+AFTER DELETE ON geiger_readings
+BEGIN
+    UPDATE geiger_counters SET
+        total = total - 1,
+        pushed = pushed - OLD.pushed,
+        unpushed = unpushed - 1 + OLD.pushed
+    WHERE id = 1;
+END;
 """
 
 
 def initialize_db(db_path: str) -> None:
     """
-    Initialize the SQLite database with the canonical schema only.
+    Initialize the SQLite database with the canonical schema: the
+    geiger_readings table, its indexes, the per-minute/per-hour rollup
+    tables and the counters row, with the triggers that maintain them.
+
+    The database is switched to WAL mode (persistent), so API readers and
+    the ingestion writer never block each other.
     """
     conn = sqlite3.connect(db_path)
     try:
-        conn.execute(SCHEMA)
+        conn.execute("PRAGMA journal_mode=WAL;")
+        conn.executescript(SCHEMA + ROLLUP_SCHEMA + COUNTERS_SCHEMA)
         conn.commit()
     finally:
         conn.close()
@@ -106,35 +249,72 @@ def _row_to_record(row: tuple) -> GeigerRecord:
     )
 
 
-def get_unpushed_records(db_path: str) -> List[GeigerRecord]:
+def iter_unpushed_records(
+    db_path: str,
+    after_id: int = 0,
+    limit: Optional[int] = None,
+    page_size: int = 500,
+) -> Iterator[GeigerRecord]:
     """
-    Return all canonical records where pushed == 0.
+    Stream canonical records where pushed == 0, in ID order.
+
+    Rows are read in keyset pages of page_size (id > last seen ID) over the
+    partial unpushed index, so memory stays flat and no read transaction is
+    held open between pages. Stops after limit records when given.
     """
+    remaining = -1 if limit is None else limit
     conn = sqlite3.connect(db_path)
     try:
-        cursor = conn.execute(
-            """
-            SELECT
-                id,
-                raw,
-                counts_per_second,
-                counts_per_minute,
-                microsieverts_per_hour,
-                mode,
-                device_id,
-                timestamp,
-                pushed
-            FROM geiger_readings
-            WHERE pushed = 0
-            ORDER BY id ASC
-            """
-        )
-        rows = cursor.fetchall()
-        return [_row_to_record(row) for row in rows]
+        while remaining != 0:
+            size = page_size if remaining < 0 else min(page_size, remaining)
+            rows = conn.execute(
+                """
+                SELECT
+                    id,
+                    raw,
+                    counts_per_second,
+                    counts_per_minute,
+                    microsieverts_per_hour,
+                    mode,
+                    device_id,
+                    timestamp,
+                    pushed
+                FROM geiger_readings
+                WHERE pushed = 0 AND id > ?
+                ORDER BY id ASC
+                LIMIT ?
+                """,
+                (after_id, size),
+            ).fetchall()
+
+            for row in rows:
+                yield _row_to_record(row)
+
+            if len(rows) < size:
+                return
+
+            after_id = rows[-1][0]
+            if remaining > 0:
+                remaining -= len(rows)
     finally:
         conn.close()
 
 
+def get_unpushed_records(
+    db_path: str,
+    after_id: int = 0,
+    limit: Optional[int] = None,
+) -> List[GeigerRecord]:
+    """
+    Return canonical records where pushed == 0, in ID order.
+
+    after_id/limit page through the backlog by key: pass the last ID of the
+    previous page as after_id to continue from it. Prefer
+    iter_unpushed_records() when the backlog may be large.
+    """
+    return list(iter_unpushed_records(db_path, after_id=after_id, limit=limit))
+
+
 def mark_records_pushed(db_path: str, ids: List[int]) -> None:
     """
     Mark the given canonical record IDs as pushed.
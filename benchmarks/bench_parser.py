@@ -0,0 +1,101 @@
+# filename: benchmarks/bench_parser.py
+
+"""
+Microbenchmark: per-line MightyOhm parsing from raw serial bytes, comparing
+decode + strip + parse_geiger_csv (the old SerialReader path) with
+parse_geiger_bytes, plus columnar parse_geiger_csv_many over one buffer.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_parser --lines 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import timeit
+from typing import Any, Callable, Dict, List, Optional
+
+from app.ingestion.batch_parser import parse_geiger_csv_many
+from app.ingestion.csv_parser import parse_geiger_bytes, parse_geiger_csv
+
+Parser = Callable[[bytes], Optional[Dict[str, Any]]]
+
+
+def make_lines(count: int, invalid_every: int) -> List[bytes]:
+    lines = []
+    for i in range(count):
+        if invalid_every and i % invalid_every == 0:
+            lines.append(b"CPS, 1\r\n")
+        else:
+            cps = i % 50
+            lines.append(
+                f"CPS, {cps}, CPM, {cps * 60}, uSv/hr, {cps * 0.0057:.2f}, SLOW\r\n".encode()
+            )
+    return lines
+
+
+def old_path(raw: bytes) -> Optional[Dict[str, Any]]:
+    return parse_geiger_csv(raw.decode("utf-8", errors="ignore").strip())
+
+
+def bench(parse: Parser, lines: List[bytes], repeat: int) -> float:
+    """
+    Best-of-repeat seconds per line.
+    """
+
+    def run() -> None:
+        for line in lines:
+            parse(line)
+
+    return min(timeit.repeat(run, number=1, repeat=repeat)) / len(lines)
+
+
+def bench_many(lines: List[bytes], repeat: int) -> float:
+    """
+    Best-of-repeat seconds per line for one columnar parse of all lines.
+    """
+    data = b"".join(lines)
+    return min(
+        timeit.repeat(lambda: parse_geiger_csv_many(data), number=1, repeat=repeat)
+    ) / len(lines)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--lines", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--invalid-every",
+        type=int,
+        default=0,
+        help="Make every Nth line malformed (0: all lines valid).",
+    )
+    return parser
+
+
+def main() -> int:
+    args = build_parser().parse_args()
+    lines = make_lines(args.lines, args.invalid_every)
+
+    if any(old_path(line) != parse_geiger_bytes(line) for line in lines):
+        print("ERROR: parsers disagree")
+        return 1
+
+    slow = bench(old_path, lines, args.repeat)
+    fast = bench(parse_geiger_bytes, lines, args.repeat)
+    many = bench_many(lines, args.repeat)
+
+    print(f"lines:              {args.lines}")
+    print(f"decode + csv parse: {slow * 1e6:8.3f} us/line")
+    print(f"bytes parse:        {fast * 1e6:8.3f} us/line")
+    print(f"columnar buffer:    {many * 1e6:8.3f} us/line")
+    print(
+        f"speedup:            {slow / fast:8.2f}x (bytes), {slow / many:.2f}x (columnar)"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+# filename: benchmarks/bench_serialization.py
+
+"""
+Microbenchmark: serializing /readings rows through pydantic vs. the direct
+row -> JSON fast path used by app.api.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_serialization --rows 1000
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import timeit
+from typing import Any, Callable, Dict, List
+
+from pydantic import TypeAdapter
+
+from app.api import Reading, render_json, render_readings
+
+
+def make_rows(count: int) -> List[Dict[str, Any]]:
+    return [
+        {
+            "id": i,
+            "timestamp": f"2025-01-01T00:{i // 60 % 60:02d}:{i % 60:02d}+00:00",
+            "cps": i % 50,
+            "cpm": (i % 50) * 60,
+            "mode": "SLOW",
+            "raw": f"CPS, {i % 50}, CPM, {(i % 50) * 60}, uSv/hr, 0.10, SLOW",
+        }
+        for i in range(count)
+    ]
+
+
+_ADAPTER = TypeAdapter(List[Reading])
+
+
+def pydantic_path(rows: List[Dict[str, Any]]) -> bytes:
+    """
+    What list_readings used to do: build a Reading per row, then let the
+    response_model validate and serialize the list again.
+    """
+    models = _ADAPTER.validate_python([Reading(**row) for row in rows])
+    return render_json(_ADAPTER.dump_python(models, mode="json"))
+
+
+def fast_path(rows: List[Dict[str, Any]]) -> bytes:
+    return render_readings(rows)
+
+
+def bench(
+    fn: Callable[[List[Dict[str, Any]]], bytes], rows: List[Any], n: int
+) -> float:
+    """
+    Best-of-5 seconds per call.
+    """
+    return min(timeit.repeat(lambda: fn(rows), number=n, repeat=5)) / n
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--number", type=int, default=50)
+    return parser
+
+
+def main() -> int:
+    args = build_parser().parse_args()
+    rows = make_rows(args.rows)
+
+    if fast_path(rows) != pydantic_path(rows):
+        print("ERROR: fast path output differs from pydantic path")
+        return 1
+
+    slow = bench(pydantic_path, rows, args.number)
+    fast = bench(fast_path, rows, args.number)
+
+    print(f"rows:          {args.rows}")
+    print(f"pydantic path: {slow * 1000:8.3f} ms/request")
+    print(f"fast path:     {fast * 1000:8.3f} ms/request")
+    print(f"speedup:       {slow / fast:8.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,49 @@
+# filename: tests/api/test_aggregate.py
+
+from datetime import datetime, timedelta, timezone
+
+from app.models import GeigerRecord
+from app.sqlite_store import insert_record
+
+
+START = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def test_aggregate_returns_rollup_buckets(store_client, api_store):
+    for minute, cpm in [(0, 10), (1, 20), (59, 30), (60, 40), (61, 60)]:
+        insert_record(
+            api_store.db_path,
+            GeigerRecord(
+                id=None,
+                raw="RAW",
+                counts_per_second=1,
+                counts_per_minute=cpm,
+                microsieverts_per_hour=cpm / 100,
+                mode="SLOW",
+                device_id="dev",
+                timestamp=START + timedelta(minutes=minute),
+            ),
+        )
+
+    response = store_client.get("/readings/aggregate", params={"resolution": "hour"})
+
+    assert response.status_code == 200
+    data = response.json()
+    assert [b["bucket"] for b in data] == [
+        "2025-01-01T00:00:00+00:00",
+        "2025-01-01T01:00:00+00:00",
+    ]
+    assert data[0]["count"] == 3
+    assert data[0]["cpm"] == {"min": 10.0, "max": 30.0, "avg": 20.0}
+    assert data[1]["usv"]["avg"] == 0.5
+
+    response = store_client.get(
+        "/readings/aggregate",
+        params={"resolution": "minute", "since": "2025-01-01T00:59:00Z"},
+    )
+    assert [b["count"] for b in response.json()] == [1, 1, 1]
+
+
+def test_aggregate_rejects_unknown_resolution(store_client):
+    response = store_client.get("/readings/aggregate", params={"resolution": "day"})
+    assert response.status_code == 422
@@ -0,0 +1,75 @@
+# filename: tests/api/test_conditional_get.py
+
+from datetime import datetime, timezone
+
+from app.models import GeigerRecord
+from app.sqlite_store import insert_record
+
+
+def _insert(db_path, cpm):
+    insert_record(
+        db_path,
+        GeigerRecord(
+            id=None,
+            raw=f"cpm {cpm}",
+            counts_per_second=cpm // 60,
+            counts_per_minute=cpm,
+            microsieverts_per_hour=0.01,
+            mode="SLOW",
+            device_id="dev",
+            timestamp=datetime.now(timezone.utc),
+        ),
+    )
+
+
+def test_latest_returns_304_for_matching_etag(store_client, api_store):
+    _insert(api_store.db_path, 60)
+
+    first = store_client.get("/readings/latest")
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+
+    second = store_client.get("/readings/latest", headers={"If-None-Match": etag})
+    assert second.status_code == 304
+    assert second.content == b""
+    assert second.headers["ETag"] == etag
+
+
+def test_etag_changes_when_new_reading_arrives(store_client, api_store):
+    _insert(api_store.db_path, 60)
+    etag = store_client.get("/readings?limit=5").headers["ETag"]
+
+    _insert(api_store.db_path, 120)
+
+    response = store_client.get("/readings?limit=5", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert [r["cpm"] for r in response.json()] == [120.0, 60.0]
+
+
+def test_unchanged_data_served_from_cache(store_client, api_store, monkeypatch):
+    _insert(api_store.db_path, 60)
+
+    calls = []
+    original = api_store.get_recent_readings
+
+    def counting(limit):
+        calls.append(limit)
+        return original(limit=limit)
+
+    monkeypatch.setattr(api_store, "get_recent_readings", counting)
+
+    first = store_client.get("/readings?limit=3")
+    second = store_client.get("/readings?limit=3")
+
+    assert first.content == second.content
+    assert calls == [3]
+
+
+def test_cached_body_matches_plain_serialization(store_client, api_store):
+    _insert(api_store.db_path, 60)
+
+    data = store_client.get("/readings?limit=1").json()
+
+    assert data[0]["cpm"] == 60.0
+    assert set(data[0]) == {"id", "timestamp", "cps", "cpm", "mode", "raw"}
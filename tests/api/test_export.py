@@ -0,0 +1,88 @@
+# filename: tests/api/test_export.py
+
+import csv
+import io
+import json
+from datetime import datetime, timedelta, timezone
+
+import app.api as api
+from app.models import GeigerRecord
+from app.sqlite_store import insert_record
+
+
+START = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def _seed(db_path, minutes):
+    for m in range(minutes):
+        insert_record(
+            db_path,
+            GeigerRecord(
+                id=None,
+                raw=f"line, {m}",
+                counts_per_second=m,
+                counts_per_minute=m * 60,
+                microsieverts_per_hour=0.01,
+                mode="SLOW",
+                device_id="dev",
+                timestamp=START + timedelta(minutes=m),
+            ),
+        )
+
+
+def test_ndjson_export_streams_all_rows_in_chunks(store_client, api_store, monkeypatch):
+    _seed(api_store.db_path, 7)
+    monkeypatch.setattr(api, "EXPORT_CHUNK_SIZE", 3)
+
+    response = store_client.get("/readings/export")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [r["counts_per_minute"] for r in rows] == [m * 60 for m in range(7)]
+    assert list(rows[0]) == list(api.EXPORT_COLUMNS)
+    assert rows[0]["raw"] == "line, 0"
+
+
+def test_csv_export_honours_time_range(store_client, api_store):
+    _seed(api_store.db_path, 10)
+
+    response = store_client.get(
+        "/readings/export",
+        params={
+            "format": "csv",
+            "since": "2025-01-01T00:02:00Z",
+            "until": "2025-01-01T00:05:00Z",
+        },
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert "readings.csv" in response.headers["content-disposition"]
+
+    rows = list(csv.reader(io.StringIO(response.text)))
+    assert rows[0] == list(api.EXPORT_COLUMNS)
+    assert [r[7] for r in rows[1:]] == ["line, 2", "line, 3", "line, 4"]
+
+
+def test_export_rejects_inverted_range(store_client):
+    response = store_client.get(
+        "/readings/export",
+        params={"since": "2025-01-02T00:00:00Z", "until": "2025-01-01T00:00:00Z"},
+    )
+
+    assert response.status_code == 400
+
+
+def test_suspended_exports_do_not_hold_read_connections(api_store):
+    _seed(api_store.db_path, 5)
+    size = api_store.pool.size
+
+    # More half-read exports than the pool has connections
+    exports = [api_store.iter_readings(chunk_size=2) for _ in range(size + 1)]
+    for export in exports:
+        assert len(next(export)) == 2
+
+    assert api_store.get_latest_reading()["cpm"] == 4 * 60
+    for export in exports:
+        assert sum(len(rows) for rows in export) == 3
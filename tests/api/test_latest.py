@@ -7,3 +7,35 @@ def test_latest_not_found_when_empty(client):
 
     data = response.json()
     assert data["detail"] == "No readings available"
+
+
+def test_latest_served_from_fresh_snapshot(store_client, tmp_path):
+    from app.api import app, get_snapshot_reader
+    from app.snapshot import SnapshotReader, SnapshotWriter
+
+    path = str(tmp_path / "snap.bin")
+    writer = SnapshotWriter(path)
+    writer.publish(
+        {
+            "latest": {
+                "id": 42,
+                "timestamp": "2025-01-01T00:00:00+00:00",
+                "cps": 3,
+                "cpm": 180,
+                "usv": 0.1,
+                "mode": "SLOW",
+                "raw": "CPS, 3, CPM, 180, uSv/hr, 0.10, SLOW",
+            }
+        }
+    )
+    app.dependency_overrides[get_snapshot_reader] = lambda: SnapshotReader(path)
+    try:
+        response = store_client.get("/readings/latest")
+    finally:
+        app.dependency_overrides.pop(get_snapshot_reader, None)
+        writer.close()
+
+    # The database is empty, so this can only come from the snapshot
+    assert response.status_code == 200
+    assert response.json()["id"] == 42
+    assert response.json()["cpm"] == 180.0
@@ -1,4 +1,9 @@
-# no import — pytest fixture "client" is provided automatically
+# pytest fixtures "client" and "store_client" are provided automatically
+
+from datetime import datetime, timezone
+
+from app.models import GeigerRecord
+from app.sqlite_store import insert_record, mark_records_pushed
 
 
 def test_metrics_shape(client):
@@ -9,3 +14,54 @@ def test_metrics_shape(client):
     assert "ingested_count" in data
     assert "uptime_seconds" in data
     assert "version" in data
+
+
+def test_metrics_reports_counters_and_push_backlog(store_client, api_store):
+    for _ in range(3):
+        insert_record(
+            api_store.db_path,
+            GeigerRecord(
+                id=None,
+                raw="RAW",
+                counts_per_second=1,
+                counts_per_minute=60,
+                microsieverts_per_hour=0.1,
+                mode="SLOW",
+                device_id="dev",
+                timestamp=datetime(2025, 1, 1, tzinfo=timezone.utc),
+            ),
+        )
+    mark_records_pushed(api_store.db_path, [1])
+
+    data = store_client.get("/metrics").json()
+
+    assert data["ingested_count"] == 3
+    assert data["pushed_count"] == 1
+    assert data["unpushed_count"] == 2
+    assert data["last_ingested_at"] == "2025-01-01T00:00:00+00:00"
+
+
+def test_prometheus_metrics_exposition(store_client, api_store):
+    insert_record(
+        api_store.db_path,
+        GeigerRecord(
+            id=None,
+            raw="RAW",
+            counts_per_second=1,
+            counts_per_minute=60,
+            microsieverts_per_hour=0.1,
+            mode="SLOW",
+            device_id="dev",
+            timestamp=datetime.now(timezone.utc),
+        ),
+    )
+
+    response = store_client.get("/metrics/prometheus")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    lines = response.text.splitlines()
+    assert "pilog_api_readings_stored 1" in lines
+    assert "pilog_api_readings_unpushed 1" in lines
+    assert "# TYPE pilog_api_db_query_seconds histogram" in lines
+    assert any(line.startswith("pilog_api_db_query_seconds_count ") for line in lines)
@@ -0,0 +1,47 @@
+# filename: tests/api/test_overload.py
+
+import asyncio
+import threading
+import time
+
+from app.api import app, get_db_executor
+from app.db_executor import DBExecutor
+
+
+def test_slow_queries_get_503_while_health_stays_responsive(store_client, api_store):
+    release = threading.Event()
+    db = DBExecutor(max_workers=1, max_queue=0, timeout=0.2)
+    app.dependency_overrides[get_db_executor] = lambda: db
+
+    # Occupy the only DB worker with a stuck query
+    stuck = threading.Thread(
+        target=lambda: asyncio.run(db.run(release.wait, timeout=10.0))
+    )
+    stuck.start()
+    while db.running == 0:
+        time.sleep(0.01)
+
+    try:
+        busy = store_client.get("/readings")
+
+        started = time.monotonic()
+        health = store_client.get("/health")
+        elapsed = time.monotonic() - started
+    finally:
+        release.set()
+        stuck.join()
+        app.dependency_overrides.pop(get_db_executor, None)
+        db.shutdown()
+
+    assert busy.status_code == 503
+    assert busy.headers["Retry-After"] == "1"
+    assert health.status_code == 200
+    assert health.json()["db"]["status"] == "error"
+    assert elapsed < 1.0
+
+
+def test_metrics_report_db_executor_stats(store_client):
+    data = store_client.get("/metrics").json()
+
+    assert data["db_executor"]["max_workers"] >= 1
+    assert data["db_executor"]["rejected"] >= 0
@@ -0,0 +1,73 @@
+# filename: tests/api/test_readings_range.py
+
+from datetime import datetime, timedelta, timezone
+
+from app.models import GeigerRecord
+from app.sqlite_store import insert_record
+
+
+START = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def _seed(db_path, minutes):
+    for m in range(minutes):
+        insert_record(
+            db_path,
+            GeigerRecord(
+                id=None,
+                raw=f"line {m}",
+                counts_per_second=m,
+                counts_per_minute=m * 60,
+                microsieverts_per_hour=0.01,
+                mode="SLOW",
+                device_id="dev",
+                timestamp=START + timedelta(minutes=m),
+            ),
+        )
+
+
+def test_readings_filtered_by_time_range(store_client, api_store):
+    _seed(api_store.db_path, 10)
+
+    response = store_client.get(
+        "/readings",
+        params={
+            "since": "2025-01-01T00:03:00Z",
+            "until": "2025-01-01T00:06:00+00:00",
+        },
+    )
+
+    assert response.status_code == 200
+    assert [r["cps"] for r in response.json()] == [5, 4, 3]
+    assert "X-Next-Cursor" not in response.headers
+
+
+def test_readings_cursor_pages_through_range(store_client, api_store):
+    _seed(api_store.db_path, 10)
+    params = {"since": "2025-01-01T00:02:00Z", "limit": 3}
+
+    seen = []
+    while True:
+        response = store_client.get("/readings", params=params)
+        assert response.status_code == 200
+        seen.extend(r["cps"] for r in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+        params["cursor"] = cursor
+
+    assert seen == [9, 8, 7, 6, 5, 4, 3, 2]
+
+
+def test_readings_rejects_invalid_cursor(store_client):
+    response = store_client.get("/readings", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
+
+
+def test_readings_without_range_keep_newest_first(store_client, api_store):
+    _seed(api_store.db_path, 3)
+
+    response = store_client.get("/readings", params={"limit": 2})
+
+    assert [r["cps"] for r in response.json()] == [2, 1]
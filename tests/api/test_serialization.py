@@ -0,0 +1,46 @@
+# filename: tests/api/test_serialization.py
+
+from typing import List
+
+from pydantic import TypeAdapter
+
+from app.api import Reading, render_json, render_readings
+
+
+ROWS = [
+    {
+        "id": 1,
+        "timestamp": "2025-01-01T00:00:00+00:00",
+        "cps": 3,
+        "cpm": 180,
+        "mode": "SLOW",
+        "raw": "CPS, 3, CPM, 180, uSv/hr, 0.10, SLOW",
+    },
+    {
+        "id": 2,
+        "timestamp": "2025-01-01T00:00:01+00:00",
+        "cps": 0,
+        "cpm": 1234567,
+        "mode": "INST",
+        "raw": 'quoted "raw" \\ line µSv',
+    },
+    {
+        "id": 3,
+        "timestamp": "2025-01-01T00:00:02+00:00",
+        "cps": 1.5,
+        "cpm": 90.25,
+        "mode": "FAST",
+        "raw": None,
+    },
+]
+
+
+def _pydantic_path(rows):
+    adapter = TypeAdapter(List[Reading])
+    models = adapter.validate_python([Reading(**row) for row in rows])
+    return render_json(adapter.dump_python(models, mode="json"))
+
+
+def test_fast_path_matches_pydantic_wire_format():
+    assert render_readings(ROWS) == _pydantic_path(ROWS)
+    assert render_readings([]) == _pydantic_path([]) == b"[]"
@@ -0,0 +1,78 @@
+# filename: tests/api/test_stats.py
+
+from datetime import datetime, timedelta, timezone
+
+from app.models import GeigerRecord
+from app.sqlite_store import insert_record
+
+
+START = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def _seed(db_path, cpms, step_seconds=60):
+    for i, cpm in enumerate(cpms):
+        insert_record(
+            db_path,
+            GeigerRecord(
+                id=None,
+                raw="RAW",
+                counts_per_second=1,
+                counts_per_minute=cpm,
+                microsieverts_per_hour=cpm / 100,
+                mode="SLOW",
+                device_id="dev",
+                timestamp=START + timedelta(seconds=i * step_seconds),
+            ),
+        )
+
+
+def test_stats_buckets_with_percentiles(store_client, api_store):
+    # 10 readings in the first 10 minutes, 2 in the next bucket
+    _seed(api_store.db_path, [10, 1, 9, 2, 8, 3, 7, 4, 6, 5, 100, 200])
+
+    response = store_client.get(
+        "/readings/stats",
+        params={
+            "since": "2025-01-01T00:00:00Z",
+            "until": "2025-01-01T01:00:00Z",
+            "bucket_seconds": 600,
+        },
+    )
+
+    assert response.status_code == 200
+    first, second = response.json()
+
+    assert first["bucket"] == "2025-01-01T00:00:00+00:00"
+    assert first["count"] == 10
+    assert first["cpm"] == {
+        "avg": 5.5,
+        "min": 1.0,
+        "max": 10.0,
+        "p50": 5.0,
+        "p90": 9.0,
+        "p99": 10.0,
+    }
+    assert first["usv"]["p50"] == 0.05
+
+    assert second["bucket"] == "2025-01-01T00:10:00+00:00"
+    assert second["count"] == 2
+    assert second["cpm"]["p50"] == 100.0
+    assert second["cpm"]["p99"] == 200.0
+
+
+def test_stats_rejects_inverted_or_oversized_windows(store_client):
+    inverted = store_client.get(
+        "/readings/stats",
+        params={"since": "2025-01-02T00:00:00Z", "until": "2025-01-01T00:00:00Z"},
+    )
+    assert inverted.status_code == 400
+
+    oversized = store_client.get(
+        "/readings/stats",
+        params={
+            "since": "2020-01-01T00:00:00Z",
+            "until": "2025-01-01T00:00:00Z",
+            "bucket_seconds": 1,
+        },
+    )
+    assert oversized.status_code == 400
@@ -0,0 +1,53 @@
+# filename: tests/api/test_stream.py
+
+import asyncio
+
+from app.api import render_reading, stream_events
+from app.broadcast import ReadingBroadcaster
+
+
+class _Request:
+    async def is_disconnected(self):
+        return False
+
+
+class _Source:
+    def data_version(self):
+        return (1, 0)
+
+    def get_readings_after(self, after_id, limit):
+        return []
+
+
+def test_stream_yields_reading_events_until_closed():
+    row = {
+        "id": 5,
+        "timestamp": "2025-01-01T00:00:00+00:00",
+        "cps": 1,
+        "cpm": 60,
+        "mode": "SLOW",
+        "raw": "line",
+    }
+
+    async def scenario():
+        broadcaster = ReadingBroadcaster(render_reading, poll_interval=60)
+        sub = broadcaster.subscribe(_Source())
+        events = stream_events(_Request(), broadcaster, sub)
+
+        frames = [await events.__anext__()]
+        broadcaster.publish(row)
+        frames.append(await events.__anext__())
+        await broadcaster.close()
+        frames.extend([f async for f in events])
+        return broadcaster, frames
+
+    broadcaster, frames = asyncio.run(scenario())
+
+    assert frames[0].startswith("retry: ")
+    assert frames[1] == (
+        "id: 5\nevent: reading\n"
+        'data: {"id":5,"timestamp":"2025-01-01T00:00:00+00:00",'
+        '"cps":1.0,"cpm":60.0,"mode":"SLOW","raw":"line"}\n\n'
+    )
+    assert len(frames) == 2
+    assert broadcaster.subscriber_count == 0
@@ -6,7 +6,7 @@ import pytest
 from unittest.mock import MagicMock, patch
 from fastapi.testclient import TestClient
 
-from app.api import app, get_store
+from app.api import Store, app, get_store
 from app.settings import Settings
 from app.sqlite_store import initialize_db, insert_record
 from app.ingestion.api_client import PushClient
@@ -73,12 +73,15 @@ def db_with_records(temp_db):
 
 @pytest.fixture
 def push_client(tmp_path):
-    return PushClient(
+    client = PushClient(
         api_url="http://example.com",
         api_token="TOKEN",
         device_id="TEST-DEVICE",
         db_path=str(tmp_path / "test.db"),
     )
+    yield client
+    # Stops the BatchWriter flush thread and closes its SQLite connection
+    client.close()
 
 
 # ---------------------------------------------------------------------------
@@ -167,6 +170,15 @@ class _TestStore:
         finally:
             conn.close()
 
+    def data_version(self):
+        conn = sqlite3.connect(self.db_path)
+        try:
+            return conn.execute(
+                "SELECT COUNT(*), COALESCE(MAX(id), 0) FROM geiger_readings"
+            ).fetchone()
+        finally:
+            conn.close()
+
     def count_readings(self):
         conn = sqlite3.connect(self.db_path)
         try:
@@ -175,6 +187,24 @@ class _TestStore:
         finally:
             conn.close()
 
+    def get_counters(self):
+        conn = sqlite3.connect(self.db_path)
+        try:
+            total, pushed, unpushed, last = conn.execute(
+                """
+                SELECT total, pushed, unpushed, last_ingested_at
+                FROM geiger_counters WHERE id = 1
+                """
+            ).fetchone()
+            return {
+                "total": total,
+                "pushed": pushed,
+                "unpushed": unpushed,
+                "last_ingested_at": last,
+            }
+        finally:
+            conn.close()
+
 
 @pytest.fixture
 def client(tmp_path, monkeypatch):
@@ -186,3 +216,24 @@ def client(tmp_path, monkeypatch):
 
     app.dependency_overrides[get_store] = override_get_store
     return TestClient(app)
+
+
+# ---------------------------------------------------------------------------
+# API CLIENT BACKED BY THE REAL STORE
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture
+def api_store(tmp_path):
+    db_path = str(tmp_path / "api_store.db")
+    initialize_db(db_path)
+    store = Store(db_path)
+    yield store
+    store.close()
+
+
+@pytest.fixture
+def store_client(api_store):
+    app.dependency_overrides[get_store] = lambda: api_store
+    yield TestClient(app)
+    app.dependency_overrides.pop(get_store, None)
@@ -0,0 +1,287 @@
+# filename: tests/integration/test_async_pipeline.py
+
+import asyncio
+import os
+import pty
+import sqlite3
+import time
+from datetime import datetime, timezone
+
+import pytest
+
+from app.ingestion.async_pipeline import AsyncIngestionPipeline
+from app.ingestion.multi_reader import DeviceSpec
+from app.models import GeigerRecord
+from tests.mocks.mock_ingest_server import MockIngestServer
+
+
+LINE = b"CPS, 9, CPM, 90, uSv/hr, 0.09, FAST\n"
+
+
+@pytest.fixture
+def tty():
+    """
+    A pseudo-terminal standing in for the USB-serial adapter:
+    (master fd, slave path).
+    """
+    master, slave = pty.openpty()
+    yield master, os.ttyname(slave)
+    os.close(master)
+    os.close(slave)
+
+
+def _rows(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute(
+            "SELECT device_id, counts_per_minute, pushed FROM geiger_readings"
+            " ORDER BY id"
+        ).fetchall()
+    finally:
+        conn.close()
+
+
+def _pipeline(temp_db, path, url, **kwargs):
+    return AsyncIngestionPipeline(
+        [DeviceSpec("async-dev", path)],
+        api_url=url,
+        api_token="TOKEN",
+        db_path=temp_db,
+        **kwargs,
+    )
+
+
+async def _drive(pipeline, master, lines, done, timeout=5.0):
+    """
+    Run the pipeline, feed lines through the pty, wait for done() and stop.
+    """
+    task = asyncio.create_task(pipeline.run())
+    await asyncio.sleep(0.05)
+    os.write(master, b"".join(lines))
+
+    deadline = time.monotonic() + timeout
+    while not done() and time.monotonic() < deadline:
+        await asyncio.sleep(0.02)
+
+    pipeline.stop()
+    await asyncio.wait_for(task, timeout)
+
+
+def test_reads_persists_and_pushes_in_one_loop(temp_db, tty):
+    master, path = tty
+    with MockIngestServer() as server:
+        pipeline = _pipeline(temp_db, path, server.url)
+        asyncio.run(
+            _drive(
+                pipeline,
+                master,
+                [LINE, b"garbage\n", LINE],
+                lambda: len(server.requests) == 2,
+            )
+        )
+
+    assert [body["counts_per_minute"] for body in server.requests] == [90, 90]
+    assert server.requests[0]["device_id"] == "async-dev"
+    assert server.headers[0]["Authorization"] == "Bearer TOKEN"
+    # stop() flushed the pushed flags before closing SQLite
+    assert _rows(temp_db) == [("async-dev", 90, 1), ("async-dev", 90, 1)]
+    assert pipeline.ingested == 2
+
+
+def test_batch_push_sends_one_array_per_wakeup(temp_db, tty):
+    master, path = tty
+    with MockIngestServer() as server:
+        pipeline = _pipeline(temp_db, path, server.url, batch_push=True)
+        asyncio.run(
+            _drive(
+                pipeline,
+                master,
+                [LINE] * 5,
+                lambda: sum(len(body) for body in server.requests) == 5,
+            )
+        )
+
+    assert all(isinstance(body, list) for body in server.requests)
+    assert [pushed for _, _, pushed in _rows(temp_db)] == [1] * 5
+
+
+def test_failed_pushes_are_replayed(temp_db, tty):
+    master, path = tty
+    calls = []
+
+    def responder(body):
+        calls.append(body)
+        # Live pushes fail; the backlog replay afterwards succeeds
+        return (503, None) if len(calls) <= 3 else (200, None)
+
+    with MockIngestServer(responder) as server:
+        pipeline = _pipeline(
+            temp_db,
+            path,
+            server.url,
+            replay_interval=0.2,
+            replay_rate_limit=1000.0,
+        )
+        asyncio.run(
+            _drive(
+                pipeline,
+                master,
+                [LINE] * 3,
+                lambda: [p for _, _, p in _rows(temp_db)] == [1] * 3,
+            )
+        )
+
+    assert pipeline.replayed == 3
+    assert [p for _, _, p in _rows(temp_db)] == [1] * 3
+
+
+def _record(record_id):
+    return GeigerRecord(
+        id=record_id,
+        raw="CPS, 9",
+        counts_per_second=9,
+        counts_per_minute=90,
+        microsieverts_per_hour=0.09,
+        mode="FAST",
+        device_id="async-dev",
+        timestamp=datetime.now(timezone.utc),
+    )
+
+
+@pytest.mark.parametrize(
+    "policy, queued",
+    [("spill", [1, 2]), ("drop-oldest", [2, 3])],
+)
+def test_full_push_queue_follows_overflow_policy(temp_db, tty, policy, queued):
+    _, path = tty
+
+    async def scenario(pipeline):
+        try:
+            await pipeline._submit([_record(1), _record(2), _record(3)])
+            return [pipeline._queue.get_nowait().id for _ in range(2)]
+        finally:
+            await pipeline._shutdown()
+
+    pipeline = _pipeline(
+        temp_db,
+        path,
+        "http://127.0.0.1:9/api/readings",
+        push_queue_size=2,
+        push_overflow=policy,
+    )
+
+    assert asyncio.run(scenario(pipeline)) == queued
+    assert pipeline.dropped == 1
+    # The record left out is not shielded from replay
+    assert pipeline._queued_ids == set(queued)
+
+
+def test_block_policy_waits_for_room(temp_db, tty):
+    _, path = tty
+
+    async def scenario(pipeline):
+        try:
+            await pipeline._submit([_record(1)])
+            blocked = asyncio.create_task(pipeline._submit([_record(2)]))
+            await asyncio.sleep(0.05)
+            assert not blocked.done()
+            assert pipeline._queue.get_nowait().id == 1
+            await asyncio.wait_for(blocked, 1.0)
+            return pipeline._queue.get_nowait().id
+        finally:
+            await pipeline._shutdown()
+
+    pipeline = _pipeline(
+        temp_db,
+        path,
+        "http://127.0.0.1:9/api/readings",
+        push_queue_size=1,
+        push_overflow="block",
+    )
+
+    assert asyncio.run(scenario(pipeline)) == 2
+    assert pipeline.dropped == 0
+
+
+def test_blocked_batch_is_shielded_from_replay(temp_db, tty):
+    _, path = tty
+
+    async def scenario(pipeline):
+        try:
+            blocked = asyncio.create_task(
+                pipeline._submit([_record(1), _record(2), _record(3)])
+            )
+            await asyncio.sleep(0.05)
+            # Waiting for room for 2: 2 and 3 must not be replayed meanwhile
+            assert not blocked.done()
+            assert pipeline._queued_ids == {1, 2, 3}
+            ids = []
+            while len(ids) < 3:
+                ids.append((await asyncio.wait_for(pipeline._queue.get(), 1.0)).id)
+            await asyncio.wait_for(blocked, 1.0)
+            return ids
+        finally:
+            await pipeline._shutdown()
+
+    pipeline = _pipeline(
+        temp_db,
+        path,
+        "http://127.0.0.1:9/api/readings",
+        push_queue_size=1,
+        push_overflow="block",
+    )
+
+    assert asyncio.run(scenario(pipeline)) == [1, 2, 3]
+
+
+def test_cancellation_shuts_down_cleanly(temp_db, tty):
+    master, path = tty
+
+    async def scenario(pipeline):
+        task = asyncio.create_task(pipeline.run())
+        await asyncio.sleep(0.05)
+        os.write(master, LINE)
+        deadline = time.monotonic() + 5.0
+        while pipeline.ingested < 1 and time.monotonic() < deadline:
+            await asyncio.sleep(0.02)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    # Nothing listens on this port: pushes fail, the row stays unpushed
+    pipeline = _pipeline(temp_db, path, "http://127.0.0.1:9/api/readings")
+    asyncio.run(scenario(pipeline))
+
+    assert _rows(temp_db) == [("async-dev", 90, 0)]
+    assert pipeline.sources[0].reader.ser is None
+
+
+def test_missing_device_node_is_polled_until_it_appears(temp_db, tty, tmp_path):
+    master, path = tty
+    # udev-style node that does not exist yet
+    node = tmp_path / "ttyUSB0"
+
+    async def scenario(pipeline, server):
+        task = asyncio.create_task(pipeline.run())
+        await asyncio.sleep(0.1)
+        source = pipeline.sources[0]
+        assert source.reader.ser is None
+        assert source.reopens == 0
+
+        os.symlink(path, node)
+        deadline = time.monotonic() + 5.0
+        while source.reader.ser is None and time.monotonic() < deadline:
+            await asyncio.sleep(0.02)
+        os.write(master, LINE)
+        while not server.requests and time.monotonic() < deadline:
+            await asyncio.sleep(0.02)
+
+        pipeline.stop()
+        await asyncio.wait_for(task, 5.0)
+
+    with MockIngestServer() as server:
+        pipeline = _pipeline(temp_db, str(node), server.url, path_poll_seconds=0.02)
+        asyncio.run(scenario(pipeline, server))
+
+    assert [body["counts_per_minute"] for body in server.requests] == [90]
+    assert pipeline.sources[0].reopens == 0
@@ -0,0 +1,132 @@
+# filename: tests/integration/test_batch_push.py
+
+import sqlite3
+import time
+from datetime import datetime, timezone
+
+from app.ingestion.api_client import PushClient
+from app.models import GeigerRecord
+from tests.mocks.mock_ingest_server import MockIngestServer
+
+
+PARSED = {
+    "raw": "CPS, 9, CPM, 90, uSv/hr, 0.09, FAST",
+    "cps": 9,
+    "cpm": 90,
+    "usv": 0.09,
+    "mode": "FAST",
+}
+
+
+def _records(n):
+    return [
+        GeigerRecord(
+            id=i + 1,
+            raw=PARSED["raw"],
+            counts_per_second=i,
+            counts_per_minute=i * 60,
+            microsieverts_per_hour=0.01 * i,
+            mode="FAST",
+            device_id="TEST-DEVICE",
+            timestamp=datetime(2025, 1, 1, tzinfo=timezone.utc),
+        )
+        for i in range(n)
+    ]
+
+
+def _client(temp_db, url, **kwargs):
+    return PushClient(
+        api_url=url,
+        api_token="TOKEN",
+        device_id="TEST-DEVICE",
+        db_path=temp_db,
+        batch_push=True,
+        **kwargs,
+    )
+
+
+def _pushed_ids(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        rows = conn.execute(
+            "SELECT id FROM geiger_readings WHERE pushed = 1 ORDER BY id"
+        ).fetchall()
+        return [r[0] for r in rows]
+    finally:
+        conn.close()
+
+
+def test_batch_push_sends_arrays_split_by_count(temp_db):
+    with MockIngestServer() as server:
+        client = _client(temp_db, server.url, max_batch_records=2)
+        try:
+            accepted = client._push_batch(_records(5))
+        finally:
+            client.close()
+
+    assert accepted == [1, 2, 3, 4, 5]
+    assert [len(body) for body in server.requests] == [2, 2, 1]
+    assert server.requests[0][1]["counts_per_minute"] == 60
+    assert server.headers[0]["Authorization"] == "Bearer TOKEN"
+
+
+def test_batch_push_respects_byte_budget(temp_db):
+    with MockIngestServer() as server:
+        client = _client(temp_db, server.url, max_batch_bytes=400)
+        try:
+            accepted = client._push_batch(_records(10))
+        finally:
+            client.close()
+
+    assert accepted == list(range(1, 11))
+    assert len(server.requests) > 1
+    assert sum(len(body) for body in server.requests) == 10
+
+
+def test_batch_push_returns_only_accepted_positions(temp_db):
+    def responder(body):
+        return 207, {
+            "accepted": [
+                i for i, p in enumerate(body) if p["counts_per_second"] % 2 == 0
+            ]
+        }
+
+    with MockIngestServer(responder) as server:
+        client = _client(temp_db, server.url)
+        try:
+            accepted = client._push_batch(_records(5))
+        finally:
+            client.close()
+
+    assert accepted == [1, 3, 5]
+
+
+def test_batch_push_failure_accepts_nothing(temp_db):
+    with MockIngestServer(lambda body: (503, None)) as server:
+        client = _client(temp_db, server.url)
+        try:
+            assert client._push_batch(_records(3)) == []
+        finally:
+            client.close()
+
+
+def test_worker_marks_only_accepted_rows_pushed(temp_db):
+    def responder(body):
+        return 200, {
+            "accepted": [i for i, p in enumerate(body) if p["counts_per_second"] != 13]
+        }
+
+    with MockIngestServer(responder) as server:
+        client = _client(temp_db, server.url, commit_max_latency=0.05)
+        client.start()
+        try:
+            for cps in (11, 12, 13, 14):
+                client.handle_record({**PARSED, "cps": cps})
+
+            deadline = time.monotonic() + 3.0
+            while len(_pushed_ids(temp_db)) < 3 and time.monotonic() < deadline:
+                time.sleep(0.02)
+        finally:
+            client.close()
+
+    assert _pushed_ids(temp_db) == [1, 2, 4]
@@ -0,0 +1,184 @@
+# filename: tests/integration/test_multi_device_reader.py
+
+import os
+import pty
+import sqlite3
+import time
+
+import pytest
+
+from app.ingestion.api_client import PushClient
+from app.ingestion.multi_reader import (
+    DeviceSpec,
+    MultiDeviceReader,
+    parse_device_specs,
+)
+
+
+@pytest.fixture
+def ptys():
+    """
+    Two pseudo-terminals standing in for USB-serial adapters:
+    (master fd, slave path) per device.
+    """
+    pairs = []
+    for _ in range(2):
+        master, slave = pty.openpty()
+        pairs.append((master, slave, os.ttyname(slave)))
+    yield [(master, path) for master, _, path in pairs]
+    for master, slave, _ in pairs:
+        os.close(master)
+        os.close(slave)
+
+
+def _poll_until(reader, handled, count, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while len(handled) < count and time.monotonic() < deadline:
+        reader.poll(timeout=0.05)
+
+
+def test_parse_device_specs():
+    assert parse_device_specs(["/dev/ttyUSB0"], "pi") == [
+        DeviceSpec("pi", "/dev/ttyUSB0")
+    ]
+    assert parse_device_specs(["a=/dev/ttyUSB0", "/dev/ttyUSB1"], "pi") == [
+        DeviceSpec("a", "/dev/ttyUSB0"),
+        DeviceSpec("pi-ttyUSB1", "/dev/ttyUSB1"),
+    ]
+    with pytest.raises(ValueError):
+        parse_device_specs(["a=/dev/ttyUSB0", "a=/dev/ttyUSB1"], "pi")
+    with pytest.raises(ValueError):
+        parse_device_specs(["=/dev/ttyUSB0"], "pi")
+
+
+def test_reads_all_devices_in_one_loop(ptys):
+    (m1, p1), (m2, p2) = ptys
+    reader = MultiDeviceReader(
+        [DeviceSpec("alpha", p1), DeviceSpec("beta", p2)],
+        dead_threshold_seconds=30.0,
+    )
+    handled = []
+    reader.set_handler(handled.append)
+
+    try:
+        reader.poll(timeout=0)
+        assert reader.open_devices == ["alpha", "beta"]
+
+        os.write(m1, b"CPS, 1, CPM, 60, uSv/hr, 0.01, SLOW\r\nCPS, 2, CPM, 61, uS")
+        os.write(m2, b"garbage\r\nCPS, 7, CPM, 70, uSv/hr, 0.07, FAST\r\n")
+        _poll_until(reader, handled, 2)
+        os.write(m1, b"v/hr, 0.02, SLOW\r\n")
+        _poll_until(reader, handled, 3)
+    finally:
+        reader.close()
+
+    assert sorted((p["device_id"], p["cps"]) for p in handled) == [
+        ("alpha", 1),
+        ("alpha", 2),
+        ("beta", 7),
+    ]
+
+
+def test_silent_device_is_reopened_without_blocking_others(ptys):
+    (m1, p1), (m2, p2) = ptys
+    reader = MultiDeviceReader(
+        [DeviceSpec("alpha", p1), DeviceSpec("beta", p2)],
+        dead_threshold_seconds=0.2,
+        reopen_sleep_seconds=0.1,
+    )
+    handled = []
+    reader.set_handler(handled.append)
+
+    try:
+        reader.poll(timeout=0)
+        deadline = time.monotonic() + 1.0
+        while time.monotonic() < deadline:
+            os.write(m2, b"CPS, 7, CPM, 70, uSv/hr, 0.07, FAST\r\n")
+            reader.poll(timeout=0.05)
+    finally:
+        reader.close()
+
+    alpha, beta = reader._devices
+    assert alpha.reopens >= 1
+    assert beta.reopens == 0
+    assert {p["device_id"] for p in handled} == {"beta"}
+
+
+def test_push_client_stores_parsed_device_id(temp_db):
+    client = PushClient(
+        api_url="http://example.invalid/ingest",
+        api_token="",
+        device_id="gateway",
+        db_path=temp_db,
+    )
+    parsed = {"raw": "r", "cps": 1, "cpm": 60, "usv": 0.01, "mode": "SLOW"}
+    try:
+        client.handle_record(dict(parsed, device_id="alpha"))
+        client.handle_record(parsed)
+    finally:
+        client.close()
+
+    conn = sqlite3.connect(temp_db)
+    try:
+        rows = conn.execute("SELECT device_id FROM geiger_readings ORDER BY id")
+        assert [r[0] for r in rows] == ["alpha", "gateway"]
+    finally:
+        conn.close()
+
+
+def test_missing_device_node_is_polled_until_it_appears(ptys, tmp_path):
+    (m1, p1), (_, p2) = ptys
+    # udev-style node that does not exist yet
+    node = tmp_path / "ttyUSB1"
+    reader = MultiDeviceReader(
+        [DeviceSpec("alpha", p1), DeviceSpec("beta", str(node))],
+        dead_threshold_seconds=30.0,
+        path_poll_seconds=0.02,
+    )
+    handled = []
+    reader.set_handler(handled.append)
+    beta = reader._devices[1]
+
+    try:
+        reader.poll(timeout=0)
+        os.write(m1, b"CPS, 1, CPM, 60, uSv/hr, 0.01, SLOW\r\n")
+        _poll_until(reader, handled, 1)
+        # No open attempts while the node is missing, alpha unaffected
+        assert reader.open_devices == ["alpha"]
+        assert [p["device_id"] for p in handled] == ["alpha"]
+
+        os.symlink(p2, node)
+        deadline = time.monotonic() + 5.0
+        while len(reader.open_devices) < 2 and time.monotonic() < deadline:
+            reader.poll(timeout=0.05)
+        assert reader.open_devices == ["alpha", "beta"]
+    finally:
+        reader.close()
+
+    assert beta.reopens == 0
+
+
+def test_failed_opens_back_off(ptys, tmp_path):
+    (_, p1), _ = ptys
+    # Exists, but is not a tty: every open fails
+    broken = tmp_path / "ttyUSB1"
+    broken.touch()
+    reader = MultiDeviceReader(
+        [DeviceSpec("alpha", p1), DeviceSpec("beta", str(broken))],
+        dead_threshold_seconds=30.0,
+        reopen_sleep_seconds=0.05,
+        max_backoff_seconds=10.0,
+    )
+
+    try:
+        deadline = time.monotonic() + 0.6
+        while time.monotonic() < deadline:
+            reader.poll(timeout=0.05)
+    finally:
+        reader.close()
+
+    alpha, beta = reader._devices
+    # A fixed 0.05 s retry would have made about 12 attempts
+    assert 2 <= beta.reopens <= 6
+    assert beta.backoff.attempts == beta.reopens
+    assert alpha.reopens == 0
@@ -0,0 +1,142 @@
+# filename: tests/integration/test_staged_pipeline.py
+
+import sqlite3
+import threading
+import time
+
+from app import metrics
+from app.ingestion.api_client import PushClient
+from app.ingestion.staged_pipeline import StagedPipeline
+from tests.mocks.mock_ingest_server import MockIngestServer
+
+
+LINE = b"CPS, 9, CPM, 90, uSv/hr, 0.09, FAST"
+
+
+class ListSource:
+    """
+    FrameSource that returns one burst of frames, then idles.
+    """
+
+    def __init__(self, frames):
+        self._frames = list(frames)
+
+    def read_frames(self):
+        frames, self._frames = self._frames, []
+        if not frames:
+            time.sleep(0.01)
+        return frames
+
+
+def _client(temp_db, url, **kwargs):
+    return PushClient(
+        api_url=url,
+        api_token="TOKEN",
+        device_id="staged",
+        db_path=temp_db,
+        **kwargs,
+    )
+
+
+def _pushed(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        return [r[0] for r in conn.execute("SELECT pushed FROM geiger_readings")]
+    finally:
+        conn.close()
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return predicate()
+
+
+def test_frames_flow_through_every_stage(temp_db):
+    items = {
+        stage: metrics.STAGE_ITEMS.labels(stage).value
+        for stage in metrics.PIPELINE_STAGES
+    }
+
+    with MockIngestServer() as server:
+        client = _client(temp_db, server.url)
+        pipeline = StagedPipeline(ListSource([LINE, b"garbage", LINE, LINE]), client)
+        client.start()
+        pipeline.start()
+        try:
+            assert _wait_for(lambda: len(server.requests) == 3)
+        finally:
+            pipeline.close()
+            client.close()
+
+    assert _pushed(temp_db) == [1, 1, 1]
+    assert server.requests[0]["device_id"] == "staged"
+
+    processed = {
+        stage: metrics.STAGE_ITEMS.labels(stage).value - items[stage]
+        for stage in metrics.PIPELINE_STAGES
+    }
+    assert processed == {"read": 4, "parse": 4, "persist": 3, "push": 3}
+
+
+def test_spill_keeps_every_reading_while_persist_stalls(temp_db):
+    gate = threading.Event()
+
+    with MockIngestServer() as server:
+        client = _client(temp_db, server.url)
+        handle_record = client.handle_record
+
+        def slow_handle_record(parsed):
+            gate.wait(5.0)
+            handle_record(parsed)
+
+        client.handle_record = slow_handle_record
+        pipeline = StagedPipeline(
+            ListSource([LINE] * 20),
+            client,
+            queue_size=2,
+            overflow_policy="spill",
+            batch_size=1,
+        )
+        pipeline.start()
+        try:
+            # The stalled persist stage never held more than its queue
+            assert _wait_for(
+                lambda: pipeline.parse_q.spilled + pipeline.persist_q.spilled >= 15
+            )
+            assert pipeline.persist_q.qsize() <= 2
+        finally:
+            gate.set()
+            pipeline.close()
+            client.close()
+
+    # Spilled readings went straight to SQLite, unpushed, for replay
+    assert len(_pushed(temp_db)) == 20
+
+
+def test_drop_oldest_bounds_memory(temp_db):
+    gate = threading.Event()
+
+    with MockIngestServer() as server:
+        client = _client(temp_db, server.url)
+        client.handle_record = lambda parsed: gate.wait(5.0)
+        pipeline = StagedPipeline(
+            ListSource([LINE] * 20),
+            client,
+            queue_size=2,
+            overflow_policy="drop-oldest",
+            batch_size=1,
+        )
+        pipeline.start()
+        try:
+            # At most 2 queued per stage plus one item in each stage's hands
+            assert _wait_for(
+                lambda: pipeline.parse_q.dropped + pipeline.persist_q.dropped >= 14
+            )
+            assert pipeline.parse_q.qsize() <= 2
+            assert pipeline.persist_q.qsize() <= 2
+        finally:
+            gate.set()
+            pipeline.close()
+            client.close()
@@ -0,0 +1,91 @@
+# filename: tests/integration/test_watchdog_reconnect.py
+
+import os
+import pty
+import sqlite3
+import time
+
+from app.ingestion.api_client import PushClient
+from app.ingestion.serial_reader import SerialReader
+from app.ingestion.watchdog import WatchdogSerialReader
+from app.models import GeigerRecord
+from tests.mocks.mock_ingest_server import MockIngestServer
+
+
+def _unpushed(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute(
+            "SELECT COUNT(*) FROM geiger_readings WHERE pushed = 0"
+        ).fetchone()[0]
+    finally:
+        conn.close()
+
+
+PARSED = {
+    "raw": "CPS, 9, CPM, 90, uSv/hr, 0.09, FAST",
+    "cps": 9,
+    "cpm": 90,
+    "usv": 0.09,
+    "mode": "FAST",
+}
+
+
+def test_backlog_drains_while_device_is_gone_then_port_reappears(
+    tmp_path, db_with_records
+):
+    db_path = db_with_records(
+        [GeigerRecord.from_parsed(PARSED, device_id="pi-log") for _ in range(5)]
+    )
+    # udev-style node that does not exist yet
+    device = tmp_path / "ttyUSB0"
+
+    reader = SerialReader(str(device), timeout=0.05, buffered=True)
+    watchdog = WatchdogSerialReader(
+        reader,
+        dead_threshold_seconds=30.0,
+        reopen_sleep_seconds=0.05,
+        path_poll_seconds=0.02,
+    )
+    master, slave = pty.openpty()
+
+    with MockIngestServer() as server:
+        client = PushClient(
+            api_url=server.url,
+            api_token="TOKEN",
+            device_id="pi-log",
+            db_path=db_path,
+            replay_rate_limit=1000.0,
+        )
+        client.start()
+        try:
+            # Port missing: every read returns promptly, nothing blocks
+            deadline = time.monotonic() + 5.0
+            while _unpushed(db_path) and time.monotonic() < deadline:
+                started = time.monotonic()
+                assert watchdog.read_frames() == []
+                assert time.monotonic() - started < 0.5
+            assert _unpushed(db_path) == 0
+            assert not watchdog.connected
+
+            # The adapter comes back
+            os.symlink(os.ttyname(slave), device)
+            deadline = time.monotonic() + 5.0
+            while not watchdog.connected and time.monotonic() < deadline:
+                watchdog.read_frames()
+            os.write(master, b"CPS, 9, CPM, 90, uSv/hr, 0.09, FAST\n")
+
+            frames = []
+            while not frames and time.monotonic() < deadline:
+                frames = watchdog.read_frames()
+        finally:
+            client.close()
+            if reader.ser is not None:
+                reader.ser.close()
+            os.close(master)
+            os.close(slave)
+
+    assert frames == [b"CPS, 9, CPM, 90, uSv/hr, 0.09, FAST"]
+    assert watchdog.connected
+    assert watchdog.reconnects == 1
+    assert len(server.requests) == 5
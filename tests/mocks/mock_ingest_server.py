@@ -0,0 +1,63 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class MockIngestServer:
+    """
+    Local stand-in for the Beamwarden ingest endpoint, served over real HTTP
+    on 127.0.0.1 with an ephemeral port.
+
+    Every POST body is decoded and appended to `requests`. The response is
+    produced by `responder(body) -> (status, payload)`; by default every
+    request is answered 200 with no body.
+
+    Usage:
+        with MockIngestServer() as server:
+            client = PushClient(api_url=server.url, ...)
+    """
+
+    def __init__(self, responder=None):
+        self.requests = []
+        self.headers = []
+        self.responder = responder or (lambda body: (200, None))
+
+        owner = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                body = json.loads(self.rfile.read(length) or b"null")
+                owner.requests.append(body)
+                owner.headers.append(dict(self.headers))
+
+                status, payload = owner.responder(body)
+                data = b"" if payload is None else json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self._thread = threading.Thread(
+            target=self._server.serve_forever,
+            kwargs={"poll_interval": 0.05},
+            daemon=True,
+        )
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/api/readings"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
@@ -0,0 +1,185 @@
+# filename: tests/unit/test_batch_parser.py
+
+import math
+import random
+
+import pytest
+
+from app.ingestion.batch_parser import (
+    INVALID_MODE,
+    iter_geiger_file,
+    parse_geiger_csv_many,
+    parse_geiger_file,
+)
+from app.ingestion.csv_parser import parse_geiger_bytes
+
+
+def _lines_of(data):
+    """
+    Reference split: (start offset, line) for every non-blank line.
+    """
+    out = []
+    pos = 0
+    for line in data.split(b"\n"):
+        if line.strip():
+            out.append((pos, line))
+        pos += len(line) + 1
+    return out
+
+
+def _assert_matches_reference(data, cols):
+    expected = _lines_of(data)
+    assert len(cols) == len(expected)
+
+    invalid = []
+    for i, (start, line) in enumerate(expected):
+        ref = parse_geiger_bytes(line)
+        assert cols.starts[i] == start
+        assert cols.ends[i] == start + len(line)
+        if ref is None:
+            assert cols.valid[i] == 0, line
+            assert cols.mode[i] == INVALID_MODE
+            invalid.append(start)
+            continue
+        assert cols.valid[i] == 1, line
+        assert cols.cps[i] == ref["cps"]
+        assert cols.cpm[i] == ref["cpm"]
+        if math.isnan(ref["usv"]):
+            assert math.isnan(cols.usv[i])
+        else:
+            assert cols.usv[i] == ref["usv"]
+        assert cols.mode_name(i) == ref["mode"]
+        assert cols.raw(i) == ref["raw"]
+
+    assert list(cols.invalid_offsets) == invalid
+
+
+def test_parses_buffer_into_columns():
+    data = (
+        b"CPS, 9, CPM, 90, uSv/hr, 0.09, FAST\r\n"
+        b"garbage\r\n"
+        b"\r\n"
+        b"CPS, 1, CPM, 60, uSv/hr, 0.01, SLOW\r\n"
+        b"CPS, 2, CPM, 61, uSv/hr, 0.02, FAST"
+    )
+    cols = parse_geiger_csv_many(data)
+
+    assert len(cols) == 4
+    assert cols.valid_count == 3
+    assert list(cols.valid) == [1, 0, 1, 1]
+    assert list(cols.cps) == [9, 0, 1, 2]
+    assert list(cols.cpm) == [90, 0, 60, 61]
+    assert list(cols.usv) == [0.09, 0.0, 0.01, 0.02]
+    assert cols.mode_names == ["FAST", "SLOW"]
+    assert list(cols.mode) == [0, INVALID_MODE, 1, 0]
+    assert list(cols.invalid_offsets) == [data.index(b"garbage")]
+    assert cols.raw(0) == "CPS, 9, CPM, 90, uSv/hr, 0.09, FAST"
+
+
+def test_matches_parse_geiger_bytes_per_line():
+    rng = random.Random(4321)
+    alphabet = (
+        b"0123456789 ,.-+eE_CPSMuSv/hrFASTLOWIN\t\r\x0b\x0c\x1c\x1f\x00\xff\xc2\xa0"
+    )
+    base = b"CPS, 19, CPM, 1140, uSv/hr, 0.12, SLOW\r"
+
+    lines = []
+    for _ in range(5000):
+        line = bytearray(base)
+        for _ in range(rng.randint(0, 4)):
+            op = rng.random()
+            pos = rng.randrange(len(line) + 1)
+            char = alphabet[rng.randrange(len(alphabet))]
+            if op < 0.4 and pos < len(line):
+                line[pos] = char
+            elif op < 0.7:
+                line.insert(pos, char)
+            elif pos < len(line):
+                del line[pos]
+        lines.append(bytes(line))
+    data = b"\n".join(lines)
+
+    _assert_matches_reference(data, parse_geiger_csv_many(data))
+
+
+@pytest.mark.parametrize(
+    "line",
+    [
+        b"CPS, 9, CPM, 90, uSv/hr, 0.09, FAST\r",
+        b"CPS,9,CPM,90,uSv/hr,0.09,SLOW",
+        b"  CPS, -9, CPM, +90, uSv/hr, 1e-3, INST  ",
+        b"CPS, 1_000, CPM, 90, uSv/hr, nan, FAST",
+        b"\x1fCPS, 9, CPM, 90, uSv/hr, 0.09, FAST",
+        b"CPS, 9, CPM, 90, uSv/hr, 0.09, FAST\x1c",
+        b"CPS, 9, CPM, 90, uSv/hr, 0.09, \x1eFAST",
+        b", 9, CPM, 90, uSv/hr, 0.09, FAST",
+        b"CPS, 9, CPM, 90, uSv/hr, 0.09, F A S T",
+        b"CPS, 9.5, CPM, 90, uSv/hr, 0.09, FAST",
+        b"CPS, 9, CPM, 90, uSv/hr, 0.09, FAST, extra",
+        b"CPS, 9, CPM, 90, uSv/hr, 0.09",
+    ],
+)
+def test_uniform_blocks_match_parse_geiger_bytes(line):
+    # A buffer of one repeated line is a candidate for the columnar path
+    data = b"\n".join([line] * 50)
+    _assert_matches_reference(data, parse_geiger_csv_many(data))
+
+
+def test_counts_outside_int64_are_invalid():
+    data = b"CPS, " + b"9" * 30 + b", CPM, 90, uSv/hr, 0.09, FAST\n"
+    cols = parse_geiger_csv_many(data)
+
+    assert parse_geiger_bytes(data.rstrip()) is not None
+    assert list(cols.valid) == [0]
+    assert list(cols.invalid_offsets) == [0]
+
+
+def test_base_offset_shifts_reported_offsets():
+    cols = parse_geiger_csv_many(b"bad\nCPS, 1, CPM, 2, uSv/hr, 0.1, FAST\n", 100)
+
+    assert list(cols.starts) == [100, 104]
+    assert list(cols.invalid_offsets) == [100]
+    assert cols.raw(1) == "CPS, 1, CPM, 2, uSv/hr, 0.1, FAST"
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, 1 << 20])
+def test_file_chunks_have_absolute_offsets_and_stable_codes(tmp_path, chunk_size):
+    lines = []
+    for i in range(200):
+        mode = (b"FAST", b"SLOW", b"INST")[i % 3]
+        if i % 17 == 0:
+            lines.append(b"corrupted line %d" % i)
+        else:
+            lines.append(
+                b"CPS, %d, CPM, %d, uSv/hr, 0.%02d, %s\r" % (i, i * 60, i % 100, mode)
+            )
+    data = b"\n".join(lines) + b"\n"
+    path = tmp_path / "capture.log"
+    path.write_bytes(data)
+
+    chunks = list(iter_geiger_file(str(path), chunk_size))
+    assert all(len(c.data) <= max(chunk_size, 64) for c in chunks)
+    for cols in chunks:
+        for i in range(len(cols)):
+            start = cols.starts[i]
+            line = data[start : cols.ends[i]]
+            assert cols.raw(i) == line.decode().strip()
+
+    whole = parse_geiger_file(str(path), chunk_size)
+    assert len(whole) == 200
+    assert list(whole.invalid_offsets) == [
+        start for start, line in _lines_of(data) if line.startswith(b"corrupted")
+    ]
+    assert [whole.mode_names[whole.mode[i]] for i in (1, 2, 3)] == [
+        "SLOW",
+        "INST",
+        "FAST",
+    ]
+
+
+def test_empty_file_yields_nothing(tmp_path):
+    path = tmp_path / "empty.log"
+    path.write_bytes(b"")
+
+    assert list(iter_geiger_file(str(path))) == []
+    assert len(parse_geiger_file(str(path))) == 0
@@ -0,0 +1,116 @@
+# filename: tests/unit/test_batch_writer.py
+
+import sqlite3
+import time
+
+import pytest
+
+from app.ingestion.batch_writer import BatchWriter
+
+
+PARSED = {
+    "raw": "CPS, 9, CPM, 90, uSv/hr, 0.09, FAST",
+    "cps": 9,
+    "cpm": 90,
+    "usv": 0.09,
+    "mode": "FAST",
+}
+
+
+def _count_committed(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        (count,) = conn.execute("SELECT COUNT(*) FROM geiger_readings").fetchone()
+        return count
+    finally:
+        conn.close()
+
+
+def test_inserts_are_committed_once_batch_size_is_reached(temp_db):
+    writer = BatchWriter(temp_db, max_batch_size=3, max_latency_seconds=60.0)
+    try:
+        ids = [writer.insert(PARSED, "dev") for _ in range(2)]
+        assert ids == [1, 2]
+        assert _count_committed(temp_db) == 0
+
+        writer.insert(PARSED, "dev")
+        assert _count_committed(temp_db) == 3
+
+        stats = writer.stats
+        assert stats.commits == 1
+        assert stats.last_batch_size == 3
+    finally:
+        writer.close()
+
+
+def test_inserts_and_pushed_updates_share_one_transaction(temp_db):
+    writer = BatchWriter(temp_db, max_batch_size=100, max_latency_seconds=60.0)
+    row_id = writer.insert(PARSED, "dev")
+    writer.mark_records_pushed([row_id])
+    writer.close()
+
+    conn = sqlite3.connect(temp_db)
+    try:
+        (pushed,) = conn.execute(
+            "SELECT pushed FROM geiger_readings WHERE id = ?", (row_id,)
+        ).fetchone()
+    finally:
+        conn.close()
+
+    assert pushed == 1
+    assert writer.stats.commits == 1
+    assert writer.stats.statements == 2
+
+
+def test_pending_writes_are_committed_after_max_latency(temp_db):
+    writer = BatchWriter(temp_db, max_batch_size=100, max_latency_seconds=0.05)
+    try:
+        writer.insert(PARSED, "dev")
+
+        deadline = time.monotonic() + 2.0
+        while _count_committed(temp_db) == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        assert _count_committed(temp_db) == 1
+        assert writer.pending == 0
+    finally:
+        writer.close()
+
+
+def test_close_flushes_and_rejects_further_writes(temp_db):
+    writer = BatchWriter(temp_db, max_batch_size=100, max_latency_seconds=60.0)
+    writer.insert(PARSED, "dev")
+    writer.close()
+    writer.close()
+
+    assert _count_committed(temp_db) == 1
+    with pytest.raises(RuntimeError):
+        writer.insert(PARSED, "dev")
+
+
+def test_on_commit_sees_the_newest_committed_reading(temp_db):
+    committed = []
+
+    def on_commit(record):
+        # Called only once the row is visible to other connections
+        committed.append(
+            (record.id, record.counts_per_minute, _count_committed(temp_db))
+        )
+
+    writer = BatchWriter(
+        temp_db, max_batch_size=3, max_latency_seconds=60.0, on_commit=on_commit
+    )
+    try:
+        writer.insert(PARSED, "dev")
+        writer.insert({**PARSED, "cpm": 91}, "dev")
+        assert committed == []
+
+        writer.flush()
+        assert committed == [(2, 91, 2)]
+
+        # Commits without inserts publish nothing new
+        writer.mark_records_pushed([1])
+        writer.flush()
+        assert committed == [(2, 91, 2)]
+    finally:
+        writer.close()
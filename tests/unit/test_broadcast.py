@@ -0,0 +1,139 @@
+# filename: tests/unit/test_broadcast.py
+
+import asyncio
+import json
+from datetime import datetime, timezone
+
+from app.broadcast import ReadingBroadcaster
+from app.db_executor import DBExecutor
+from app.models import GeigerRecord
+from app.sqlite_store import insert_record
+
+
+def _render(row):
+    return json.dumps(row).encode()
+
+
+class _StaticSource:
+    def data_version(self):
+        return (1, 0)
+
+    def get_readings_after(self, after_id, limit):
+        return []
+
+
+def test_publish_fans_out_to_all_subscribers():
+    async def scenario():
+        broadcaster = ReadingBroadcaster(_render, poll_interval=60)
+        a = broadcaster.subscribe(_StaticSource())
+        b = broadcaster.subscribe(_StaticSource())
+
+        assert broadcaster.publish({"id": 7}) == 2
+        frames = [await a.get(), await b.get()]
+        await broadcaster.close()
+        return frames
+
+    frames = asyncio.run(scenario())
+
+    assert frames[0] == frames[1] == 'id: 7\nevent: reading\ndata: {"id": 7}\n\n'
+
+
+def test_slow_subscriber_dropped_when_buffer_full():
+    async def scenario():
+        broadcaster = ReadingBroadcaster(_render, buffer_size=2, poll_interval=60)
+        slow = broadcaster.subscribe(_StaticSource())
+        fast = broadcaster.subscribe(_StaticSource())
+
+        for i in range(3):
+            broadcaster.publish({"id": i})
+            await fast.get()
+
+        received = [await slow.get() for _ in range(3)]
+        count = broadcaster.subscriber_count
+        await broadcaster.close()
+        return broadcaster, received, count
+
+    broadcaster, received, count = asyncio.run(scenario())
+
+    # Two buffered frames, then the end-of-stream marker
+    assert received[2] is None
+    assert [f.split("\n")[0] for f in received[:2]] == ["id: 0", "id: 1"]
+    assert broadcaster.dropped == 1
+    assert count == 1
+
+
+def test_poller_streams_rows_committed_after_subscribe(api_store):
+    def insert(cpm):
+        insert_record(
+            api_store.db_path,
+            GeigerRecord(
+                id=None,
+                raw=f"cpm {cpm}",
+                counts_per_second=1,
+                counts_per_minute=cpm,
+                microsieverts_per_hour=0.01,
+                mode="SLOW",
+                device_id="dev",
+                timestamp=datetime.now(timezone.utc),
+            ),
+        )
+
+    insert(60)
+
+    async def scenario():
+        broadcaster = ReadingBroadcaster(_render, poll_interval=0.01)
+        sub = broadcaster.subscribe(api_store)
+        await asyncio.sleep(0.05)
+        await asyncio.to_thread(insert, 120)
+        frame = await asyncio.wait_for(sub.get(), timeout=2.0)
+        broadcaster.unsubscribe(sub)
+        return frame
+
+    frame = asyncio.run(scenario())
+
+    data = json.loads(frame.split("data: ", 1)[1])
+    assert data["cpm"] == 120
+    assert frame.startswith(f"id: {data['id']}\n")
+
+
+def test_poller_queries_through_run_db(api_store):
+    db = DBExecutor(max_workers=1, max_queue=0)
+
+    async def scenario():
+        broadcaster = ReadingBroadcaster(_render, poll_interval=0.01, run_db=db.run)
+        sub = broadcaster.subscribe(api_store)
+        await asyncio.sleep(0.1)
+        broadcaster.unsubscribe(sub)
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        db.shutdown()
+
+    assert db.stats()["completed"] >= 2
+
+
+def test_poller_survives_failing_first_data_version():
+    class FlakySource:
+        def __init__(self):
+            self.calls = 0
+
+        def data_version(self):
+            self.calls += 1
+            if self.calls == 1:
+                raise RuntimeError("database is locked")
+            return (1, 0) if self.calls == 2 else (2, 0)
+
+        def get_readings_after(self, after_id, limit):
+            return [{"id": 1, "cpm": 90}] if after_id == 0 else []
+
+    async def scenario():
+        broadcaster = ReadingBroadcaster(_render, poll_interval=0.01)
+        sub = broadcaster.subscribe(FlakySource())
+        frame = await asyncio.wait_for(sub.get(), timeout=2.0)
+        broadcaster.unsubscribe(sub)
+        return frame
+
+    frame = asyncio.run(scenario())
+
+    assert frame.startswith("id: 1\n")
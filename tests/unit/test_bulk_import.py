@@ -0,0 +1,221 @@
+# filename: tests/unit/test_bulk_import.py
+
+import sqlite3
+from datetime import datetime, timezone
+
+import pytest
+
+from app.api import EXPORT_COLUMNS, encode_export
+from app.ingestion import bulk_import
+from app.ingestion.bulk_import import (
+    DEFERRED_INDEXES,
+    DEFERRED_TRIGGERS,
+    detect_format,
+    import_file,
+)
+from app.rollups import rebuild_rollups
+
+
+START = datetime(2025, 1, 1, 10, 0, tzinfo=timezone.utc)
+
+
+def _capture(tmp_path, count=300, bad_every=50, name="capture.log"):
+    lines = []
+    for i in range(count):
+        if i % bad_every == 7:
+            lines.append(b"CPS, garbage")
+        else:
+            lines.append(
+                b"CPS, %d, CPM, %d, uSv/hr, 0.%02d, SLOW\r" % (i, i * 60, i % 100)
+            )
+    path = tmp_path / name
+    path.write_bytes(b"\n".join(lines) + b"\n")
+    return path
+
+
+def _query(db_path, sql, args=()):
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute(sql, args).fetchall()
+    finally:
+        conn.close()
+
+
+def _schema_objects(db_path):
+    return {name for (name,) in _query(db_path, "SELECT name FROM sqlite_master")}
+
+
+def _rollups(db_path):
+    return _query(db_path, "SELECT * FROM geiger_rollup_minute ORDER BY bucket")
+
+
+def test_imports_raw_capture_with_synthesized_timestamps(temp_db, tmp_path):
+    path = _capture(tmp_path)
+    data = path.read_bytes()
+
+    result = import_file(temp_db, str(path), "dev-1", start=START, chunk_bytes=1024)
+
+    assert result.format == "raw"
+    assert result.imported == 294
+    assert result.invalid == 6
+    assert result.invalid_offsets[0] == data.index(b"CPS, garbage")
+
+    rows = _query(
+        temp_db,
+        "SELECT counts_per_second, timestamp, device_id, pushed, raw "
+        "FROM geiger_readings ORDER BY id",
+    )
+    assert rows[0] == (
+        0,
+        "2025-01-01T10:00:00+00:00",
+        "dev-1",
+        1,
+        "CPS, 0, CPM, 0, uSv/hr, 0.00, SLOW",
+    )
+    # Line 8 follows the invalid line 7, so it keeps its own second
+    assert rows[7][:2] == (8, "2025-01-01T10:00:08+00:00")
+
+
+def test_restores_indexes_triggers_rollups_and_counters(temp_db, tmp_path):
+    path = _capture(tmp_path)
+
+    import_file(temp_db, str(path), "dev-1", start=START, pushed=False)
+
+    objects = _schema_objects(temp_db)
+    assert set(DEFERRED_INDEXES) <= objects
+    assert set(DEFERRED_TRIGGERS) <= objects
+
+    assert _query(temp_db, "SELECT total, pushed, unpushed FROM geiger_counters") == [
+        (294, 0, 294)
+    ]
+    imported = _rollups(temp_db)
+    rebuild_rollups(temp_db)
+    assert imported == _rollups(temp_db)
+    assert sum(row[1] for row in imported) == 294
+
+
+def test_interrupted_import_resumes_without_duplicates(temp_db, tmp_path, monkeypatch):
+    path = _capture(tmp_path)
+    real_chunks = bulk_import._raw_chunks
+
+    def interrupted(*args, **kwargs):
+        for n, chunk in enumerate(real_chunks(*args, **kwargs)):
+            if n == 3:
+                raise KeyboardInterrupt
+            yield chunk
+
+    monkeypatch.setattr(bulk_import, "_raw_chunks", interrupted)
+    with pytest.raises(KeyboardInterrupt):
+        import_file(temp_db, str(path), "dev-1", start=START, chunk_bytes=512)
+
+    partial = _query(temp_db, "SELECT COUNT(*) FROM geiger_readings")[0][0]
+    assert 0 < partial < 294
+    # The interrupted run still left the schema and counters consistent
+    assert set(DEFERRED_TRIGGERS) <= _schema_objects(temp_db)
+    assert _query(temp_db, "SELECT total FROM geiger_counters") == [(partial,)]
+
+    monkeypatch.setattr(bulk_import, "_raw_chunks", real_chunks)
+    result = import_file(temp_db, str(path), "dev-1", start=START, chunk_bytes=512)
+
+    assert result.resumed_from > 0
+    timestamps = [
+        ts for (ts,) in _query(temp_db, "SELECT timestamp FROM geiger_readings")
+    ]
+    assert len(timestamps) == len(set(timestamps)) == 294
+
+    again = import_file(temp_db, str(path), "dev-1", start=START)
+    assert again.skipped
+    assert _query(temp_db, "SELECT COUNT(*) FROM geiger_readings") == [(294,)]
+
+
+def test_restart_replaces_earlier_rows(temp_db, tmp_path):
+    path = _capture(tmp_path, count=10)
+    import_file(temp_db, str(path), "dev-1", start=START)
+    later = START.replace(hour=12)
+
+    result = import_file(temp_db, str(path), "dev-1", start=later, restart=True)
+
+    assert result.imported == 9
+    assert _query(temp_db, "SELECT MIN(timestamp), COUNT(*) FROM geiger_readings") == [
+        ("2025-01-01T12:00:00+00:00", 9)
+    ]
+    assert _query(temp_db, "SELECT total FROM geiger_counters") == [(9,)]
+
+
+def test_resume_rejects_different_start_or_interval(temp_db, tmp_path, monkeypatch):
+    path = _capture(tmp_path)
+    real_chunks = bulk_import._raw_chunks
+
+    def interrupted(*args, **kwargs):
+        for n, chunk in enumerate(real_chunks(*args, **kwargs)):
+            if n == 1:
+                raise KeyboardInterrupt
+            yield chunk
+
+    monkeypatch.setattr(bulk_import, "_raw_chunks", interrupted)
+    with pytest.raises(KeyboardInterrupt):
+        import_file(temp_db, str(path), "dev-1", start=START, chunk_bytes=512)
+    monkeypatch.setattr(bulk_import, "_raw_chunks", real_chunks)
+
+    with pytest.raises(ValueError, match="partially imported"):
+        import_file(temp_db, str(path), "dev-1", start=START.replace(hour=11))
+    with pytest.raises(ValueError, match="partially imported"):
+        import_file(temp_db, str(path), "dev-1", start=START, interval=2.0)
+
+    result = import_file(temp_db, str(path), "dev-1", start=START)
+    assert result.resumed_from > 0
+    assert _query(temp_db, "SELECT COUNT(*) FROM geiger_readings") == [(294,)]
+
+
+def test_cli_continues_timestamps_across_raw_captures(temp_db, tmp_path, monkeypatch):
+    first = _capture(tmp_path, count=5, name="a.log")
+    second = _capture(tmp_path, count=5, name="b.log")
+    argv = ["bulk_import", "--db", temp_db, "--device-id", "dev-1"]
+    argv += ["--start", START.isoformat(), "--interval", "2", str(first), str(second)]
+    monkeypatch.setattr("sys.argv", argv)
+
+    assert bulk_import.main() == 0
+
+    timestamps = [
+        ts for (ts,) in _query(temp_db, "SELECT timestamp FROM geiger_readings")
+    ]
+    assert timestamps[4:6] == ["2025-01-01T10:00:08+00:00", "2025-01-01T10:00:10+00:00"]
+    assert len(set(timestamps)) == 10
+
+
+def test_imports_csv_export(temp_db, tmp_path):
+    rows = [
+        (
+            i,
+            f"2025-01-01T10:00:{i:02d}+00:00",
+            i,
+            i * 60,
+            i / 100,
+            "FAST",
+            "dev-2",
+            f"L{i}",
+        )
+        for i in range(1, 21)
+    ]
+    body = b"".join(encode_export(iter([rows[:10], rows[10:]]), "csv"))
+    body += b"not,a,reading\n"
+    path = tmp_path / "export.csv"
+    path.write_bytes(body)
+
+    assert detect_format(str(path)) == "csv"
+    result = import_file(temp_db, str(path), "fallback", chunk_bytes=256)
+
+    assert result.imported == 20
+    assert result.invalid_offsets == [body.index(b"not,a,reading")]
+    stored = _query(
+        temp_db,
+        f"SELECT {', '.join(EXPORT_COLUMNS[1:])} FROM geiger_readings ORDER BY id",
+    )
+    assert stored == [row[1:] for row in rows]
+
+
+def test_raw_import_requires_start(temp_db, tmp_path):
+    path = _capture(tmp_path)
+
+    with pytest.raises(ValueError):
+        import_file(temp_db, str(path), "dev-1")
@@ -0,0 +1,74 @@
+# filename: tests/unit/test_counters.py
+
+import sqlite3
+from datetime import datetime, timedelta, timezone
+
+from app.models import GeigerRecord
+from app.sqlite_store import SCHEMA, initialize_db, insert_record, mark_records_pushed
+
+
+START = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def _record(minute, pushed=False):
+    return GeigerRecord(
+        id=None,
+        raw="RAW",
+        counts_per_second=1,
+        counts_per_minute=60,
+        microsieverts_per_hour=0.1,
+        mode="SLOW",
+        device_id="dev",
+        timestamp=START + timedelta(minutes=minute),
+        pushed=pushed,
+    )
+
+
+def _counters(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute(
+            "SELECT total, pushed, unpushed, last_ingested_at FROM geiger_counters"
+        ).fetchall()
+    finally:
+        conn.close()
+
+
+def test_counters_follow_inserts_updates_and_deletes(temp_db):
+    for minute in (2, 0, 1):
+        insert_record(temp_db, _record(minute))
+    insert_record(temp_db, _record(3, pushed=True))
+
+    assert _counters(temp_db) == [(4, 1, 3, (START + timedelta(minutes=3)).isoformat())]
+
+    mark_records_pushed(temp_db, [1, 2, 4])  # 4 is already pushed
+    assert _counters(temp_db)[0][:3] == (4, 3, 1)
+
+    conn = sqlite3.connect(temp_db)
+    conn.execute("DELETE FROM geiger_readings WHERE id IN (1, 3)")
+    conn.commit()
+    conn.close()
+
+    assert _counters(temp_db)[0][:3] == (2, 2, 0)
+
+
+def test_counters_are_seeded_from_existing_rows(tmp_path):
+    db_path = str(tmp_path / "legacy.db")
+    conn = sqlite3.connect(db_path)
+    conn.executescript(SCHEMA)
+    conn.executemany(
+        """
+        INSERT INTO geiger_readings (
+            raw, counts_per_second, counts_per_minute, microsieverts_per_hour,
+            mode, device_id, timestamp, pushed
+        ) VALUES ('RAW', 1, 60, 0.1, 'SLOW', 'dev', ?, ?)
+        """,
+        [("2025-01-01T00:00:00+00:00", 1), ("2025-01-02T00:00:00+00:00", 0)],
+    )
+    conn.commit()
+    conn.close()
+
+    initialize_db(db_path)
+    initialize_db(db_path)
+
+    assert _counters(db_path) == [(2, 1, 1, "2025-01-02T00:00:00+00:00")]
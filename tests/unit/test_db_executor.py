@@ -0,0 +1,82 @@
+# filename: tests/unit/test_db_executor.py
+
+import asyncio
+import threading
+
+import pytest
+
+from app.db_executor import DBExecutor, DBExecutorFull, DBQueryTimeout
+
+
+def test_run_returns_result_and_counts_completion():
+    db = DBExecutor(max_workers=2, max_queue=0)
+    try:
+        assert asyncio.run(db.run(lambda a, b: a + b, 2, b=3)) == 5
+        assert db.stats()["completed"] == 1
+    finally:
+        db.shutdown()
+
+
+def test_rejects_when_workers_and_queue_are_busy():
+    release = threading.Event()
+    db = DBExecutor(max_workers=1, max_queue=1, timeout=5.0)
+
+    async def scenario():
+        first = asyncio.ensure_future(db.run(release.wait))
+        second = asyncio.ensure_future(db.run(release.wait))
+        await asyncio.sleep(0.05)
+        try:
+            with pytest.raises(DBExecutorFull):
+                await db.run(lambda: None)
+            stats = db.stats()
+        finally:
+            release.set()
+        await asyncio.gather(first, second)
+        return stats
+
+    try:
+        stats = asyncio.run(scenario())
+    finally:
+        db.shutdown()
+
+    assert stats["running"] == 1
+    assert stats["queue_depth"] == 1
+    assert stats["rejected"] == 1
+
+
+def test_timeout_keeps_slot_until_query_returns():
+    release = threading.Event()
+    db = DBExecutor(max_workers=1, max_queue=0)
+
+    async def scenario():
+        with pytest.raises(DBQueryTimeout):
+            await db.run(release.wait, timeout=0.05)
+        busy = db.running
+        release.set()
+        await asyncio.sleep(0.05)
+        return busy
+
+    try:
+        busy = asyncio.run(scenario())
+    finally:
+        db.shutdown()
+
+    assert busy == 1
+    assert db.running == 0
+    assert db.stats()["timeouts"] == 1
+
+
+def test_builtin_timeout_from_the_query_is_not_a_query_timeout():
+    db = DBExecutor(max_workers=1, max_queue=0)
+
+    def exhausted():
+        raise TimeoutError("No SQLite read connection available")
+
+    try:
+        with pytest.raises(TimeoutError, match="No SQLite read connection"):
+            asyncio.run(db.run(exhausted))
+    finally:
+        db.shutdown()
+
+    assert db.stats()["timeouts"] == 0
+    assert db.stats()["failed"] == 1
@@ -0,0 +1,63 @@
+# filename: tests/unit/test_frame_buffer.py
+
+import pytest
+
+from app.ingestion.frame_buffer import FrameBuffer
+
+
+def _feed(buf, data):
+    view = buf.writable(len(data))
+    view[: len(data)] = data
+    buf.commit(len(data))
+
+
+def test_splits_complete_frames_and_keeps_partial():
+    buf = FrameBuffer(64)
+    _feed(buf, b"CPS, 1\r\nCPS, 2\r\nCP")
+
+    assert buf.frames() == [b"CPS, 1\r", b"CPS, 2\r"]
+    assert buf.pending == 2
+
+    _feed(buf, b"S, 3\r\n")
+    assert buf.frames() == [b"CPS, 3\r"]
+    assert buf.pending == 0
+    assert buf.frames() == []
+
+
+def test_compacts_partial_frame_when_tail_is_full():
+    buf = FrameBuffer(16)
+    _feed(buf, b"0123456789\nabcd")
+    assert buf.frames() == [b"0123456789"]
+
+    # Only 1 byte left at the tail: the partial frame moves to the front
+    view = buf.writable(8)
+    assert len(view) == 8
+    view[:4] = b"ef\nx"
+    buf.commit(4)
+
+    assert buf.frames() == [b"abcdef"]
+    assert buf.pending == 1
+
+
+def test_frame_longer_than_buffer_is_returned_as_overflow():
+    buf = FrameBuffer(8)
+    _feed(buf, b"garbage!")
+
+    assert buf.frames() == [b"garbage!"]
+    assert buf.overflows == 1
+    assert buf.pending == 0
+
+
+def test_clear_drops_partial_frame():
+    buf = FrameBuffer(32)
+    _feed(buf, b"half a fr")
+    buf.clear()
+    _feed(buf, b"whole\n")
+
+    assert buf.frames() == [b"whole"]
+
+
+def test_commit_rejects_sizes_beyond_capacity():
+    buf = FrameBuffer(4)
+    with pytest.raises(ValueError):
+        buf.commit(5)
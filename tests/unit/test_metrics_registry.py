@@ -0,0 +1,91 @@
+# filename: tests/unit/test_metrics_registry.py
+
+import pytest
+
+from app import metrics
+from app.metrics import Registry
+from app.sqlite_store import initialize_db
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = Registry()
+    hist = registry.histogram("demo_seconds", "Demo.", buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        hist.observe(value)
+
+    lines = registry.render().splitlines()
+
+    assert lines == [
+        "# HELP demo_seconds Demo.",
+        "# TYPE demo_seconds histogram",
+        'demo_seconds_bucket{le="0.1"} 2',
+        'demo_seconds_bucket{le="1"} 3',
+        'demo_seconds_bucket{le="+Inf"} 4',
+        "demo_seconds_sum 3.65",
+        "demo_seconds_count 4",
+    ]
+
+
+def test_counters_and_gauges():
+    registry = Registry()
+    counter = registry.counter("demo_total", "Things.")
+    gauge = registry.gauge("demo_depth", "Depth.")
+    counter.inc()
+    counter.inc(2)
+    gauge.set_function(lambda: 7)
+
+    text = registry.render()
+
+    assert "# TYPE demo_total counter\ndemo_total 3\n" in text
+    assert "# TYPE demo_depth gauge\ndemo_depth 7\n" in text
+    with pytest.raises(ValueError):
+        counter.inc(-1)
+    with pytest.raises(ValueError):
+        registry.counter("demo_total", "Again.")
+
+
+def test_handle_record_records_ingestion_metrics(push_client):
+    initialize_db(push_client.db_path)
+    ingested = metrics.READINGS_INGESTED.value
+    inserts = metrics.INSERT_SECONDS.count
+    try:
+        push_client.handle_record(
+            {"raw": "CPS, 1", "cps": 1, "cpm": 60, "usv": 0.01, "mode": "SLOW"}
+        )
+        push_client._writer.flush()
+    finally:
+        push_client.close()
+
+    assert metrics.READINGS_INGESTED.value == ingested + 1
+    assert metrics.INSERT_SECONDS.count == inserts + 1
+    assert metrics.COMMIT_SECONDS.count >= 1
+    assert "pilog_end_to_end_seconds_bucket" in metrics.REGISTRY.render()
+
+
+def test_families_render_one_series_per_label_value():
+    registry = Registry()
+    items = registry.counter_family("demo_items_total", "Items.", ["stage"])
+    seconds = registry.histogram_family(
+        "demo_seconds", "Demo.", ["stage"], buckets=(1.0,)
+    )
+    items.labels("read").inc(2)
+    items.labels('odd"name').inc()
+    seconds.labels("read").observe(0.5)
+
+    lines = registry.render().splitlines()
+
+    assert lines == [
+        "# HELP demo_items_total Items.",
+        "# TYPE demo_items_total counter",
+        'demo_items_total{stage="read"} 2',
+        'demo_items_total{stage="odd\\"name"} 1',
+        "# HELP demo_seconds Demo.",
+        "# TYPE demo_seconds histogram",
+        'demo_seconds_bucket{stage="read",le="1"} 1',
+        'demo_seconds_bucket{stage="read",le="+Inf"} 1',
+        'demo_seconds_sum{stage="read"} 0.5',
+        'demo_seconds_count{stage="read"} 1',
+    ]
+    assert items.labels("read") is items.labels("read")
+    with pytest.raises(ValueError):
+        items.labels("read", "extra")
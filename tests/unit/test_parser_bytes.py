@@ -0,0 +1,105 @@
+# filename: tests/unit/test_parser_bytes.py
+
+import math
+import random
+
+import pytest
+
+from app.ingestion.csv_parser import parse_geiger_bytes, parse_geiger_csv
+
+
+CORPUS = [
+    b"CPS, 9, CPM, 90, uSv/hr, 0.09, FAST\r\n",
+    b"CPS, 9, CPM, 90, uSv/hr, 0.09, FAST\n",
+    b"CPS, 9, CPM, 90, uSv/hr, 0.09, FAST",
+    b"CPS,9,CPM,90,uSv/hr,0.09,SLOW",
+    b"CPS, 0009, CPM, 090, uSv/hr, 1, INST\r\n",
+    b"   CPS, 9, CPM, 90, uSv/hr, 0.09, FAST   \r\n",
+    b"CPS, 9, CPM, 90, uSv/hr, 0.09, FAST \r\n",
+    b"CPS, -9, CPM, +90, uSv/hr, -0.09, FAST\n",
+    b"CPS, 1_000, CPM, 90, uSv/hr, 1e-3, FAST\n",
+    b"CPS, 9, CPM, 90, uSv/hr, nan, FAST\n",
+    b"CPS, 9, CPM, 90, uSv/hr, inf, FAST\n",
+    b"CPS, 9, CPM, 90, uSv/hr, .5, FAST\n",
+    b"CPS, 9, CPM, 90, uSv/hr, 5., FAST\n",
+    b"CPS, 9.5, CPM, 90, uSv/hr, 0.09, FAST\n",
+    b"CPS, 9, CPM, 90, uSv/hr, 0.09, \n",
+    b"CPS, 9, CPM, 90, uSv/hr, 0.09\n",
+    b"CPS, 9, CPM, 90, uSv/hr, 0.09, FAST, extra\n",
+    b"CPS, 9, CPM, 90, uSv/hr, 0.09, F A S T\n",
+    b"X, 9, Y, 90, Z, 0.09, FAST\n",
+    b"CPS, \xd9\xa9, CPM, 90, uSv/hr, 0.09, FAST\n",
+    b"CPS, 9, CPM, 90, uSv/hr, 0.09, FAST\xff\n",
+    b"\xef\xbb\xbfCPS, 9, CPM, 90, uSv/hr, 0.09, FAST\n",
+    b"CPS, 9, CPM, 90, uSv/hr, 0.09, FAST\x1c\n",
+    b"\x1fCPS, 9, CPM, 90, uSv/hr, 0.09, FAST\n",
+    b"CPS, 9\x1d, CPM, 90, uSv/hr, 0.09, FAST\n",
+    b"CPS, 9, CPM, 90, uSv/hr, 0.09, \x1eFAST\n",
+    b"CPS, 9, CPM, 90, uSv/hr, 0.09, FA\x1eST\n",
+    b"CPS, \x0b9\x0c, CPM, 90, uSv/hr, 0.09, FAST\n",
+    b"CPS, 9, CPM, 90, uSv/hr, 0.09, FAST\xc2\xa0\n",
+    b"CPS, 9\t, CPM, 90, uSv/hr, 0.09, FAST\n",
+    b"CPS, 9, CPM, 90, uSv/hr, 0.09, FAST\n\n",
+    b"CPS, 9, CPM, 90, uSv/hr, 0.09, FAST\r\r\n",
+    b"CPS, " + b"9" * 5000 + b", CPM, 90, uSv/hr, 0.09, FAST\n",
+    b"CPS, 9, CPM, 90, uSv/hr, " + b"1" * 40 + b", FAST\n",
+    b"",
+    b"\r\n",
+    b"   ",
+    b"not,a,valid,csv\n",
+    b",,,,,,",
+]
+
+
+def _reference(line):
+    return parse_geiger_csv(line.decode("utf-8", errors="ignore"))
+
+
+def _same(a, b):
+    if a is None or b is None:
+        return a is b
+    if a.keys() != b.keys():
+        return False
+    for key in a:
+        x, y = a[key], b[key]
+        if isinstance(x, float) and math.isnan(x):
+            if not (isinstance(y, float) and math.isnan(y)):
+                return False
+        elif x != y or type(x) is not type(y):
+            return False
+    return True
+
+
+@pytest.mark.parametrize("line", CORPUS)
+def test_matches_decode_then_parse(line):
+    assert _same(parse_geiger_bytes(line), _reference(line))
+
+
+def test_matches_on_randomly_mutated_lines():
+    rng = random.Random(1234)
+    alphabet = (
+        b"0123456789 ,.-+eE_CPSMuSv/hrFASTLOWIN\t\r\n\x0b\x0c\x1c\x1f\x00\xff\xc2\xa0"
+    )
+    base = b"CPS, 19, CPM, 1140, uSv/hr, 0.12, SLOW\r\n"
+
+    for _ in range(5000):
+        line = bytearray(base)
+        for _ in range(rng.randint(1, 4)):
+            op = rng.random()
+            pos = rng.randrange(len(line) + 1)
+            char = alphabet[rng.randrange(len(alphabet))]
+            if op < 0.4 and pos < len(line):
+                line[pos] = char
+            elif op < 0.7:
+                line.insert(pos, char)
+            elif pos < len(line):
+                del line[pos]
+        line = bytes(line)
+        assert _same(parse_geiger_bytes(line), _reference(line)), line
+
+
+@pytest.mark.parametrize(
+    "bad_input", [None, 123, "CPS, 9, CPM, 90, uSv/hr, 0.09, FAST"]
+)
+def test_non_bytes_input_returns_none(bad_input):
+    assert parse_geiger_bytes(bad_input) is None
@@ -0,0 +1,129 @@
+# filename: tests/unit/test_push_worker.py
+
+import sqlite3
+import time
+from dataclasses import replace
+
+from app.ingestion.batch_writer import BatchWriter
+from app.ingestion.push_worker import PushWorker
+from app.ingestion.replay import ReplayEngine
+from app.models import GeigerRecord
+
+
+PARSED = {
+    "raw": "CPS, 9, CPM, 90, uSv/hr, 0.09, FAST",
+    "cps": 9,
+    "cpm": 90,
+    "usv": 0.09,
+    "mode": "FAST",
+}
+
+
+def _record(row_id):
+    return replace(GeigerRecord.from_parsed(PARSED, device_id="dev"), id=row_id)
+
+
+def _pushed_ids(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        rows = conn.execute(
+            "SELECT id FROM geiger_readings WHERE pushed = 1 ORDER BY id"
+        ).fetchall()
+        return [r[0] for r in rows]
+    finally:
+        conn.close()
+
+
+def _wait_for(predicate, timeout=3.0):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return predicate()
+
+
+def test_worker_pushes_and_marks_records(temp_db):
+    writer = BatchWriter(temp_db, max_batch_size=1, max_latency_seconds=60.0)
+    pushed = []
+
+    def fake_push(record):
+        pushed.append(record.id)
+        return True
+
+    worker = PushWorker(fake_push, writer, poll_interval=0.01)
+    worker.start()
+    try:
+        for _ in range(3):
+            assert worker.submit(_record(writer.insert(PARSED, "dev")))
+
+        assert _wait_for(lambda: _pushed_ids(temp_db) == [1, 2, 3])
+        assert pushed == [1, 2, 3]
+        assert worker.queue_depth == 0
+    finally:
+        worker.stop()
+        worker.join()
+        writer.close()
+
+
+def test_worker_leaves_failed_pushes_unpushed(temp_db):
+    writer = BatchWriter(temp_db, max_batch_size=1, max_latency_seconds=60.0)
+    worker = PushWorker(lambda r: False, writer, poll_interval=0.01)
+    worker.start()
+    try:
+        worker.submit(_record(writer.insert(PARSED, "dev")))
+        assert _wait_for(lambda: worker.queue_depth == 0)
+    finally:
+        worker.stop()
+        worker.join()
+        writer.close()
+
+    assert _pushed_ids(temp_db) == []
+
+
+def test_overflowed_records_are_replayed_from_sqlite(temp_db):
+    writer = BatchWriter(temp_db, max_batch_size=100, max_latency_seconds=60.0)
+    replay = ReplayEngine(
+        temp_db, writer, push_batch=lambda rs: [r.id for r in rs], rate_limit=1000.0
+    )
+    worker = PushWorker(
+        lambda r: True, writer, queue_size=1, poll_interval=0.01, replay=replay
+    )
+
+    results = [worker.submit(_record(writer.insert(PARSED, "dev"))) for _ in range(3)]
+    assert results == [True, False, False]
+    assert worker.queue_depth == 1
+    assert worker.dropped == 2
+
+    worker.start()
+    try:
+        assert _wait_for(lambda: (writer.flush(), _pushed_ids(temp_db))[1] == [1, 2, 3])
+    finally:
+        worker.stop()
+        worker.join()
+        writer.close()
+
+
+def test_block_policy_waits_for_the_worker(temp_db):
+    writer = BatchWriter(temp_db, max_batch_size=100, max_latency_seconds=60.0)
+    worker = PushWorker(
+        lambda r: True,
+        writer,
+        queue_size=1,
+        poll_interval=0.01,
+        overflow_policy="block",
+    )
+    assert worker.submit(_record(writer.insert(PARSED, "dev")))
+
+    worker.start()
+    try:
+        # Would overflow without the worker draining the queue
+        assert all(
+            worker.submit(_record(writer.insert(PARSED, "dev"))) for _ in range(5)
+        )
+        assert _wait_for(
+            lambda: (writer.flush(), _pushed_ids(temp_db))[1] == [1, 2, 3, 4, 5, 6]
+        )
+        assert worker.dropped == 0
+    finally:
+        worker.stop()
+        worker.join()
+        writer.close()
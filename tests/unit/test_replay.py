@@ -0,0 +1,119 @@
+# filename: tests/unit/test_replay.py
+
+import sqlite3
+
+from app.ingestion.batch_writer import BatchWriter
+from app.ingestion.replay import ReplayEngine
+
+
+PARSED = {
+    "raw": "CPS, 9, CPM, 90, uSv/hr, 0.09, FAST",
+    "cps": 9,
+    "cpm": 90,
+    "usv": 0.09,
+    "mode": "FAST",
+}
+
+
+def _seed(temp_db, count):
+    writer = BatchWriter(temp_db, max_batch_size=1000, max_latency_seconds=60.0)
+    for _ in range(count):
+        writer.insert(PARSED, "dev")
+    writer.flush()
+    return writer
+
+
+def _unpushed_ids(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        rows = conn.execute(
+            "SELECT id FROM geiger_readings WHERE pushed = 0 ORDER BY id"
+        ).fetchall()
+        return [r[0] for r in rows]
+    finally:
+        conn.close()
+
+
+class RecordingPusher:
+    def __init__(self, reject=()):
+        self.batches = []
+        self.reject = set(reject)
+
+    def __call__(self, records):
+        self.batches.append([r.id for r in records])
+        return [r.id for r in records if r.id not in self.reject]
+
+
+def test_replay_pages_through_backlog_by_key(temp_db):
+    writer = _seed(temp_db, 7)
+    pusher = RecordingPusher()
+    replay = ReplayEngine(temp_db, writer, pusher, page_size=3, rate_limit=1e6)
+
+    while replay.passes == 0:
+        replay.step()
+    writer.close()
+
+    assert pusher.batches == [[1, 2, 3], [4, 5, 6], [7]]
+    assert _unpushed_ids(temp_db) == []
+    assert replay.replayed == 7
+
+
+def test_replay_skips_ids_still_in_live_queue(temp_db):
+    writer = _seed(temp_db, 4)
+    pusher = RecordingPusher()
+    replay = ReplayEngine(temp_db, writer, pusher, page_size=10, rate_limit=1e6)
+
+    replay.step(exclude={2, 4})
+    writer.close()
+
+    assert pusher.batches == [[1, 3]]
+    assert _unpushed_ids(temp_db) == [2, 4]
+
+
+def test_replay_is_rate_limited(temp_db):
+    writer = _seed(temp_db, 10)
+    pusher = RecordingPusher()
+    replay = ReplayEngine(temp_db, writer, pusher, page_size=4, rate_limit=0.001)
+
+    assert replay.step() == 4
+    assert not replay.due()
+    assert replay.step() == 0
+    writer.close()
+
+    assert pusher.batches == [[1, 2, 3, 4]]
+
+
+def test_replay_pauses_when_nothing_is_accepted(temp_db):
+    writer = _seed(temp_db, 3)
+    pusher = RecordingPusher(reject={1, 2, 3})
+    replay = ReplayEngine(
+        temp_db, writer, pusher, page_size=10, rate_limit=1e6, interval_seconds=60.0
+    )
+
+    assert replay.step() == 0
+    assert replay.seconds_until_due() > 0
+    assert replay.step() == 0
+    writer.close()
+
+    assert pusher.batches == [[1, 2, 3]]
+    assert _unpushed_ids(temp_db) == [1, 2, 3]
+
+
+def test_take_and_finish_page_without_push_batch(temp_db):
+    writer = _seed(temp_db, 5)
+    replay = ReplayEngine(temp_db, writer, page_size=3, rate_limit=1e6)
+
+    page = replay.take_page(exclude={2})
+    assert [r.id for r in page.rows] == [1, 2, 3]
+    assert [r.id for r in page.candidates] == [1, 3]
+    assert replay.finish_page(page, [1, 3]) == 2
+
+    page = replay.take_page()
+    assert [r.id for r in page.candidates] == [4, 5]
+    assert replay.finish_page(page, [4]) == 1
+    # A short page ends the pass
+    assert replay.passes == 1
+    writer.close()
+
+    assert _unpushed_ids(temp_db) == [2, 5]
+    assert replay.replayed == 3
@@ -0,0 +1,36 @@
+# filename: tests/unit/test_response_cache.py
+
+from app.response_cache import ResponseCache, etag_matches, make_etag
+
+
+def test_entry_invalidated_by_version_change():
+    cache = ResponseCache()
+    cache.put("k", (1, 10), b"[]")
+
+    assert cache.get("k", (1, 10)).body == b"[]"
+    assert cache.get("k", (2, 10)) is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_least_recently_used_entry_evicted():
+    cache = ResponseCache(max_entries=2)
+    cache.put("a", 1, b"a")
+    cache.put("b", 1, b"b")
+    cache.get("a", 1)
+    cache.put("c", 1, b"c")
+
+    assert cache.get("b", 1) is None
+    assert cache.get("a", 1) is not None
+    assert len(cache) == 2
+
+
+def test_etag_matching():
+    etag = make_etag(b"body")
+
+    assert etag == make_etag(b"body")
+    assert etag != make_etag(b"other")
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"x", W/{etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches(None, etag)
+    assert not etag_matches('"x"', etag)
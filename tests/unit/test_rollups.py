@@ -0,0 +1,94 @@
+# filename: tests/unit/test_rollups.py
+
+import sqlite3
+from datetime import datetime, timedelta, timezone
+
+from app.models import GeigerRecord
+from app.rollups import rebuild_rollups
+from app.sqlite_store import insert_record
+
+
+START = datetime(2025, 1, 1, 10, 0, tzinfo=timezone.utc)
+
+
+def _insert(db_path, offset_seconds, cps):
+    insert_record(
+        db_path,
+        GeigerRecord(
+            id=None,
+            raw="RAW",
+            counts_per_second=cps,
+            counts_per_minute=cps * 60,
+            microsieverts_per_hour=cps / 100,
+            mode="SLOW",
+            device_id="dev",
+            timestamp=START + timedelta(seconds=offset_seconds),
+        ),
+    )
+
+
+def _rows(db_path, table):
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute(
+            f"SELECT bucket, count, cps_min, cps_max, cps_sum FROM {table} ORDER BY bucket"
+        ).fetchall()
+    finally:
+        conn.close()
+
+
+def test_rollups_are_maintained_on_insert(temp_db):
+    for offset, cps in [(0, 4), (30, 8), (59, 6), (60, 10), (3600, 1)]:
+        _insert(temp_db, offset, cps)
+
+    assert _rows(temp_db, "geiger_rollup_minute") == [
+        ("2025-01-01T10:00:00+00:00", 3, 4, 8, 18),
+        ("2025-01-01T10:01:00+00:00", 1, 10, 10, 10),
+        ("2025-01-01T11:00:00+00:00", 1, 1, 1, 1),
+    ]
+    assert _rows(temp_db, "geiger_rollup_hour") == [
+        ("2025-01-01T10:00:00+00:00", 4, 4, 10, 28),
+        ("2025-01-01T11:00:00+00:00", 1, 1, 1, 1),
+    ]
+
+
+def test_rebuild_matches_incremental_rollups(temp_db):
+    for offset in range(0, 7200, 45):
+        _insert(temp_db, offset, offset % 13)
+
+    minute = _rows(temp_db, "geiger_rollup_minute")
+    hour = _rows(temp_db, "geiger_rollup_hour")
+
+    conn = sqlite3.connect(temp_db)
+    conn.execute("DELETE FROM geiger_rollup_minute")
+    conn.execute("DELETE FROM geiger_rollup_hour")
+    conn.commit()
+    conn.close()
+
+    buckets = rebuild_rollups(temp_db)
+
+    assert buckets == {"minute": len(minute), "hour": len(hour)}
+    assert _rows(temp_db, "geiger_rollup_minute") == minute
+    assert _rows(temp_db, "geiger_rollup_hour") == hour
+
+
+def test_unparseable_timestamp_is_stored_but_not_rolled_up(temp_db):
+    _insert(temp_db, 0, 4)
+    conn = sqlite3.connect(temp_db)
+    conn.execute(
+        """
+        INSERT INTO geiger_readings (
+            raw, counts_per_second, counts_per_minute,
+            microsieverts_per_hour, mode, device_id, timestamp
+        ) VALUES ('RAW', 9, 540, 0.09, 'SLOW', 'dev', 'not-a-timestamp')
+        """
+    )
+    conn.commit()
+    assert conn.execute("SELECT COUNT(*) FROM geiger_readings").fetchone() == (2,)
+    conn.close()
+
+    expected = [("2025-01-01T10:00:00+00:00", 1, 4, 4, 4)]
+    assert _rows(temp_db, "geiger_rollup_minute") == expected
+
+    assert rebuild_rollups(temp_db) == {"minute": 1, "hour": 1}
+    assert _rows(temp_db, "geiger_rollup_minute") == expected
@@ -6,7 +6,7 @@ from unittest.mock import MagicMock, patch
 from app.ingestion.serial_reader import SerialReader
 
 
-@patch("app.ingestion.serial_reader.parse_geiger_csv")
+@patch("app.ingestion.serial_reader.parse_geiger_bytes")
 @patch("app.ingestion.serial_reader.serial.Serial")
 def test_serial_reader_reads_lines(mock_serial, mock_parse):
     # Mock serial port returning two valid lines then stopping
@@ -36,7 +36,7 @@ def test_serial_reader_reads_lines(mock_serial, mock_parse):
     assert mock_handler.call_args_list[1].args[0]["cps"] == 20
 
 
-@patch("app.ingestion.serial_reader.parse_geiger_csv")
+@patch("app.ingestion.serial_reader.parse_geiger_bytes")
 @patch("app.ingestion.serial_reader.serial.Serial")
 def test_serial_reader_skips_malformed_lines(mock_serial, mock_parse):
     mock_port = MagicMock()
@@ -61,3 +61,67 @@ def test_serial_reader_skips_malformed_lines(mock_serial, mock_parse):
     # Only the valid line should be handled
     assert mock_handler.call_count == 1
     assert mock_handler.call_args.args[0]["cps"] == 5
+
+
+class FakePort:
+    """
+    Serves byte chunks as if each arrived between two reads.
+    """
+
+    def __init__(self, chunks):
+        self.chunks = list(chunks)
+        self.reads = 0
+
+    @property
+    def in_waiting(self):
+        return len(self.chunks[0]) if self.chunks else 0
+
+    def readinto(self, view):
+        self.reads += 1
+        if not self.chunks:
+            raise KeyboardInterrupt
+        chunk = self.chunks[0]
+        n = min(len(view), len(chunk))
+        view[:n] = chunk[:n]
+        if n == len(chunk):
+            self.chunks.pop(0)
+        else:
+            self.chunks[0] = chunk[n:]
+        return n
+
+
+@patch("app.ingestion.serial_reader.serial.Serial")
+def test_buffered_reader_returns_every_waiting_frame(mock_serial):
+    port = FakePort(
+        [
+            b"CPS, 1, CPM, 60, uSv/hr, 0.01, SLOW\r\nCPS, 2, CPM, 61, uSv/hr, 0.02, SL",
+            b"OW\r\nCPS, 3, CPM, 62, uSv/hr, 0.03, SLOW\r\n",
+        ]
+    )
+    mock_serial.return_value = port
+
+    reader = SerialReader("/dev/ttyUSB0", buffered=True)
+
+    assert reader.read_frames() == [b"CPS, 1, CPM, 60, uSv/hr, 0.01, SLOW\r"]
+    assert reader.read_frames() == [
+        b"CPS, 2, CPM, 61, uSv/hr, 0.02, SLOW\r",
+        b"CPS, 3, CPM, 62, uSv/hr, 0.03, SLOW\r",
+    ]
+    assert port.reads == 2
+
+
+@patch("app.ingestion.serial_reader.serial.Serial")
+def test_buffered_run_handles_all_frames(mock_serial):
+    mock_serial.return_value = FakePort(
+        [
+            b"CPS, 1, CPM, 60, uSv/hr, 0.01, SLOW\r\ngarbage\r\n"
+            b"CPS, 2, CPM, 61, uSv/hr, 0.02, FAST\r\n"
+        ]
+    )
+    handled = []
+
+    reader = SerialReader("/dev/ttyUSB0", buffered=True)
+    reader.set_handler(handled.append)
+    reader.run()
+
+    assert [(p["cps"], p["mode"]) for p in handled] == [(1, "SLOW"), (2, "FAST")]
@@ -0,0 +1,101 @@
+# filename: tests/unit/test_snapshot.py
+
+import struct
+import time
+
+from app.ingestion.api_client import PushClient
+from app.snapshot import SnapshotReader, SnapshotWriter
+from app.sqlite_store import initialize_db
+
+
+def test_reader_sees_latest_published_payload(tmp_path):
+    path = str(tmp_path / "snap.bin")
+    writer = SnapshotWriter(path)
+    reader = SnapshotReader(path)
+    try:
+        assert reader.read() is None
+
+        writer.publish({"latest": {"id": 1}})
+        writer.publish({"latest": {"id": 2}})
+
+        assert reader.read() == {"latest": {"id": 2}}
+    finally:
+        reader.close()
+        writer.close()
+
+
+def test_reader_returns_none_when_missing_or_stale(tmp_path):
+    path = str(tmp_path / "snap.bin")
+    assert SnapshotReader(path).read() is None
+
+    writer = SnapshotWriter(path)
+    reader = SnapshotReader(path)
+    try:
+        writer.publish({"latest": {"id": 1}})
+        assert reader.read(max_age=60.0) is not None
+        time.sleep(0.05)
+        assert reader.read(max_age=0.01) is None
+    finally:
+        reader.close()
+        writer.close()
+
+
+def test_reader_rejects_write_in_progress(tmp_path):
+    path = str(tmp_path / "snap.bin")
+    writer = SnapshotWriter(path)
+    reader = SnapshotReader(path, retries=3)
+    try:
+        writer.publish({"latest": {"id": 1}})
+        # Simulate a writer caught between the two sequence bumps
+        struct.pack_into("<Q", writer._mm, 8, writer._seq + 1)
+        assert reader.read() is None
+    finally:
+        reader.close()
+        writer.close()
+
+
+def test_writer_reopens_existing_file_without_resetting_readers(tmp_path):
+    path = str(tmp_path / "snap.bin")
+    first = SnapshotWriter(path)
+    reader = SnapshotReader(path)
+    first.publish({"n": 1})
+    assert reader.read() == {"n": 1}
+    first.close()
+
+    second = SnapshotWriter(path)
+    try:
+        second.publish({"n": 2})
+        assert reader.read() == {"n": 2}
+    finally:
+        reader.close()
+        second.close()
+
+
+def test_push_client_publishes_only_committed_readings(tmp_path):
+    path = str(tmp_path / "snap.bin")
+    db_path = str(tmp_path / "test.db")
+    initialize_db(db_path)
+    client = PushClient(
+        api_url="http://example.com",
+        api_token="TOKEN",
+        device_id="TEST-DEVICE",
+        db_path=db_path,
+        commit_max_latency=60.0,
+        snapshot_path=path,
+    )
+    reader = SnapshotReader(path)
+    try:
+        client.handle_record(
+            {"raw": "CPS, 1", "cps": 1, "cpm": 60, "usv": 0.01, "mode": "SLOW"}
+        )
+        # Inserted, but the group commit has not happened yet
+        assert reader.read() is None
+
+        client._writer.flush()
+        snapshot = reader.read()
+        assert snapshot is not None
+        assert snapshot["latest"]["id"] == 1
+        assert snapshot["latest"]["cpm"] == 60
+    finally:
+        reader.close()
+        client.close()
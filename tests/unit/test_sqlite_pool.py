@@ -0,0 +1,83 @@
+# filename: tests/unit/test_sqlite_pool.py
+
+import sqlite3
+import threading
+from datetime import datetime, timezone
+
+import pytest
+
+from app.api import Store
+from app.sqlite_pool import ReadConnectionPool
+
+
+def test_pool_reuses_connections(temp_db):
+    pool = ReadConnectionPool(temp_db, size=2)
+    try:
+        with pool.connection() as first:
+            pass
+        with pool.connection() as second:
+            pass
+        assert first is second
+        assert pool.open_connections == 1
+    finally:
+        pool.close()
+
+
+def test_pool_connections_are_read_only(temp_db):
+    pool = ReadConnectionPool(temp_db, size=1)
+    try:
+        with pytest.raises(sqlite3.Error):
+            with pool.connection() as conn:
+                conn.execute("DELETE FROM geiger_readings")
+        # The failed connection was discarded, a fresh one is opened
+        assert pool.open_connections == 0
+        with pool.connection() as conn:
+            assert conn.execute("PRAGMA query_only").fetchone()[0] == 1
+    finally:
+        pool.close()
+
+
+def test_pool_is_bounded_across_threads(temp_db):
+    pool = ReadConnectionPool(temp_db, size=2, timeout=2.0)
+    barrier = threading.Barrier(4)
+    errors = []
+
+    def worker():
+        try:
+            barrier.wait()
+            for _ in range(20):
+                with pool.connection() as conn:
+                    conn.execute("SELECT COUNT(*) FROM geiger_readings").fetchone()
+        except Exception as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    pool.close()
+
+    assert errors == []
+    assert pool.open_connections == 0
+
+
+def test_store_reads_through_pool(db_with_records, geiger_record):
+    db_path = db_with_records(
+        [
+            geiger_record(
+                id=None,
+                timestamp=datetime(2025, 1, 1, tzinfo=timezone.utc),
+                counts_per_second=cps,
+            )
+            for cps in (1, 2, 3)
+        ]
+    )
+    store = Store(db_path, pool_size=1)
+    try:
+        assert store.get_latest_reading()["cps"] == 3
+        assert [r["cps"] for r in store.get_recent_readings(limit=2)] == [3, 2]
+        assert store.count_readings() == 3
+        assert store.pool.open_connections == 1
+    finally:
+        store.close()
@@ -0,0 +1,61 @@
+# filename: tests/unit/test_sqlite_store.py
+
+import sqlite3
+from datetime import datetime, timezone
+
+from app.sqlite_store import (
+    get_unpushed_records,
+    iter_unpushed_records,
+    mark_records_pushed,
+)
+
+
+def _load(db_with_records, geiger_record, count):
+    ts = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    return db_with_records(
+        [
+            geiger_record(id=None, timestamp=ts, counts_per_second=i)
+            for i in range(count)
+        ]
+    )
+
+
+def test_iter_unpushed_records_streams_across_pages(db_with_records, geiger_record):
+    db_path = _load(db_with_records, geiger_record, 7)
+    mark_records_pushed(db_path, [2, 5])
+
+    ids = [r.id for r in iter_unpushed_records(db_path, page_size=2)]
+
+    assert ids == [1, 3, 4, 6, 7]
+
+
+def test_unpushed_keyset_pagination(db_with_records, geiger_record):
+    db_path = _load(db_with_records, geiger_record, 6)
+
+    first = get_unpushed_records(db_path, limit=4)
+    second = get_unpushed_records(db_path, after_id=first[-1].id, limit=4)
+
+    assert [r.id for r in first] == [1, 2, 3, 4]
+    assert [r.id for r in second] == [5, 6]
+    assert [r.id for r in iter_unpushed_records(db_path, limit=3, page_size=2)] == [
+        1,
+        2,
+        3,
+    ]
+
+
+def test_unpushed_query_uses_partial_index(temp_db):
+    conn = sqlite3.connect(temp_db)
+    try:
+        plan = conn.execute(
+            """
+            EXPLAIN QUERY PLAN
+            SELECT id FROM geiger_readings
+            WHERE pushed = 0 AND id > ? ORDER BY id ASC LIMIT ?
+            """,
+            (0, 10),
+        ).fetchall()
+    finally:
+        conn.close()
+
+    assert any("idx_geiger_readings_unpushed" in row[-1] for row in plan)
@@ -0,0 +1,77 @@
+# filename: tests/unit/test_stage_queue.py
+
+import threading
+import time
+
+import pytest
+
+from app import metrics
+from app.ingestion.stage_queue import StageQueue
+
+
+def test_block_policy_waits_for_room():
+    q = StageQueue("test", maxsize=1, policy="block")
+    assert q.put(1)
+
+    done = []
+    producer = threading.Thread(target=lambda: done.append(q.put(2)))
+    producer.start()
+    time.sleep(0.05)
+    assert done == []  # still waiting on the full queue
+
+    assert q.get_batch(10, timeout=0.1) == [1]
+    producer.join(timeout=1.0)
+    assert done == [True]
+    assert q.get_batch(10, timeout=0.1) == [2]
+
+
+def test_drop_oldest_evicts_and_counts():
+    evicted = []
+    dropped = metrics.STAGE_DROPPED.labels("parse").value
+    q = StageQueue("parse", maxsize=2, policy="drop-oldest", on_overflow=evicted.append)
+
+    assert all(q.put(i) for i in range(5))
+
+    assert q.get_batch(10, timeout=0.1) == [3, 4]
+    assert evicted == [0, 1, 2]
+    assert q.dropped == 3
+    assert metrics.STAGE_DROPPED.labels("parse").value == dropped + 3
+
+
+def test_spill_diverts_new_items():
+    spilled = []
+    count = metrics.STAGE_SPILLED.labels("persist").value
+    q = StageQueue("persist", maxsize=2, policy="spill", on_overflow=spilled.append)
+
+    assert [q.put(i) for i in range(4)] == [True, True, False, False]
+
+    assert q.get_batch(10, timeout=0.1) == [0, 1]
+    assert spilled == [2, 3]
+    assert metrics.STAGE_SPILLED.labels("persist").value == count + 2
+
+
+def test_close_releases_blocked_producer_and_drains():
+    rejected = []
+    q = StageQueue("test", maxsize=1, policy="block", on_overflow=rejected.append)
+    q.put("a")
+
+    done = []
+    producer = threading.Thread(target=lambda: done.append(q.put("b")))
+    producer.start()
+    time.sleep(0.05)
+    q.close()
+    producer.join(timeout=1.0)
+
+    assert done == [False]
+    assert rejected == ["b"]
+    assert q.get_batch(10, timeout=0.1) == ["a"]
+    assert q.get_batch(10, timeout=5.0) == []  # closed: no wait
+
+
+def test_invalid_configuration():
+    with pytest.raises(ValueError):
+        StageQueue("test", maxsize=0)
+    with pytest.raises(ValueError):
+        StageQueue("test", maxsize=1, policy="drop-newest")
+    with pytest.raises(ValueError):
+        StageQueue("test", maxsize=1, policy="spill")
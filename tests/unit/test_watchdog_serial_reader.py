@@ -3,7 +3,8 @@
 import time
 import pytest
 
-from app.ingestion.watchdog import WatchdogSerialReader
+from app import metrics
+from app.ingestion.watchdog import ReconnectBackoff, WatchdogSerialReader
 
 
 class MockSerial:
@@ -34,7 +35,6 @@ class MockReader:
         return ""
 
 
-
 def test_watchdog_proxies_set_handler():
     mock = MockReader()
     wd = WatchdogSerialReader(mock)
@@ -71,12 +71,12 @@ def test_watchdog_triggers_reopen_on_exception(monkeypatch):
 
     monkeypatch.setattr(wd, "_reopen", fake_reopen)
 
-    # read_line should catch the exception and call _reopen()
-    with pytest.raises(RuntimeError):
-        # second call after reopen will still raise, so we expect the error
-        wd.read_line()
+    # read_line should catch the exception, call _reopen() and return
+    # instead of retrying the read inline
+    assert wd.read_line() == ""
 
     assert reopened["called"] is True
+    assert mock.calls == 1
 
 
 def test_watchdog_triggers_reopen_on_dead_link(monkeypatch):
@@ -93,3 +93,128 @@ def test_watchdog_triggers_reopen_on_dead_link(monkeypatch):
     wd.read_line()
 
     assert reopened["called"] is True
+
+
+class PortReader(MockReader):
+    """
+    MockReader with a device path and an open_port() that fails while
+    fail_opens > 0.
+    """
+
+    def __init__(self, device, fail_opens=0, **kwargs):
+        super().__init__(**kwargs)
+        self.device = device
+        self.fail_opens = fail_opens
+        self.opens = 0
+
+    def open_port(self):
+        self.opens += 1
+        if self.fail_opens:
+            self.fail_opens -= 1
+            raise OSError("could not open port")
+        self.ser = MockSerial()
+        return self.ser
+
+
+def test_backoff_grows_exponentially_with_jitter():
+    backoff = ReconnectBackoff(initial=1.0, maximum=10.0, jitter=0.5, rng=lambda: 1.0)
+    assert [backoff.next_delay() for _ in range(6)] == [0.5, 1.0, 2.0, 4.0, 5.0, 5.0]
+
+    backoff.reset()
+    no_jitter = ReconnectBackoff(initial=1.0, maximum=10.0, jitter=0.5, rng=lambda: 0.0)
+    assert no_jitter.next_delay() == backoff.next_delay() * 2
+
+    with pytest.raises(ValueError):
+        ReconnectBackoff(jitter=1.5)
+
+
+def test_reopen_does_not_block(tmp_path):
+    device = tmp_path / "ttyUSB0"
+    device.touch()
+    mock = PortReader(str(device), raise_on_call=True)
+    wd = WatchdogSerialReader(mock, reopen_sleep_seconds=30.0, path_poll_seconds=0.01)
+
+    started = time.monotonic()
+    assert wd.read_line() == ""
+    assert wd.read_line() == ""  # waits one poll slice, not the backoff
+
+    assert time.monotonic() - started < 1.0
+    assert not wd.connected
+    assert mock.calls == 1
+    assert mock.opens == 0
+
+
+def test_waits_for_device_node_then_reconnects(tmp_path):
+    device = tmp_path / "ttyUSB0"
+    mock = PortReader(str(device), raise_on_call=True)
+    wd = WatchdogSerialReader(mock, reopen_sleep_seconds=0.0, path_poll_seconds=0.01)
+    reconnects = metrics.SERIAL_RECONNECTS.value
+    downtimes = metrics.SERIAL_RECONNECT_SECONDS.count
+
+    wd.read_line()  # read error: port lost
+    for _ in range(5):
+        assert wd.read_line() == ""
+    # The node is missing: the port was never reopened
+    assert mock.opens == 0
+
+    device.touch()
+    mock.raise_on_call = False
+    mock.lines = ["abc"]
+
+    deadline = time.monotonic() + 5.0
+    line = ""
+    while not line and time.monotonic() < deadline:
+        line = wd.read_line()
+
+    assert line == "abc"
+    assert wd.connected
+    assert mock.opens == 1
+    assert wd.reconnects == 1
+    assert metrics.SERIAL_RECONNECTS.value == reconnects + 1
+    assert metrics.SERIAL_RECONNECT_SECONDS.count == downtimes + 1
+
+
+def test_disconnected_gauge_counts_each_lost_port(tmp_path):
+    device = tmp_path / "ttyUSB0"
+    mock = PortReader(str(device), raise_on_call=True)
+    first = WatchdogSerialReader(
+        PortReader(str(device), raise_on_call=True), path_poll_seconds=0.01
+    )
+    second = WatchdogSerialReader(
+        mock, reopen_sleep_seconds=0.0, path_poll_seconds=0.01
+    )
+    before = metrics.SERIAL_DISCONNECTED.value
+
+    first.read_line()
+    second.read_line()
+    assert metrics.SERIAL_DISCONNECTED.value == before + 2
+
+    first.close()
+    assert metrics.SERIAL_DISCONNECTED.value == before + 1
+    first.close()
+    assert metrics.SERIAL_DISCONNECTED.value == before + 1
+
+    device.touch()
+    mock.raise_on_call = False
+    deadline = time.monotonic() + 5.0
+    while not second.connected and time.monotonic() < deadline:
+        second.read_line()
+    assert metrics.SERIAL_DISCONNECTED.value == before
+
+
+def test_failed_opens_back_off(tmp_path):
+    device = tmp_path / "ttyUSB0"
+    device.touch()
+    mock = PortReader(str(device), fail_opens=3, raise_on_call=True)
+    backoff = ReconnectBackoff(initial=0.01, maximum=0.04, jitter=0.0)
+    wd = WatchdogSerialReader(mock, path_poll_seconds=0.01, backoff=backoff)
+
+    wd.read_line()
+    mock.raise_on_call = False
+    deadline = time.monotonic() + 5.0
+    while not wd.connected and time.monotonic() < deadline:
+        wd.read_line()
+
+    assert wd.connected
+    assert mock.opens == 4
+    assert backoff.attempts == 0  # reset after the successful open